@@ -37,17 +37,28 @@ APP_NAME = "Stream Agent II"
 APP_VERSION = "v8.0"
 APP_DISPLAY = f"{APP_NAME} {APP_VERSION}"
 
+# Log file-name / header stamps and HUD line stamps (time.strftime: no datetime object per call)
+_TS_FMT = "%Y-%m-%d_%H-%M-%S"
+_HMS_FMT = "%H:%M:%S"
+_RUN_LOG_BUFFER = 64 * 1024  # run log is flushed about once a second by loop(), on critical events and at close
+
 
 import asyncio
 import datetime as dt
+import functools
+import gzip
+import hashlib
 import json
 import os
 import socket
 import threading
 import queue
 import time
-import glob
+import zlib
+import heapq
+import inspect
 import shutil
+import string
 import subprocess
 from collections import deque
 from dataclasses import dataclass, field
@@ -73,6 +84,40 @@ try:
 except Exception:
     psutil = None
 
+try:
+    import orjson  # Optional — faster JSON encoding for Web HUD state pushes
+except Exception:
+    orjson = None
+
+try:
+    # Optional — faster asyncio event loop for the worker (Web HUD sockets, OBS/MIDI polling)
+    if os.name == "nt":
+        import winloop as fastloop
+    else:
+        import uvloop as fastloop
+except Exception:
+    fastloop = None
+
+
+def _json_str(obj) -> str:
+    """json.dumps(obj), via orjson when available (int dict keys allowed, as with json)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except Exception:
+            pass
+    return json.dumps(obj)
+
+
+def _json_bytes(obj) -> bytes:
+    """UTF-8 JSON of obj for socket writes; orjson emits bytes directly (no str round trip)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except Exception:
+            pass
+    return json.dumps(obj).encode("utf-8")
+
 import tkinter as tk
 from tkinter import ttk
 from tkinter import scrolledtext
@@ -386,6 +431,9 @@ class Config:
     WEB_HUD_PORT: int = 8765
     WEB_HUD_TOKEN: str = ""
     WEB_HUD_LOG_LINES: int = 30
+    # Minimum gap between web HUD state pushes: an isolated change goes out at once, a burst of
+    # changes inside the window shares one send
+    WEB_BROADCAST_COALESCE_MS: int = 50
 
 
     # ----------------------------
@@ -500,8 +548,9 @@ def _cfg_base_dir() -> str:
     except Exception:
         return os.getcwd()
 
-CFG_OVERRIDE_PATH = os.path.join(_cfg_base_dir(), "config_overrides.json")
-CFG_CHANGELOG_PATH = os.path.join(_cfg_base_dir(), "config_change_log.jsonl")
+_MODULE_DIR = _cfg_base_dir()  # resolved once; relative log/state paths hang off this
+CFG_OVERRIDE_PATH = os.path.join(_MODULE_DIR, "config_overrides.json")
+CFG_CHANGELOG_PATH = os.path.join(_MODULE_DIR, "config_change_log.jsonl")
 
 # Fields that are visible in the Web HUD config editor but NEVER editable there.
 # (Tier A: always read-only)
@@ -761,15 +810,21 @@ def _safe_lower(s: str) -> str:
     return (s or "").lower().strip()
 
 
-def get_tz(cfg: Config):
+@functools.lru_cache(maxsize=4)
+def _zone(name: str):
+    # Cached per name, including misses (no tzdata on Windows) so they don't raise on every tick.
     if ZoneInfo is None:
         return None
     try:
-        return ZoneInfo(cfg.TIMEZONE)
+        return ZoneInfo(name)
     except Exception:
         return None
 
 
+def get_tz(cfg: Config):
+    return _zone(cfg.TIMEZONE)
+
+
 def now_in_cfg_tz(cfg: Config) -> dt.datetime:
     tz = get_tz(cfg)
     if tz is not None:
@@ -780,6 +835,7 @@ def now_in_cfg_tz(cfg: Config) -> dt.datetime:
     return dt.datetime.now()
 
 
+@functools.lru_cache(maxsize=8)
 def parse_hhmm(hhmm: str) -> Tuple[int, int]:
     hh, mm = hhmm.strip().split(":")
     return int(hh), int(mm)
@@ -829,15 +885,30 @@ class ObsController:
         self.client: Optional[ReqClient] = None
         self.last_error: str = ""
         self.connected: bool = False
+        # Reconnect pacing: adaptive backoff while OBS is closed/unreachable
+        self._reconnect_delay: float = 0.2
+        self._reconnect_next_at: float = 0.0
+        self._reconnect_attempts: int = 0
+        # NDI sender -> OBS input name found by the last settings scan (sender, input)
+        self._ndi_input_match: Tuple[str, str] = ("", "")
+        # Bound ReqClient methods resolved by _safe_call (cleared when the client is replaced)
+        self._method_cache: Dict[str, object] = {}
+        # Keyword names accepted by this obsws-python version (detected in connect())
+        self._scene_kw: str = "sceneName"
+        self._source_kw: str = "sourceName"
 
     def connect(self) -> bool:
         if ReqClient is None:
             self.last_error = "obsws-python not installed"
             return False
+        self.disconnect()  # never leave a previous websocket open behind the new one
         try:
             self.client = ReqClient(host=self.cfg.OBS_HOST, port=self.cfg.OBS_PORT,
                                     password=self.cfg.OBS_PASSWORD or None, timeout=5)
             self.client.get_version()
+            self._ndi_input_match = ("", "")
+            self._scene_kw = self._detect_kw("get_scene_item_list", ("sceneName", "scene_name", "scene"))
+            self._source_kw = self._detect_kw("get_source_active", ("sourceName", "source_name", "source"))
             self.connected = True
             self.last_error = ""
             return True
@@ -847,6 +918,56 @@ class ObsController:
             self.last_error = str(e)
             return False
 
+    def disconnect(self):
+        """Close the current websocket (if any) and mark the controller offline."""
+        client = self.client
+        self.client = None
+        self.connected = False
+        self._method_cache.clear()
+        if client is None:
+            return
+        try:
+            close = getattr(client, "disconnect", None)
+            if close is not None:
+                close()
+            else:
+                # Older obsws-python: no disconnect(); close the underlying socket directly
+                client.base_client.ws.close()
+        except Exception:
+            pass
+
+    def _detect_kw(self, method_name: str, candidates: Tuple[str, ...]) -> str:
+        """Pick the keyword a client method accepts (obsws-python versions differ on naming)."""
+        try:
+            params = [p.name for p in inspect.signature(getattr(self.client, method_name)).parameters.values()
+                      if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)]
+        except Exception:
+            return candidates[0]
+        for kw in candidates:
+            if kw in params:
+                return kw
+        # e.g. get_scene_item_list(self, name) — use the method's own first parameter
+        return params[0] if params else candidates[0]
+
+    def try_reconnect(self) -> bool:
+        """Paced connect(): 0.2s doubling to 5s, then a slow 30s probe after 20 misses."""
+        now = time.monotonic()
+        if now < self._reconnect_next_at:
+            return False
+        if self.connect():
+            self._reconnect_delay = 0.2
+            self._reconnect_next_at = 0.0
+            self._reconnect_attempts = 0
+            return True
+        self._reconnect_attempts += 1
+        if self._reconnect_attempts >= 20:
+            delay = 30.0
+        else:
+            delay = self._reconnect_delay
+            self._reconnect_delay = min(self._reconnect_delay * 2, 5.0)
+        self._reconnect_next_at = time.monotonic() + delay
+        return False
+
     def _ok(self) -> bool:
         return self.connected and self.client is not None
 
@@ -939,14 +1060,17 @@ class ObsController:
             return False, self.last_error
 
     def _safe_call(self, method_name: str, **kwargs):
-        if not self.connected or not self.client:
+        client = self.client
+        if client is None or not self.connected:
             return None, "OBS not connected"
-        fn = getattr(self.client, method_name, None)
+        fn = self._method_cache.get(method_name)
         if fn is None:
-            return None, f"missing method: {method_name}"
+            fn = getattr(client, method_name, None)
+            if fn is None:
+                return None, f"missing method: {method_name}"
+            self._method_cache[method_name] = fn
         try:
-            resp = fn(**kwargs) if kwargs else fn()
-            return resp, ""
+            return fn(**kwargs), ""
         except Exception as e:
             return None, str(e)
 
@@ -958,6 +1082,24 @@ class ObsController:
             return obj.get(key, default)
         return getattr(obj, key, default)
 
+    @staticmethod
+    def _get_any(obj, *keys, default=None):
+        """Return the first non-None value among keys (camelCase/snake_case variants)."""
+        if obj is None:
+            return default
+        if isinstance(obj, dict):
+            get = obj.get
+            for k in keys:
+                v = get(k)
+                if v is not None:
+                    return v
+        else:
+            for k in keys:
+                v = getattr(obj, k, None)
+                if v is not None:
+                    return v
+        return default
+
     @staticmethod
     def _contains_text(container, needle: str) -> bool:
         if not needle:
@@ -982,9 +1124,7 @@ class ObsController:
         resp, err = self._safe_call("get_profile_list")
         if err or resp is None:
             return "", err or "get_profile_list failed"
-        current = (self._get(resp, "currentProfileName")
-                   or self._get(resp, "current_profile_name")
-                   or "")
+        current = self._get_any(resp, "currentProfileName", "current_profile_name", default="")
         return str(current), ""
 
     def set_current_profile_name(self, name: str) -> Tuple[bool, str]:
@@ -1032,29 +1172,49 @@ class ObsController:
         if not self.connected or not self.client:
             return {"ok": None, "visible": None, "input": None, "detail": "OBS offline"}
 
+        # Local bindings for the per-input / per-scene-item loops below
+        _call = self._safe_call
+        _g = self._get
+        _any = self._get_any
+        _contains = ObsController._contains_text
+
         # Step 1: Identify the source name
         # We need the exact source name to query active status.
-        resp, err = self._safe_call("get_input_list")
+        resp, err = _call("get_input_list")
         if err:
             return {"ok": None, "visible": None, "input": None, "detail": f"get_input_list failed: {err}"}
 
-        inputs = self._get(resp, "inputs", []) or []
-        names = [self._get(it, "inputName") or self._get(it, "sourceName") or self._get(it, "name") for it in inputs]
+        inputs = _g(resp, "inputs", []) or []
+        names = [_any(it, "inputName", "sourceName", "name") for it in inputs]
+        name_set = set(names)
 
         cam_input = None
-        if getattr(cfg, "OBS_CAMERA_INPUT_NAME", "") and cfg.OBS_CAMERA_INPUT_NAME in names:
+        if getattr(cfg, "OBS_CAMERA_INPUT_NAME", "") and cfg.OBS_CAMERA_INPUT_NAME in name_set:
             cam_input = cfg.OBS_CAMERA_INPUT_NAME
         elif getattr(cfg, "OBS_CAMERA_NDI_SENDER_NAME", ""):
             target = cfg.OBS_CAMERA_NDI_SENDER_NAME.lower()
-            for nm in names:
-                # We have to check settings to find the NDI sender
-                r2, e2 = self._safe_call("get_input_settings", inputName=nm)
-                if e2 or r2 is None:
-                    continue
-                settings = self._get(r2, "inputSettings", {}) or {}
-                if self._contains_text(settings, target):
-                    cam_input = nm
-                    break
+            # Re-verify the input found by the last scan with one settings read (it may have been
+            # pointed at another sender); only rescan, one get_input_settings round-trip per OBS
+            # input, when that fails. (ReqClient shares a single websocket, so the probes cannot
+            # safely be issued in parallel.)
+            m_target, m_input = self._ndi_input_match
+            if m_target == target and m_input in name_set:
+                r2, e2 = _call("get_input_settings", inputName=m_input)
+                if not e2 and r2 is not None and _contains(_g(r2, "inputSettings", {}) or {}, target):
+                    cam_input = m_input
+                else:
+                    self._ndi_input_match = ("", "")
+            if cam_input is None:
+                for nm in names:
+                    # We have to check settings to find the NDI sender
+                    r2, e2 = _call("get_input_settings", inputName=nm)
+                    if e2 or r2 is None:
+                        continue
+                    settings = _g(r2, "inputSettings", {}) or {}
+                    if _contains(settings, target):
+                        cam_input = nm
+                        self._ndi_input_match = (target, nm)
+                        break
 
         if cam_input is None:
             return {"ok": False, "visible": None, "input": None, "detail": "Camera input not found"}
@@ -1066,59 +1226,40 @@ class ObsController:
         detail_extra = ""
 
         # 2a) Get current program scene name
-        r_scene, e_scene = self._safe_call("get_current_program_scene")
+        r_scene, e_scene = _call("get_current_program_scene")
         prog_scene = None
         if not e_scene and r_scene is not None:
-            prog_scene = (self._get(r_scene, "currentProgramSceneName")
-                          or self._get(r_scene, "current_program_scene_name")
-                          or self._get(r_scene, "sceneName")
-                          or self._get(r_scene, "scene_name"))
+            prog_scene = _any(r_scene, "currentProgramSceneName", "current_program_scene_name",
+                              "sceneName", "scene_name")
 
         # 2b) Look for scene item whose sourceName matches cam_input
         if prog_scene:
-            r_items, e_items = self._safe_call("get_scene_item_list", sceneName=prog_scene)
-            # obsws-python versions differ on kwarg naming; try snake_case if needed
-            if e_items and "unexpected keyword argument" in str(e_items):
-                r_items, e_items = self._safe_call("get_scene_item_list", scene_name=prog_scene)
-            if e_items and "unexpected keyword argument" in str(e_items):
-                r_items, e_items = self._safe_call("get_scene_item_list", scene=prog_scene)
+            # obsws-python versions differ on kwarg naming; connect() detected the right one
+            r_items, e_items = _call("get_scene_item_list", **{self._scene_kw: prog_scene})
 
             if not e_items and r_items is not None:
-                items = (self._get(r_items, "sceneItems")
-                         or self._get(r_items, "scene_items")
-                         or [])
+                items = _any(r_items, "sceneItems", "scene_items", default=[])
                 for it in items or []:
-                    src = (self._get(it, "sourceName")
-                           or self._get(it, "source_name")
-                           or self._get(it, "inputName")
-                           or self._get(it, "input_name"))
+                    src = _any(it, "sourceName", "source_name", "inputName", "input_name")
                     if src == cam_input:
-                        enabled = (self._get(it, "sceneItemEnabled")
-                                   if self._get(it, "sceneItemEnabled") is not None
-                                   else self._get(it, "scene_item_enabled"))
                         # Some wrappers may use "enabled"
-                        if enabled is None:
-                            enabled = self._get(it, "enabled")
+                        enabled = _any(it, "sceneItemEnabled", "scene_item_enabled", "enabled")
                         visible = bool(enabled) if enabled is not None else True
                         detail_extra = f" (programScene='{prog_scene}', itemEnabled={visible})"
                         break
 
         # 2c) Fallback: get_source_active (older logic)
         if detail_extra == "":
-            r_active, e_active = self._safe_call("get_source_active", sourceName=cam_input)
-            if e_active and "unexpected keyword argument" in str(e_active):
-                r_active, e_active = self._safe_call("get_source_active", source_name=cam_input)
-            if e_active and "unexpected keyword argument" in str(e_active):
-                r_active, e_active = self._safe_call("get_source_active", source=cam_input)
+            r_active, e_active = _call("get_source_active", **{self._source_kw: cam_input})
 
             if not e_active and r_active is not None:
-                if self._get(r_active, "videoShowing") is None and self._get(r_active, "video_showing") is None:
+                showing = _any(r_active, "videoShowing", "video_showing")
+                video_active = bool(_any(r_active, "videoActive", "video_active", default=False))
+                if showing is None:
                     visible = None
-                    video_active = bool(self._get(r_active, "videoActive", False) or self._get(r_active, "video_active", False))
                     detail_extra = f" (showing=UNKNOWN, active={video_active})"
                 else:
-                    visible = bool(self._get(r_active, "videoShowing", False) or self._get(r_active, "video_showing", False))
-                    video_active = bool(self._get(r_active, "videoActive", False) or self._get(r_active, "video_active", False))
+                    visible = bool(showing)
                     detail_extra = f" (showing={visible}, active={video_active})"
             else:
                 visible = None
@@ -1131,11 +1272,26 @@ class ObsController:
 
 
 class MidiListener:
-    def __init__(self, cfg: Config):
+    # Callback-mode ports never report a vanished device, so is_connected() re-checks the port list this often
+    _PROBE_INTERVAL = 5.0
+
+    def __init__(self, cfg: Config, on_message=None):
         self.cfg = cfg
+        # Called on mido's input thread for each real NOTE_ON (no polling from the worker loop)
+        self.on_message = on_message
         self.inport = None
         self.connected_name: str = ""
         self.last_error: str = "not attempted"
+        self._chan0: int = -1
+        self._next_probe: float = 0.0  # monotonic time of the next liveness check
+        self.refresh_filters()
+
+    def refresh_filters(self):
+        """Re-read the configured MIDI channel (call after config changes)."""
+        try:
+            self._chan0 = int(self.cfg.MIDI_CHANNEL_1_BASED) - 1
+        except Exception:
+            self._chan0 = -1
 
     def connect(self) -> bool:
         if mido is None:
@@ -1151,9 +1307,10 @@ class MidiListener:
                 self.inport = None
                 self.connected_name = ""
                 return False
-            self.inport = mido.open_input(match)
+            self.inport = mido.open_input(match, callback=self._on_raw)
             self.connected_name = match
             self.last_error = ""
+            self._next_probe = time.monotonic() + self._PROBE_INTERVAL
             return True
         except Exception as e:
             self.inport = None
@@ -1162,168 +1319,588 @@ class MidiListener:
             return False
 
     def is_connected(self) -> bool:
-        return self.inport is not None
-
-    def pending(self):
         if self.inport is None:
-            return []
+            return False
+        now = time.monotonic()
+        if now >= self._next_probe:
+            self._next_probe = now + self._PROBE_INTERVAL
+            try:
+                alive = self.connected_name in mido.get_input_names()
+            except Exception:
+                alive = True  # enumeration hiccup: keep the port rather than flap
+            if not alive:
+                self.last_error = f"port '{self.connected_name}' disappeared"
+                self.close()
+                return False
+        return True
+
+    def close(self):
+        port = self.inport
+        self.inport = None
+        self.connected_name = ""
+        if port is not None:
+            try:
+                port.close()
+            except Exception:
+                pass
+
+    def _on_raw(self, msg):
+        # Only real NOTE_ON messages are acted on; drop clock/CC/sensing and velocity-0 note-offs here.
+        if msg.type != "note_on" or msg.velocity <= 0 or self.on_message is None:
+            return
         try:
-            return list(self.inport.iter_pending())
-        except Exception:
-            self.last_error = "read error"
-            self.inport = None
-            self.connected_name = ""
-            return []
+            self.on_message(msg)
+        except Exception as e:
+            self.last_error = f"callback error: {e}"
 
     def is_note_on(self, msg, note: int) -> bool:
         """Return True only for a real NOTE_ON (velocity > 0) on our configured MIDI channel."""
-        if getattr(msg, "channel", -1) + 1 != self.cfg.MIDI_CHANNEL_1_BASED:
-            return False
-        if getattr(msg, "note", None) != note:
-            return False
-        if getattr(msg, "type", "") != "note_on":
-            return False
+        # Type is checked first: mido note_on messages always carry channel/note/velocity.
         # In MIDI, NOTE_ON with velocity 0 is often used as NOTE_OFF; ignore it.
-        vel = getattr(msg, "velocity", 0) or 0
-        return vel > 0
+        return (msg.type == "note_on" and msg.channel == self._chan0
+                and msg.note == note and msg.velocity > 0)
 
     def is_note_in_range(self, msg, lo: int, hi: int) -> Optional[int]:
         """Return the note number for a real NOTE_ON (velocity > 0) within [lo, hi] on our channel."""
-        if getattr(msg, "channel", -1) + 1 != self.cfg.MIDI_CHANNEL_1_BASED:
-            return None
-        if getattr(msg, "type", "") != "note_on":
-            return None
-        vel = getattr(msg, "velocity", 0) or 0
-        if vel <= 0:
-            return None
-        n = getattr(msg, "note", None)
-        if n is None:
+        if msg.type != "note_on" or msg.channel != self._chan0 or msg.velocity <= 0:
             return None
+        n = msg.note
         if lo <= n <= hi:
             return n
         return None
 
 
-class App:
-    def __init__(self, cfg: Config):
-        self.cfg = cfg
-        self.start_time = time.time()
-        self.root = tk.Tk()
-        self.root.title("Stream Agent")
-        self.root.geometry("420x720")
-        self.root.minsize(400, 600)
+# Published as the camera-source result while the check is disabled (shared; never mutated)
+_CAM_SRC_DISABLED = {"ok": None, "visible": None, "input": None, "detail": "Camera source check disabled"}
+
+# Banner ttk styles (also sent to the web HUD). One shared object each, so the per-tick
+# _set_ui_state() comparison of an unchanged style is an identity hit.
+_BANNER_LIVE = "Live.Banner.TLabel"
+_BANNER_STOPPING = "Stopping.Banner.TLabel"
+_BANNER_COUNTDOWN = "Countdown.Banner.TLabel"
+_BANNER_READY = "Ready.Banner.TLabel"
+_BANNER_ENDED = "Ended.Banner.TLabel"
+_BANNER_ERROR = "Error.Banner.TLabel"
+
+# Web HUD health level -> healthBox CSS class (resolved server-side; the page just applies it)
+_HEALTH_CSS = {
+    "READY": "h-ready",
+    "LIVE": "h-live",
+    "STREAMING": "h-live",
+    "STARTING": "h-starting",
+    "RECOVERING": "h-recovering",
+    "DEGRADED": "h-degraded",
+    "ERROR": "h-error",
+    "RECOVERED": "h-recovered",
+}
 
-        self.running = True
+# Fixed (level, detail) health states for loop(); the title shown is always the level.
+# Only the paused/recovering states carry a countdown and are formatted per tick.
+_HEALTH_FIXED = {
+    "degraded": ("DEGRADED", "Camera issue detected in OBS (check source visibility)."),
+    "recovered": ("RECOVERED", "Stream recovered (auto-restart succeeded)."),
+    "live": ("LIVE", "Streaming is active."),
+    "starting": ("STARTING", "Starting stream — waiting for OBS to go live."),
+    "obs_offline": ("RECOVERING", "Repairing OBS. OBS offline — reconnecting."),
+    "not_live": ("ERROR", "Not live. Press Start, or check OBS."),
+    "idle": ("READY", "Not streaming."),
+}
 
-        # UI thread safety: worker thread never touches Tk widgets directly
-        self._ui_actions = queue.Queue()
-        self._ui_lock = threading.Lock()
-        self._ui_state = {}
-        self._ui_dirty = False
-        self._was_streaming = False
+# Auto-recover backoff: the delay stops growing after this many doublings (mult <= 10 in the config UI)
+_AR_BACKOFF_EXP_CAP = 10
 
-        # Shared state for Web HUD
-        self._log_buf = deque(maxlen=400)  # stores full formatted lines
-        self._web_dirty = False
-        self._state_version = 0
-        self._ws_clients = set()
-        self._web_runner = None
-        self._web_site = None
-        self._async_loop = None
+# Worker loop() tick: fast while a countdown/pending action needs it, slower when idle.
+# Queued commands wake it immediately either way.
+_LOOP_BUSY_TICK = 0.25
+_LOOP_IDLE_TICK = 1.0
 
-        # Commands from UI/web are funneled to the worker loop thread
-        self._cmd_queue = None  # created inside async loop
+# A web HUD client with more than this many bytes still unsent is treated as stuck and dropped
+_WS_HIGH_WATER_BYTES = 1 << 20
 
-        self.running = True
-        self.obs = ObsController(cfg)
-        self.midi = MidiListener(cfg)
-        self.cam = ViscaCamera(cfg)
+# Upper bound on web server shutdown (client close handshakes + runner cleanup) when the app exits
+_WEB_STOP_TIMEOUT = 2.0
 
-        self.cam_state = "SLEEP"
-        self.cam_ready_at: float = 0.0
-        self._cam_src_last_check: float = 0.0
-        self._cam_src_last_result: Optional[dict] = None
-        self._cam_src_warned: bool = False
-        self._cam_awake_since: Optional[float] = None
-        self._queued_preset: Optional[int] = None
-        # Delayed preset scheduling (MIDI/automation only; HUD is immediate)
-        self._pending_preset: Optional[int] = None
-        self._pending_preset_due: float = 0.0
-        self._pending_preset_delay_s: int = 0
-        self._pending_preset_source: str = ""
-        self._pending_stream_start: bool = False
-        self._pending_start_reason: str = ""
-        self._pending_start_not_before: float = 0.0
 
-        self._stop_pending: bool = False
-        self._stop_at: float = 0.0
-        self._last_stop_was_midi: bool = False
-        self._service_end_running: bool = False
+# HUD stylesheet, served as /app.css (versioned URL, long-cached by browsers)
+_HUD_CSS = """  :root { color-scheme: dark; }
+  body { margin:0; font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; background:#0b1118; color:#e9eef5; }
+  .wrap { max-width:520px; margin:0 auto; padding:14px; }
+  .card { background:#121a24; border:1px solid #1d2a3a; border-radius:16px; padding:14px; margin:10px 0; box-shadow: 0 8px 24px rgba(0,0,0,.35); }
+  .appVer { font-size:12px; opacity:.75; text-align:center; letter-spacing:.4px; margin-bottom:6px; }
+  .title { font-size:20px; font-weight:700; text-align:center; letter-spacing:.4px; }
 
-        self._timer_done_today_date: Optional[dt.date] = None
-        self._timer_done_status: Optional[str] = None
-        self._timer_done_time_hhmm: Optional[str] = None
-        self._last_start_request_ts: float = 0.0
-        self._start_grace_until: float = 0.0  # suppress auto-recover retries right after a start request
-        self._load_timer_state()
+  /* Status banner: 4pt-ish black outline + state colors (matches PC HUD) */
+  .statusBanner { border:5px solid #000; border-radius:14px; padding:10px 12px; margin-top:6px; }
+  .sb-live { background:#2E7D32; }
+  .sb-ready { background:#4CAF50; }
+  .sb-warn { background:#FFC107; }
+  .sb-stop { background:#FF9800; }
+  .sb-ended { background:#2196F3; }
+  .sb-error { background:#F44336; }
 
-        self.minimized: bool = False
-        self.minimized_this_stream: bool = False
-        self.stream_stable_since: Optional[float] = None
-        self.stream_ended_at: Optional[float] = None  # For "STREAM ENDED" display
+  /* White-text stroke (approx 3pt): use stroke + shadow fallback */
+  .sb-live .title, .sb-ready .title, .sb-ended .title, .sb-error .title {
+    color:#fff;
+    -webkit-text-stroke: 3px #000;
+    paint-order: stroke fill;
+    text-shadow:
+      -2px -2px 0 #000, 0 -2px 0 #000, 2px -2px 0 #000,
+      -2px  0   0 #000,               2px  0   0 #000,
+      -2px  2px 0 #000, 0  2px 0 #000, 2px  2px 0 #000;
+  }
+  .sb-warn .title, .sb-stop .title { color:#000; -webkit-text-stroke: 0; text-shadow:none; }
 
-        # Streaming intent tracking (used for auto-recovery)
-        self._desired_streaming: bool = False
-        self._ever_requested_stream: bool = False  # True after first Start request
-        self._stop_intent: bool = False
-        self._stop_intent_set_at: float = 0.0
+  /* Make cards and buttons borders bolder (3pt solid black) */
+  .card { border:3px solid #000; }
+  .btn { border:3px solid #000; }
+  .pbtn { border:3px solid #000; }
 
-        # Auto-recovery state
-        self._recovering: bool = False
-        self._recover_attempts: int = 0
-        self._recover_next_at: float = 0.0
-        self._recover_reason: str = ""
-        self._recover_hold_until: float = 0.0  # pause after max attempts
-        self._recovered_until: float = 0.0  # brief "RECOVERED" indicator window
+  /* Outlined button text (white) */
+  .btn { color:#fff; -webkit-text-stroke: 2px #000; paint-order: stroke fill;
+    text-shadow:
+      -1px -1px 0 #000, 0 -1px 0 #000, 1px -1px 0 #000,
+      -1px  0   0 #000,              1px  0   0 #000,
+      -1px  1px 0 #000, 0  1px 0 #000, 1px  1px 0 #000;
+  }
 
-        # Error/health reporting (sticky on Web HUD)
-        self._last_obs_err: str = ""
-        self._last_critical_msg: str = ""
-        self._last_critical_ts: str = ""
-        self._cam_issue_prev: bool = False
+  .conn { margin-top:6px; font-size:12px; opacity:.8; text-align:center; white-space:pre-wrap; }
+  .row { display:flex; gap:10px; }
+  .btn { flex:1; padding:14px 10px; border-radius:14px; border:0; font-size:16px; font-weight:700; cursor:pointer;  -webkit-touch-callout:none; -webkit-user-select:none; user-select:none; touch-action:manipulation; -webkit-tap-highlight-color: transparent;}
+  .btn:active { transform: translateY(1px); }
+  .bStart { background:#2fb14d; }
+  .bStop  { background:#e14b45; }
+  .bRec   { background:#f0a018; }
+  .bRec.on { background:#ff3b3b; box-shadow: 0 0 0 2px rgba(255,59,59,.35) inset; }
+    .bView { background:#1565C0; }
+  .bView2 { background:#37474F; }
+  /* Make anchor buttons behave like buttons */
+  a.btn { text-decoration:none; display:flex; align-items:center; justify-content:center; }
+.sectionTitle { font-size:13px; font-weight:700; opacity:.85; margin-bottom:8px; }
+  .grid { display:grid; grid-template-columns: 1fr 1fr; gap:10px; }
+  .pbtn { padding:12px 10px; border-radius:12px; border:1px solid #24354a; background:#0e1620; color:#e9eef5; font-size:14px; font-weight:650; cursor:pointer;  -webkit-touch-callout:none; -webkit-user-select:none; user-select:none; touch-action:manipulation; -webkit-tap-highlight-color: transparent;}
+  .pbtn:active { transform: translateY(1px); }
+  pre { margin:0; white-space:pre-wrap; word-break:break-word; font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, monospace; font-size:12px; line-height:1.25; }
+  #logBox{ display:block; max-height:360px; overflow-y:auto; padding-right:6px; }
+  .hint { font-size:12px; opacity:.75; text-align:center; padding:10px; }
 
-        # OBS profile check: run once after (re)connect to warn early
-        self._obs_profile_checked_on_connect: bool = False
-        self._obs_profile_check_last_attempt: float = 0.0
+  /* Sticky health indicator (operational status) */
+  .healthBox { border:1px solid #26384f; border-radius:12px; padding:10px 12px; margin:10px 0 10px 0; }
+  .healthTitle { font-size:16px; font-weight:800; letter-spacing:.3px; }
+  .healthDetail { margin-top:4px; font-size:12px; opacity:.92; white-space:pre-wrap; }
+  .healthLast { margin-top:6px; font-size:12px; opacity:.85; white-space:pre-wrap; }
+  .h-ready { background: rgba(120, 140, 160, .10); border-color: rgba(120, 140, 160, .25); }
+  .h-live { background: rgba(25, 190, 95, .14); border-color: rgba(25, 190, 95, .35); }
+  .h-recovering { background: rgba(240, 180, 20, .12); border-color: rgba(240, 180, 20, .35); }
+  .h-degraded { background: rgba(240, 180, 20, .12); border-color: rgba(240, 180, 20, .35); }
+  .h-error { background: rgba(230, 60, 60, .13); border-color: rgba(230, 60, 60, .35); }
+  .h-recovered { background: rgba(100, 160, 255, .12); border-color: rgba(100, 160, 255, .35); }
 
-        # File logging
-        self._run_log_fp = None
-        self._session_log_fp = None
-        self._run_log_path = ""
-        self._session_log_path = ""
-        self._init_file_logging()
-        
-        # Cleanup old logs
-        self._cleanup_old_logs()
-        
-        if self._run_log_path:
-            self._post(f"Run log file: {self._run_log_path}")
+"""
 
-        self._build_ui()
-        self._ui_pump()  # start UI pump on main thread
-        self._post("Started — initializing connections...")
+# Web HUD page templates (string.Template: one substitution pass, no brace escaping in the CSS)
+_HUD_HTML_TMPL = string.Template("""<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8"/>
+<meta name="viewport" content="width=device-width, initial-scale=1"/>
+<title>Stream Agent HUD</title>
+<link rel="stylesheet" href="/app.css?v=14"/>
+</head>
+<body>
+<div class="wrap">
+  <div class="card">
+    <div class="appVer" id="appVer">${APP_VER}</div>
+    <div class="statusBanner sb-ready" id="statusBanner"><div class="title" id="statusTitle">CONNECTING…</div></div>
+    <div class="conn" id="connLine">Loading JavaScript…</div>
+  </div>
 
-        # Optional: minimize shortly after launch (even before streaming starts)
-        if self.cfg.AUTO_MINIMIZE_ENABLED and getattr(self.cfg, "MINIMIZE_ON_STARTUP", False):
-            try:
-                delay_s = float(self.cfg.AUTO_MINIMIZE_AFTER_SECONDS)
-            except Exception:
-                delay_s = 0.0
-            delay_ms = int(max(0.0, delay_s) * 1000)
-            self.root.after(delay_ms, self._startup_minimize)
+  <div class="card">
+    <div class="row">
+      <button data-no-ctx="1" class="btn bStart" id="btnStart">Start</button>
+      <button data-no-ctx="1" class="btn bStop" id="btnStop">Stop</button>
+      <button data-no-ctx="1" class="btn bRec" id="btnRec">REC</button>
+    </div>
+  </div>
 
-        self.thread = threading.Thread(target=self._runner, daemon=True)
+  <div class="card">
+    <div class="sectionTitle">Monitor</div>
+    <div class="row">
+      <a data-no-ctx="1" class="btn bView" id="btnViewYT" href="${YTLIVE}" target="_blank" rel="noopener">View Live (YouTube)</a>
+      <a data-no-ctx="1" class="btn bView2" id="btnViewEmbed" href="${VIEWER}">View Live (Embedded)</a>
+    </div>
+    <div class="row" style="margin-top:10px;">
+      <a data-no-ctx="1" class="btn bView2" id="btnCfg" href="${CONFIG}">Config</a>
+      <a data-no-ctx="1" class="btn bView2" id="btnCfgTimer" href="${CONFIG_TIMER}">Timer</a>
+    </div>
+    <div class="hint" style="margin-top:8px; opacity:.8;">Tip: If embedded playback is picky, use the YouTube button.</div>
+  </div>
+
+  <div class="card">
+    <div class="sectionTitle">Camera Presets</div>
+    <div class="grid" id="presetGrid"></div>
+  </div>
+
+  <div class="card">
+    <div class="sectionTitle">Log (last 30)</div>
+    <div id="healthBox" class="healthBox h-ready">
+      <div id="healthTitle" class="healthTitle">READY</div>
+      <div id="healthDetail" class="healthDetail"></div>
+      <div id="healthLast" class="healthLast"></div>
+    </div>
+    <pre id="logBox"></pre>
+  </div>
+
+  <div class="hint"><noscript>This page needs JavaScript enabled.</noscript></div>
+</div>
+
+<script src="/app.js?v=14"></script>
+</body>
+</html>
+""")
+
+_CONFIG_HTML_TMPL = string.Template("""<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8"/>
+<meta name="viewport" content="width=device-width, initial-scale=1"/>
+<title>Stream Agent Config</title>
+<style>
+  :root { color-scheme: dark; }
+  body { margin:0; font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; background:#0b1118; color:#e9eef5; }
+  .wrap { max-width:700px; margin:0 auto; padding:14px; }
+  .card { background:#121a24; border:3px solid #000; border-radius:16px; padding:14px; margin:10px 0; box-shadow: 0 8px 24px rgba(0,0,0,.35); }
+  .appVer { font-size:12px; opacity:.75; text-align:center; letter-spacing:.4px; margin-bottom:6px; }
+  .title { font-size:20px; font-weight:800; text-align:center; letter-spacing:.4px; }
+  .sub { font-size:12px; opacity:.85; text-align:center; margin-top:4px; white-space:pre-wrap; }
+  .row { display:flex; gap:10px; align-items:center; flex-wrap:wrap; }
+  .btn { padding:12px 10px; border-radius:14px; border:3px solid #000; background:#0e1620; color:#fff; font-weight:800; cursor:pointer;
+    -webkit-text-stroke: 2px #000; paint-order: stroke fill;
+    text-shadow: -1px -1px 0 #000, 0 -1px 0 #000, 1px -1px 0 #000, -1px 0 0 #000, 1px 0 0 #000, -1px 1px 0 #000, 0 1px 0 #000, 1px 1px 0 #000;
+    -webkit-touch-callout:none; -webkit-user-select:none; user-select:none; touch-action:manipulation; -webkit-tap-highlight-color: transparent;
+  }
+  .btn:active { transform: translateY(1px); }
+  .bBack { background:#37474F; }
+  .bApply { background:#2E7D32; }
+  .bUnlock { background:#FF9800; }
+  .bRestore { background:#F44336; }
+  .bExport { background:#1565C0; }
+  .bImport { background:#455A64; }
+
+  .secTitle { font-size:14px; font-weight:900; opacity:.9; margin:0 0 10px; letter-spacing:.2px; }
+  .item { padding:10px; border-radius:14px; border:1px solid #24354a; background:#0e1620; margin:8px 0; }
+  .item.changed { border:2px solid #FFC107; }
+  .item.readonly { opacity:.78; }
+  .line { font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace; font-size:12px; opacity:.95; word-break:break-word; }
+  .ctrl { margin-top:8px; display:flex; gap:8px; align-items:center; flex-wrap:wrap; }
+  .pill { font-size:11px; padding:4px 8px; border-radius:999px; border:1px solid #24354a; opacity:.85; }
+  .pill.locked { border-color:#F44336; }
+  .pill.unlocked { border-color:#FF9800; }
+  .pill.live { border-color:#2E7D32; }
+
+  .switch { position:relative; display:inline-block; width:56px; height:30px; }
+  .switch input { opacity:0; width:0; height:0; }
+  .slider { position:absolute; cursor:pointer; inset:0; background:#37474F; transition:.2s; border-radius:999px; border:2px solid #000; }
+  .slider:before { position:absolute; content:""; height:22px; width:22px; left:3px; top:3px; background:#fff; transition:.2s; border-radius:50%; }
+  input:checked + .slider { background:#2E7D32; }
+  input:checked + .slider:before { transform:translateX(26px); }
+
+  select, input[type="text"] { background:#0b1118; color:#e9eef5; border:2px solid #24354a; border-radius:10px; padding:10px; font-size:14px; }
+  input[type="text"]{ width: min(520px, 100%); }
+
+  .stepper { display:flex; gap:6px; align-items:center; }
+  .stepBtn { padding:10px 12px; border-radius:12px; border:3px solid #000; background:#263238; color:#fff; font-weight:900; cursor:pointer; min-width:44px; text-align:center; }
+  .stepVal { min-width:70px; text-align:center; padding:10px 10px; border-radius:12px; border:2px solid #24354a; background:#0b1118; font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace; }
+
+  .tinyBtn { padding:8px 10px; border-radius:12px; border:3px solid #000; background:#455A64; color:#fff; font-weight:900; cursor:pointer; }
+  .tinyBtn:active { transform: translateY(1px); }
+
+  .note { font-size:12px; opacity:.8; white-space:pre-wrap; margin-top:8px; }
+  .footer { font-size:12px; opacity:.7; text-align:center; padding:10px 0 18px; }
+  .hidden { display:none; }
+</style>
+</head>
+<body>
+<div class="wrap">
+  <div class="card">
+    <div class="appVer" id="appVer">${APP_VER}</div>
+    <div class="title">Config</div>
+    <div class="sub" id="statusSub">Loading...</div>
+    <div class="row" style="justify-content:center; margin-top:10px;">
+      <a class="btn bBack" id="btnBack" href="${BACK}">Back</a>
+      <button class="btn bUnlock" id="btnUnlock">Unlock (2 min)</button>
+      <button class="btn bApply" id="btnApply">Apply</button>
+      <button class="btn bRestore" id="btnRestore">Restore Defaults</button>
+    </div>
+    <div class="row" style="justify-content:center; margin-top:10px;">
+      <a class="btn bExport" id="btnExport" href="${EXPORT}" target="_blank" rel="noopener">Export</a>
+      <label class="btn bImport" for="fileImport" style="display:inline-flex; align-items:center; justify-content:center;">Import</label>
+      <input id="fileImport" class="hidden" type="file" accept="application/json"/>
+      <a class="btn bBack" id="btnTimer" href="${TIMER}">Timer</a>
+    </div>
+    <div class="note">Rules:
+- While LIVE, editing is locked unless you temporarily Unlock.
+- Critical constants (camera/VISCA identity, tokens, host/port) are read-only here.</div>
+  </div>
+
+  <div id="cfgRoot"></div>
+
+  <div class="footer">Stream Agent Config Editor</div>
+</div>
+
+<script src="/config.js?v=1"></script>
+</body>
+</html>
+""")
+
+_CONFIG_TIMER_HTML_TMPL = string.Template("""<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8"/>
+<meta name="viewport" content="width=device-width, initial-scale=1"/>
+<title>Stream Agent Timer Config</title>
+<style>
+  :root { color-scheme: dark; }
+  body { margin:0; font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; background:#0b1118; color:#e9eef5; }
+  .wrap { max-width:700px; margin:0 auto; padding:14px; }
+  .card { background:#121a24; border:3px solid #000; border-radius:16px; padding:14px; margin:10px 0; box-shadow: 0 8px 24px rgba(0,0,0,.35); }
+  .appVer { font-size:12px; opacity:.75; text-align:center; letter-spacing:.4px; margin-bottom:6px; }
+  .title { font-size:20px; font-weight:800; text-align:center; letter-spacing:.4px; }
+  .sub { font-size:12px; opacity:.85; text-align:center; margin-top:4px; white-space:pre-wrap; }
+  .row { display:flex; gap:10px; align-items:center; flex-wrap:wrap; justify-content:center; }
+  .btn { padding:12px 10px; border-radius:14px; border:3px solid #000; background:#0e1620; color:#fff; font-weight:800; cursor:pointer;
+    -webkit-text-stroke: 2px #000; paint-order: stroke fill;
+    text-shadow: -1px -1px 0 #000, 0 -1px 0 #000, 1px -1px 0 #000, -1px 0 0 #000, 1px 0 0 #000, -1px 1px 0 #000, 0 1px 0 #000, 1px 1px 0 #000;
+    -webkit-touch-callout:none; -webkit-user-select:none; user-select:none; touch-action:manipulation; -webkit-tap-highlight-color: transparent;
+  }
+  .btn:active { transform: translateY(1px); }
+  .bBack { background:#37474F; }
+  .bApply { background:#2E7D32; }
+  .bUnlock { background:#FF9800; }
+  .bRestore { background:#F44336; }
+  .secTitle { font-size:14px; font-weight:900; opacity:.9; margin:0 0 10px; letter-spacing:.2px; }
+  .item { padding:10px; border-radius:14px; border:1px solid #24354a; background:#0e1620; margin:8px 0; }
+  .item.changed { border:2px solid #FFC107; }
+  .item.readonly { opacity:.78; }
+  .line { font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace; font-size:12px; opacity:.95; word-break:break-word; }
+  .ctrl { margin-top:8px; display:flex; gap:8px; align-items:center; flex-wrap:wrap; }
+  .switch { position:relative; display:inline-block; width:56px; height:30px; }
+  .switch input { opacity:0; width:0; height:0; }
+  .slider { position:absolute; cursor:pointer; inset:0; background:#37474F; transition:.2s; border-radius:999px; border:2px solid #000; }
+  .slider:before { position:absolute; content:""; height:22px; width:22px; left:3px; top:3px; background:#fff; transition:.2s; border-radius:50%; }
+  input:checked + .slider { background:#2E7D32; }
+  input:checked + .slider:before { transform:translateX(26px); }
+  select, input[type="text"] { background:#0b1118; color:#e9eef5; border:2px solid #24354a; border-radius:10px; padding:10px; font-size:14px; }
+  input[type="text"]{ width: min(520px, 100%); }
+  .stepper { display:flex; gap:6px; align-items:center; }
+  .stepBtn { padding:10px 12px; border-radius:12px; border:3px solid #000; background:#263238; color:#fff; font-weight:900; cursor:pointer; min-width:44px; text-align:center; }
+  .stepVal { min-width:70px; text-align:center; padding:10px 10px; border-radius:12px; border:2px solid #24354a; background:#0b1118; font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace; }
+  .note { font-size:12px; opacity:.8; white-space:pre-wrap; margin-top:8px; }
+</style>
+</head>
+<body>
+<div class="wrap">
+  <div class="card">
+    <div class="appVer" id="appVer">${APP_VER}</div>
+    <div class="title">Timer</div>
+    <div class="sub" id="statusSub">Loading...</div>
+    <div class="row" style="margin-top:10px;">
+      <a class="btn bBack" id="btnBack" href="${BACK}">Back</a>
+      <button class="btn bUnlock" id="btnUnlock">Unlock (2 min)</button>
+      <button class="btn bApply" id="btnApply">Apply</button>
+      <button class="btn bRestore" id="btnRestoreTimer">Restore TIMER Defaults</button>
+    </div>
+    <div class="note">Restore TIMER Defaults resets only the TIMER AUTO-START fields to their shipped Sunday defaults, without affecting other tuned settings.</div>
+  </div>
+
+  <div id="cfgRoot"></div>
+</div>
+
+<script src="/config.js?v=1"></script>
+</body>
+</html>
+""")
+
+
+class App:
+    def __init__(self, cfg: Config):
+        self.cfg = cfg
+        self.start_time = time.monotonic()
+        self.root = tk.Tk()
+        self.root.title("Stream Agent")
+        self.root.geometry("420x720")
+        self.root.minsize(400, 600)
+
+        self.running = True
+
+        # UI thread safety: worker thread never touches Tk widgets directly
+        self._ui_actions = queue.Queue()
+        self._ui_lock = threading.Lock()
+        self._ui_state = {}
+        # Web HUD view of _ui_state (msg.state), kept current by _set_ui_state(). Replaced, never
+        # mutated, on each change, so payloads/patches may hold on to an older one.
+        self._web_state = {
+            "banner_text": "",
+            "app_version": APP_DISPLAY,
+            "banner_style": "Banner.TLabel",
+            "obs_line": "",
+            "midi_line": "",
+            "cam_line": "",
+            "timer_text": "",
+            "health": {"level": "READY", "css": "h-ready", "title": "READY", "detail": "", "last_ts": "", "last_msg": ""},
+            "rec_on": False,
+        }
+        self._ui_dirty = False
+        self._was_streaming = False
+
+        # Shared state for Web HUD
+        # Web HUD log tail: full formatted lines, maxlen kept equal to WEB_HUD_LOG_LINES by _bind_cfg_cache()
+        self._log_buf = deque(maxlen=max(1, int(cfg.WEB_HUD_LOG_LINES)))
+        self._log_json_cache: Optional[bytes] = None  # JSON array of _log_buf (rebuilt lazily)
+        self._payload_json_cache: Tuple[int, Optional[dict], bytes] = (-1, None, b"")  # (_state_version, payload, JSON)
+        self._ws_last_sent: Optional[Tuple[dict, int]] = None  # (payload, _log_seq) of the last broadcast
+        self._ws_force_full = False  # next broadcast sends full state (set when a client joins)
+        self._post_ts_cache: Tuple[int, str] = (-1, "")  # (epoch second, "HH:MM:SS") reused within a second
+        self._post_last: Tuple[str, float] = ("", 0.0)  # (msg, monotonic ts) of the last line shown in the HUD tail
+        self._post_repeats = 0  # identical messages kept out of the HUD tail since then (files still get them)
+        self._log_seq = 0  # lines ever appended to _log_buf (broadcasts send only the lines after the last one seen)
+        self._web_dirty = False
+        self._web_dirty_evt: Optional[asyncio.Event] = None  # wakes _web_broadcast_loop(); see _wake_web_broadcast()
+        self._cmd_evt: Optional[asyncio.Event] = None  # set by _enqueue_cmd(); cuts loop()'s tick sleep short
+        self._web_broadcast_task: Optional[asyncio.Task] = None
+        self._bg_tasks: set = set()  # fire-and-forget tasks from _spawn(); cancelled by _cancel_tasks() on close
+        self._state_version = 0
+        # Web HUD sockets -> their outgoing queue (drained by _ws_writer). _ws_epoch moves on every
+        # add/remove so the broadcaster can keep iterating one tuple snapshot until membership changes.
+        self._ws_clients: Dict[object, asyncio.Queue] = {}
+        self._ws_writer_tasks: set = set()  # _ws_writer() tasks, cancelled together on shutdown
+        self._ws_epoch = 0
+        self._ws_snapshot: Tuple = ()
+        self._ws_snapshot_epoch = 0
+        self._web_runner = None
+        self._web_site = None
+        self._local_ip_cache: Tuple[float, str] = (0.0, "")  # (monotonic ts, ip) from _local_ip_hint()
+        self._html_cache: Dict[tuple, str] = {}  # see _web_page()
+        self._cfg_json_cache: Dict[tuple, Tuple[str, str]] = {}  # see _cfg_snapshot_json()
+        self._static_body_cache: Dict[str, tuple] = {}  # name -> (text, (utf-8 bytes, etag), (gzip bytes, etag))
+        self._async_loop = None
+        # Set by loop() while OBS reports stream + record both off (service-end waits on it)
+        self._obs_stopped_evt: Optional[asyncio.Event] = None
+        self._obs_last_status: Tuple[bool, bool, str] = (False, False, "")
+
+        # Commands from UI/web are funneled to the worker loop thread.
+        # deque.append/popleft are atomic, and loop() drains it every tick, so producers never wake the loop.
+        self._cmd_deque: deque = deque()
+        self._action_handlers = {
+            "start": self._start_stream_flow,
+            "stop": self._request_stop,
+            "rec": self._toggle_record,
+        }
+        self._cmd_handlers = {
+            "action": self._dispatch_action,
+            "preset": self._dispatch_preset,
+        }
+
+        self.running = True
+        self.obs = ObsController(cfg)
+        # Camera-source checks run on their own thread with a dedicated OBS connection
+        # (ReqClient is not shared across threads).
+        self._cam_obs = ObsController(cfg)
+        self.midi = MidiListener(cfg, on_message=self._on_midi_msg)
+        self.cam = ViscaCamera(cfg)
+
+        self.cam_state = "SLEEP"
+        self.cam_ready_at: float = 0.0
+        self._cam_src_last_check: float = 0.0
+        self._cam_src_last_result: Optional[dict] = None
+        self._cam_src_last_line: str = "SRC: (OBS?)"  # _format_cam_src_line(_cam_src_last_result), set with it
+        self._cam_src_warned: bool = False
+        self._cam_awake_since: Optional[float] = None
+        self._queued_preset: Optional[int] = None
+        # Delayed preset scheduling (MIDI/automation only; HUD is immediate)
+        self._pending_preset: Optional[int] = None
+        self._pending_preset_due: float = 0.0
+        self._pending_preset_delay_s: int = 0
+        self._pending_preset_source: str = ""
+        self._pending_stream_start: bool = False
+        self._pending_start_reason: str = ""
+        self._pending_start_not_before: float = 0.0
+
+        self._stop_pending: bool = False
+        self._stop_at: float = 0.0
+        self._last_stop_was_midi: bool = False
+        self._service_end_running: bool = False
+
+        self._timer_done_today_date: Optional[dt.date] = None
+        self._timer_done_status: Optional[str] = None
+        self._timer_done_time_hhmm: Optional[str] = None
+        self._timer_next_at: float = 0.0  # monotonic; _timer_tick() picks its own cadence
+        self._last_timer_text: Optional[str] = None  # last timer line pushed to the HUDs
+        # ((date, TIMER_START_HHMM, TIMER_WEEKDAY), target) — see _timer_target_today()
+        self._timer_target_cache: Optional[Tuple[tuple, Optional[dt.datetime]]] = None
+        self._last_start_request_ts: float = 0.0
+        self._start_grace_until: float = 0.0  # suppress auto-recover retries right after a start request
+        self._load_timer_state()
+
+        self.minimized: bool = False
+        self.minimized_this_stream: bool = False
+        self.stream_stable_since: Optional[float] = None
+        self.stream_ended_at: Optional[float] = None  # For "STREAM ENDED" display
+
+        # Streaming intent tracking (used for auto-recovery)
+        self._desired_streaming: bool = False
+        self._ever_requested_stream: bool = False  # True after first Start request
+        self._stop_intent: bool = False
+        self._stop_intent_set_at: float = 0.0
+
+        # Auto-recovery state
+        self._recovering: bool = False
+        self._recover_attempts: int = 0
+        self._recover_next_at: float = 0.0
+        self._recover_reason: str = ""
+        self._recover_hold_until: float = 0.0  # pause after max attempts
+        self._recovered_until: float = 0.0  # brief "RECOVERED" indicator window
+        self._bind_cfg_cache()
+
+        # Error/health reporting (sticky on Web HUD)
+        self._last_obs_err: str = ""
+        # (HH:MM:SS, msg), replaced as a whole so a reader never pairs one event's time with another's text
+        self._last_critical: Tuple[str, str] = ("", "")
+        self._cam_issue_prev: bool = False
+
+        # OBS profile check: run once after (re)connect to warn early
+        self._obs_profile_checked_on_connect: bool = False
+        self._obs_profile_check_last_attempt: float = 0.0
+
+        # File logging
+        self._run_log_fp = None
+        self._session_log_fp = None
+        self._run_log_path = ""
+        self._session_log_path = ""
+        self._init_file_logging()
+        
+        # Cleanup old logs
+        self._cleanup_old_logs()
+        
+        if self._run_log_path:
+            self._post(f"Run log file: {self._run_log_path}")
+
+        self._build_ui()
+        self._ui_pump()  # start UI pump on main thread
+        self._post("Started — initializing connections...")
+
+        # Optional: minimize shortly after launch (even before streaming starts)
+        if self.cfg.AUTO_MINIMIZE_ENABLED and getattr(self.cfg, "MINIMIZE_ON_STARTUP", False):
+            try:
+                delay_s = float(self.cfg.AUTO_MINIMIZE_AFTER_SECONDS)
+            except Exception:
+                delay_s = 0.0
+            delay_ms = int(max(0.0, delay_s) * 1000)
+            self.root.after(delay_ms, self._startup_minimize)
+
+        self.thread = threading.Thread(target=self._runner, daemon=True)
         self.thread.start()
+        self._cam_status_thread = threading.Thread(target=self._cam_status_worker, daemon=True)
+        self._cam_status_thread.start()
 
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
 
@@ -1333,12 +1910,12 @@ class App:
 
         # ttk presets still used below; banner + top buttons are custom Canvas widgets.
         style.configure("Banner.TLabel", font=("Segoe UI", 18, "bold"), padding=14, anchor="center")
-        style.configure("Live.Banner.TLabel", background="#2E7D32", foreground="white")  # Green = streaming
-        style.configure("Stopping.Banner.TLabel", background="#FF9800", foreground="black")
-        style.configure("Countdown.Banner.TLabel", background="#FFC107", foreground="black")
-        style.configure("Ready.Banner.TLabel", background="#4CAF50", foreground="white")
-        style.configure("Ended.Banner.TLabel", background="#2196F3", foreground="white")  # Blue for ended
-        style.configure("Error.Banner.TLabel", background="#F44336", foreground="white")
+        style.configure(_BANNER_LIVE, background="#2E7D32", foreground="white")  # Green = streaming
+        style.configure(_BANNER_STOPPING, background="#FF9800", foreground="black")
+        style.configure(_BANNER_COUNTDOWN, background="#FFC107", foreground="black")
+        style.configure(_BANNER_READY, background="#4CAF50", foreground="white")
+        style.configure(_BANNER_ENDED, background="#2196F3", foreground="white")  # Blue for ended
+        style.configure(_BANNER_ERROR, background="#F44336", foreground="white")
 
         # Outer HUD border (3pt solid black)
         outer = tk.Frame(self.root, highlightthickness=3, highlightbackground="black", bd=0)
@@ -1353,18 +1930,19 @@ class App:
 
         # Banner widget (4pt black outline; outlined white text)
         self._banner_style_map = {
-            "Live.Banner.TLabel": ("#2E7D32", "white"),
-            "Stopping.Banner.TLabel": ("#FF9800", "black"),
-            "Countdown.Banner.TLabel": ("#FFC107", "black"),
-            "Ready.Banner.TLabel": ("#4CAF50", "white"),
-            "Ended.Banner.TLabel": ("#2196F3", "white"),
-            "Error.Banner.TLabel": ("#F44336", "white"),
+            _BANNER_LIVE: ("#2E7D32", "white"),
+            _BANNER_STOPPING: ("#FF9800", "black"),
+            _BANNER_COUNTDOWN: ("#FFC107", "black"),
+            _BANNER_READY: ("#4CAF50", "white"),
+            _BANNER_ENDED: ("#2196F3", "white"),
+            _BANNER_ERROR: ("#F44336", "white"),
         }
 
         self.banner_var = tk.StringVar(value="INITIALIZING — Launch OBS/Proclaim as needed")
         self.banner_widget = OutlinedBanner(main, height=72, outline_px=4, text_outline_px=1)
-        bg, fg = self._banner_style_map.get("Ready.Banner.TLabel", ("#4CAF50", "white"))
+        bg, fg = self._banner_style_map.get(_BANNER_READY, ("#4CAF50", "white"))
         self.banner_widget.set(self.banner_var.get(), bg, fg)
+        self._last_banner_style = _BANNER_READY  # skip Canvas recolor when unchanged
         self.banner_widget.pack(fill="x", pady=(0, 12))
 
         mode_var = tk.StringVar(value="HOME TEST MODE" if self.cfg.HOME_TEST_MODE else "CHURCH MODE")
@@ -1439,13 +2017,73 @@ class App:
             pass
 
     def _set_ui_state(self, **kwargs):
-        """Set latest UI state snapshot from the worker thread."""
+        """Set latest UI state snapshot from the worker thread (no-op if every field is unchanged)."""
         with self._ui_lock:
-            self._ui_state.update(kwargs)
+            state = self._ui_state
+            changed = []
+            for k, v in kwargs.items():
+                if k not in state or state[k] != v:
+                    state[k] = v
+                    changed.append(k)
+            if not changed:
+                # loop() re-publishes the same status every tick; don't bump the version for that.
+                return
+            # Copy-on-write update of the Web HUD view: only the changed fields are touched.
+            web = dict(self._web_state)
+            health = None
+            for k in changed:
+                if k.startswith("health_"):
+                    if health is None:
+                        health = dict(web["health"])
+                    health[k[7:]] = state[k]
+                elif k == "rec_on":
+                    web[k] = bool(state[k])
+                elif k in web:
+                    web[k] = state[k]
+            if health is not None:
+                web["health"] = health
+            self._web_state = web
             self._ui_dirty = True
             # Also mark Web HUD dirty
             self._state_version += 1
             self._web_dirty = True
+        self._wake_web_broadcast()
+
+    def _wake_web_broadcast(self):
+        """Signal the web broadcast task (safe from any thread; no-op before the worker loop starts)."""
+        self._set_evt_threadsafe(self._web_dirty_evt)
+
+    def _set_evt_threadsafe(self, evt: Optional[asyncio.Event]):
+        """Set a worker-loop asyncio.Event from any thread (no-op before the worker loop starts)."""
+        loop = self._async_loop
+        if evt is None or loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        try:
+            if running is loop:
+                evt.set()
+            else:
+                loop.call_soon_threadsafe(evt.set)
+        except RuntimeError:
+            pass  # loop already closed
+
+    def _spawn(self, coro) -> asyncio.Task:
+        """create_task() on the worker loop, keeping a reference until done so _cancel_tasks() can reach it."""
+        t = asyncio.create_task(coro)
+        self._bg_tasks.add(t)
+        t.add_done_callback(self._bg_tasks.discard)
+        return t
+
+    def _cancel_tasks(self):
+        """Worker loop only: cancel spawned tasks, the broadcaster and the web client writers."""
+        tasks = list(self._bg_tasks) + list(self._ws_writer_tasks)
+        if self._web_broadcast_task is not None:
+            tasks.append(self._web_broadcast_task)
+        for t in tasks:
+            t.cancel()
 
     def _ui_pump(self):
         """Runs on UI thread; applies latest state and executes queued UI actions."""
@@ -1483,10 +2121,13 @@ class App:
                         self.banner_widget.set_text(state["banner_text"])
                     except Exception:
                         pass
-                if "banner_style" in state:
+                style = state.get("banner_style")
+                if style is not None and style != self._last_banner_style:
                     try:
-                        bg, fg = self._banner_style_map.get(state["banner_style"], self._banner_style_map.get("Ready.Banner.TLabel"))
+                        style_map = self._banner_style_map
+                        bg, fg = style_map.get(style) or style_map[_BANNER_READY]
                         self.banner_widget.set_colors(bg, fg)
+                        self._last_banner_style = style
                     except Exception:
                         pass
             except Exception:
@@ -1522,13 +2163,48 @@ class App:
             pass
 
     def _post(self, msg: str):
-        ts = dt.datetime.now().strftime("%H:%M:%S")
-        full = f"[{ts}] {msg}\n"
+        full = self._post_stamp(msg)
+        # Log files get every line; only the HUD tail collapses a flapping source (the same line many
+        # times a second) to one line a second, with the dropped count noted by _post_flush_repeats().
         self._write_log_line(full)
+        now = time.monotonic()
+        with self._ui_lock:
+            last_msg, last_ts = self._post_last
+            if msg == last_msg and now - last_ts < 1.0:
+                self._post_repeats += 1
+                return
+            repeats = self._post_repeats
+            self._post_last = (msg, now)
+            self._post_repeats = 0
+        if repeats:
+            self._post_hud(self._post_stamp(f"(previous message repeated {repeats}x)"))
+        self._post_hud(full)
+
+    def _post_flush_repeats(self, now: float):
+        """Worker tick: show a pending repeat count once its 1s window has passed, even if nothing else is logged."""
+        with self._ui_lock:
+            repeats = self._post_repeats
+            if not repeats or now - self._post_last[1] < 1.0:
+                return
+            self._post_repeats = 0
+        self._post_hud(self._post_stamp(f"(previous message repeated {repeats}x)"))
+
+    def _post_stamp(self, msg: str) -> str:
+        sec = int(time.time())
+        cached_sec, ts = self._post_ts_cache
+        if sec != cached_sec:
+            ts = time.strftime(_HMS_FMT, time.localtime(sec))
+            self._post_ts_cache = (sec, ts)
+        return f"[{ts}] {msg}\n"
+
+    def _post_hud(self, full: str):
         with self._ui_lock:
             self._log_buf.append(full)
+            self._log_seq += 1
+            self._log_json_cache = None
             self._state_version += 1
             self._web_dirty = True
+        self._wake_web_broadcast()
 
         def _append():
             if not self.running:
@@ -1550,7 +2226,7 @@ class App:
         base = (getattr(self.cfg, "LOG_DIR", "") or "").strip()
         if base:
             return base
-        return os.path.dirname(os.path.abspath(__file__))
+        return _MODULE_DIR
 
     def _init_file_logging(self):
         if not getattr(self.cfg, "LOG_TO_FILE_ENABLED", False):
@@ -1558,10 +2234,10 @@ class App:
         try:
             base_dir = self._log_base_dir()
             os.makedirs(base_dir, exist_ok=True)
-            ts = dt.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            ts = time.strftime(_TS_FMT)
             prefix = getattr(self.cfg, "LOG_RUN_FILE_PREFIX", "stream_agent")
             self._run_log_path = os.path.join(base_dir, f"{prefix}_run_{ts}.log")
-            self._run_log_fp = open(self._run_log_path, "a", encoding="utf-8", buffering=1)
+            self._run_log_fp = open(self._run_log_path, "a", encoding="utf-8", buffering=_RUN_LOG_BUFFER)
             self._run_log_fp.write(f"=== Stream Agent run started {ts} ===\n")
             self._run_log_fp.flush()
         except Exception:
@@ -1576,19 +2252,21 @@ class App:
             base_dir = self._log_base_dir()
             prefix = getattr(self.cfg, "LOG_RUN_FILE_PREFIX", "stream_agent")
             retention = getattr(self.cfg, "LOG_RETENTION_COUNT", 30)
-            
-            # Pattern match for run logs
-            pattern = os.path.join(base_dir, f"{prefix}_run_*.log")
-            files = glob.glob(pattern)
-            
-            if len(files) <= retention:
+
+            # Single directory pass for run logs; DirEntry caches the stat result
+            run_prefix = f"{prefix}_run_"
+            with os.scandir(base_dir) as it:
+                entries = [(e.stat().st_mtime, e.path) for e in it
+                           if e.name.startswith(run_prefix) and e.name.endswith(".log") and e.is_file()]
+
+            if len(entries) <= retention:
                 return
-                
+
             # Sort by modification time (oldest first)
-            files.sort(key=os.path.getmtime)
-            
+            entries.sort()
+
             # Delete excess
-            to_delete = files[:-retention]
+            to_delete = [p for _, p in entries[:-retention]]
             count = 0
             for fpath in to_delete:
                 try:
@@ -1604,18 +2282,19 @@ class App:
             print(f"Cleanup error: {e}")
 
     def _write_log_line(self, line: str):
-        if not getattr(self.cfg, "LOG_TO_FILE_ENABLED", False):
+        run_fp = self._run_log_fp
+        sess_fp = self._session_log_fp
+        # No open file means nothing to do; skip the cfg lookup too.
+        if (run_fp is None and sess_fp is None) or not getattr(self.cfg, "LOG_TO_FILE_ENABLED", False):
             return
         try:
-            if self._run_log_fp:
-                self._run_log_fp.write(line)
-                self._run_log_fp.flush()
+            if run_fp:
+                run_fp.write(line)  # block-buffered like the session log
         except Exception:
             pass
         try:
-            if self._session_log_fp:
-                self._session_log_fp.write(line)
-                self._session_log_fp.flush()
+            if sess_fp:
+                sess_fp.write(line)  # block-buffered; flushed on critical events and close
         except Exception:
             pass
 
@@ -1629,16 +2308,15 @@ class App:
         try:
             base_dir = self._log_base_dir()
             os.makedirs(base_dir, exist_ok=True)
-            ts = dt.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            ts = time.strftime(_TS_FMT)
             prefix = getattr(self.cfg, "LOG_RUN_FILE_PREFIX", "stream_agent")
             self._session_log_path = os.path.join(base_dir, f"{prefix}_session_{ts}.log")
-            self._session_log_fp = open(self._session_log_path, "a", encoding="utf-8", buffering=1)
+            self._session_log_fp = open(self._session_log_path, "a", encoding="utf-8")
             hdr = f"=== STREAM SESSION START {ts}"
             if reason:
                 hdr += f" ({reason})"
             hdr += " ===\n"
             self._session_log_fp.write(hdr)
-            self._session_log_fp.flush()
         except Exception:
             self._session_log_fp = None
             self._session_log_path = ""
@@ -1646,13 +2324,12 @@ class App:
     def _close_session_log(self, reason: str = ""):
         try:
             if self._session_log_fp:
-                ts = dt.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                ts = time.strftime(_TS_FMT)
                 trailer = f"=== STREAM SESSION END {ts}"
                 if reason:
                     trailer += f" ({reason})"
                 trailer += " ===\n"
                 self._session_log_fp.write(trailer)
-                self._session_log_fp.flush()
                 self._session_log_fp.close()
         except Exception:
             pass
@@ -1664,13 +2341,61 @@ class App:
     # Sticky critical-event tracking (for Web HUD)
     # -----------------------------
     def _note_critical(self, msg: str):
-        self._last_critical_msg = msg or ""
-        self._last_critical_ts = dt.datetime.now().strftime("%H:%M:%S")
+        self._last_critical = (time.strftime(_HMS_FMT), msg or "")
+        self._flush_logs()
+
+    def _flush_logs(self):
+        """Push buffered run + session log lines to disk."""
+        for fp in (self._run_log_fp, self._session_log_fp):
+            try:
+                if fp:
+                    fp.flush()
+            except Exception:
+                pass
+
+    def _bind_cfg_cache(self):
+        """Copy hot-path cfg fields into plain attributes (call again after any cfg change)."""
+        cfg = self.cfg
+        n = max(1, int(cfg.WEB_HUD_LOG_LINES))
+        with self._ui_lock:
+            if self._log_buf.maxlen != n:
+                self._log_buf = deque(self._log_buf, maxlen=n)
+                self._log_json_cache = None
+        self._ar_enabled = bool(cfg.AUTO_RECOVER_ENABLED)
+        self._ar_max = int(cfg.AUTO_RECOVER_MAX_ATTEMPTS)
+        self._ar_base = float(cfg.AUTO_RECOVER_BASE_DELAY_SECONDS)
+        self._ar_mult = float(cfg.AUTO_RECOVER_BACKOFF_MULTIPLIER)
+        self._ar_cool = int(cfg.AUTO_RECOVER_COOLDOWN_SECONDS)
+        self._ar_start_grace = max(0.0, float(cfg.AUTO_RECOVER_START_GRACE_SECONDS))
+        # In HOME_TEST_MODE (no camera), the OBS camera-source monitor is disabled by default
+        # to avoid noisy "camera missing" warnings. Enable it by setting:
+        #   CAMERA_SOURCE_CHECK_IN_HOME_TEST = True
+        self._cs_enabled = bool(cfg.CAMERA_SOURCE_CHECK_ENABLED and
+                                (not cfg.HOME_TEST_MODE or cfg.CAMERA_SOURCE_CHECK_IN_HOME_TEST))
+        self._cs_interval = max(1.0, float(cfg.CAMERA_SOURCE_CHECK_SECONDS))
+        self._cs_warn_after = float(cfg.CAMERA_SOURCE_WARN_AFTER_SECONDS)
+        self._se_on_midi_stop = bool(cfg.MIDI_STOP_TRIGGERS_FULL_SEQUENCE and cfg.SERVICE_END_SEQUENCE_ENABLED)
+        # Presets 1..10 (the only numbers _handle_preset accepts) -> display label
+        self._preset_labels = {i: cfg.PRESET_LABELS.get(i, f"Preset {i}") for i in range(1, 11)}
+        self._preset_labels_payload = {int(k): v for k, v in cfg.PRESET_LABELS.items()}
+        # Short hash of the labels; the web HUD compares it to decide whether to rebuild its buttons
+        self._preset_labels_sig = hashlib.blake2b(
+            json.dumps(self._preset_labels_payload, sort_keys=True).encode("utf-8"), digest_size=8).hexdigest()
+        # Per-preset delay for MIDI/automation, clamped to 0..30 seconds (bad values -> 0)
+        delays: Dict[int, int] = {}
+        for k, v in (cfg.PRESET_DELAYS_SECONDS or {}).items():
+            try:
+                delays[k] = max(0, min(int(v), 30))
+            except Exception:
+                delays[k] = 0
+        self._preset_delays = delays
+        self._preset_delays_on = bool(cfg.ENABLE_PRESET_DELAYS)
+        self._cam_wake_on_preset = bool(cfg.CAMERA_AUTO_WAKE_ON_PRESET)
 
     # -----------------------------
     # Auto-recovery (self-healing) helpers
     # -----------------------------
-    def _reset_recovery_state(self):
+    def _reset_recovery_state(self, keep_grace: bool = False):
         """Reset all auto-recovery state (safe to call any time)."""
         self._recovering = False
         self._recover_attempts = 0
@@ -1678,30 +2403,29 @@ class App:
         self._recover_reason = ""
         self._recover_hold_until = 0.0
         self._recovered_until = 0.0
-        # Suppress "maintain live" retries briefly after a start request
-        self._start_grace_until = 0.0
+        if not keep_grace:
+            # Suppress "maintain live" retries briefly after a start request
+            self._start_grace_until = 0.0
 
     def _arm_recovery(self, reason: str):
         """Arm the recovery loop (does not necessarily attempt immediately)."""
-        if not getattr(self.cfg, "AUTO_RECOVER_ENABLED", False):
+        if not self._ar_enabled:
             return
-        if not self._desired_streaming:
+        if not self._desired_streaming or self._recovering:
             return
-        now = time.time()
+        now = time.monotonic()
         if now < self._recover_hold_until:
             return
-        if not self._recovering:
-            self._recovering = True
-            self._recover_attempts = 0
-            self._recover_reason = reason or "auto"
-            self._recover_next_at = now  # try ASAP
-            self._post(f"Auto-recover armed: {self._recover_reason}")
+        self._recovering = True
+        self._recover_attempts = 0
+        self._recover_reason = reason or "auto"
+        self._recover_next_at = now  # try ASAP
+        self._post(f"Auto-recover armed: {self._recover_reason}")
 
-    def _recovery_tick(self, streaming: bool):
+    def _recovery_tick(self, streaming: bool, now: float):
         """Attempt to restore streaming when desired but not currently live."""
-        if not getattr(self.cfg, "AUTO_RECOVER_ENABLED", False):
+        if not self._ar_enabled:
             return
-        now = time.time()
 
         if streaming:
             self._start_grace_until = 0.0  # streaming is live; clear any pending start grace window
@@ -1717,11 +2441,7 @@ class App:
             self._recovering = False
             return
 
-        if now < self._recover_hold_until:
-            return
-
-        grace_until = getattr(self, "_start_grace_until", 0.0) or 0.0
-        if now < grace_until:
+        if now < self._recover_hold_until or now < self._start_grace_until:
             return
 
         if not self._recovering:
@@ -1734,10 +2454,10 @@ class App:
         if now < self._recover_next_at:
             return
 
-        max_attempts = int(getattr(self.cfg, "AUTO_RECOVER_MAX_ATTEMPTS", 3))
+        max_attempts = self._ar_max
         if self._recover_attempts >= max_attempts:
             # Pause before trying again.
-            cool = int(getattr(self.cfg, "AUTO_RECOVER_COOLDOWN_SECONDS", 300))
+            cool = self._ar_cool
             self._recovering = False
             self._recover_hold_until = now + cool
             self._note_critical("Auto-recover paused (max attempts reached)")
@@ -1758,36 +2478,56 @@ class App:
         else:
             self._post(f"ERROR: Auto-recover start failed ({msg}) (attempt {self._recover_attempts}/{max_attempts})")
 
-        base = float(getattr(self.cfg, "AUTO_RECOVER_BASE_DELAY_SECONDS", 10))
-        mult = float(getattr(self.cfg, "AUTO_RECOVER_BACKOFF_MULTIPLIER", 2.0))
-        delay = int(base * (mult ** max(0, self._recover_attempts - 1)))
-        delay = max(3, delay)
-        self._recover_next_at = now + delay
+        # Exponent capped so a large attempt count can't overflow the float power
+        exp = min(self._recover_attempts - 1, _AR_BACKOFF_EXP_CAP)
+        self._recover_next_at = now + max(3, int(self._ar_base * (self._ar_mult ** exp)))
 
 
-    def _camera_source_status_line(self) -> str:
-        # In HOME_TEST_MODE (no camera), the OBS camera-source monitor is disabled by default
-        # to avoid noisy "camera missing" warnings. Enable it by setting:
-        #   CAMERA_SOURCE_CHECK_IN_HOME_TEST = True
-        if (not getattr(self.cfg, "CAMERA_SOURCE_CHECK_ENABLED", True) or
-            (self.cfg.HOME_TEST_MODE and not getattr(self.cfg, "CAMERA_SOURCE_CHECK_IN_HOME_TEST", False))):
-            self._cam_src_last_result = {"ok": None, "visible": None, "input": None, "detail": "Camera source check disabled"}
+    def _cam_src_check_enabled(self) -> bool:
+        return self._cs_enabled
+
+    def _cam_status_worker(self):
+        """Background thread: run camera_source_status every CAMERA_SOURCE_CHECK_SECONDS and publish it."""
+        while self.running:
+            if self._cam_src_check_enabled():
+                cam_obs = self._cam_obs
+                if not self.obs.connected:
+                    # Follow the main connection; reconnect once it is back.
+                    if cam_obs.client is not None:
+                        cam_obs.disconnect()
+                # Still offline / backing off: skip rather than publish "OBS offline" as a missing feed.
+                elif cam_obs.connected or cam_obs.try_reconnect():
+                    try:
+                        res = cam_obs.camera_source_status(self.cfg)
+                    except Exception:
+                        res = {"detail": "check error"}
+                    line = self._format_cam_src_line(res)
+                    with self._ui_lock:
+                        self._cam_src_last_result = res
+                        self._cam_src_last_line = line
+                        self._cam_src_last_check = time.monotonic()
+            time.sleep(self._cs_interval)
+        self._cam_obs.disconnect()
+
+    def _camera_source_status_line(self, now: float) -> str:
+        """Latest camera-source line; the status text is formatted once per check by _cam_status_worker."""
+        if not self._cam_src_check_enabled():
+            if self._cam_src_last_result is not _CAM_SRC_DISABLED:
+                with self._ui_lock:
+                    self._cam_src_last_result = _CAM_SRC_DISABLED
+                    self._cam_src_last_line = ""
             return ""
 
-        now = time.time()
-        if (now - self._cam_src_last_check) < self.cfg.CAMERA_SOURCE_CHECK_SECONDS and self._cam_src_last_result:
-            return self._format_cam_src_line(self._cam_src_last_result)
-        self._cam_src_last_check = now
         if not self.obs.connected:
             return "SRC: (OBS?)"
-        try:
-            res = self.obs.camera_source_status(self.cfg)
-        except Exception:
-            res = {"detail": "check error"}
-        self._cam_src_last_result = res
+        with self._ui_lock:
+            res = self._cam_src_last_result
+            line = self._cam_src_last_line
+        if not res or res is _CAM_SRC_DISABLED:
+            return "SRC: (OBS?)"
 
         if (self.cam_state == "AWAKE" and self._cam_awake_since and not self._cam_src_warned and
-            (now - self._cam_awake_since) >= self.cfg.CAMERA_SOURCE_WARN_AFTER_SECONDS):
+            (now - self._cam_awake_since) >= self._cs_warn_after):
             if not res.get("ok") or res.get("visible") is False:
                 self._cam_src_warned = True
                 detail = ""
@@ -1798,7 +2538,7 @@ class App:
                     pass
                 self._post("WARN: camera feed not in OBS" + detail)
 
-        return self._format_cam_src_line(res)
+        return line
 
     def _format_cam_src_line(self, res: dict) -> str:
         ok = res.get("ok")
@@ -1813,51 +2553,57 @@ class App:
             return "SRC: FOUND (hidden)"
         return "SRC: FOUND"
 
-    def _update_banner(self, streaming: bool, recording: bool, error_msg: str = "") -> Tuple[str, str]:
+    def _update_banner(self, streaming: bool, recording: bool, error_msg: str = "",
+                       now: Optional[float] = None) -> Tuple[str, str]:
         """Compute banner text/style without touching Tk widgets (thread-safe)."""
-        now = time.time()
+        if now is None:
+            now = time.monotonic()
 
         if self._stop_pending:
             rem = int(self._stop_at - now)
-            return f"STOPPING IN T-{fmt_hms(rem)}", "Stopping.Banner.TLabel"
+            return f"STOPPING IN T-{fmt_hms(rem)}", _BANNER_STOPPING
 
         if streaming:
-            return "🟢 LIVE — NOW STREAMING", "Live.Banner.TLabel"
+            return "🟢 LIVE — NOW STREAMING", _BANNER_LIVE
 
         # Show "STREAM ENDED" for 60s after stop
         if self.stream_ended_at and (now - self.stream_ended_at) < 60:
-            return "STREAM ENDED", "Ended.Banner.TLabel"
+            return "STREAM ENDED", _BANNER_ENDED
 
-        target = self._timer_target_today()
-        if target:
-            delta = int((target - now_in_cfg_tz(self.cfg)).total_seconds())
-            if 0 < delta < 600:
-                return f"AUTO-START IN T-{fmt_hms(delta)}", "Countdown.Banner.TLabel"
+        if self.cfg.USE_TIMER_START:
+            now_dt = now_in_cfg_tz(self.cfg)
+            target = self._timer_target_today(now_dt)
+            if target:
+                delta = int((target - now_dt).total_seconds())
+                if 0 < delta < 600:
+                    return f"AUTO-START IN T-{fmt_hms(delta)}", _BANNER_COUNTDOWN
 
         if error_msg:
-            return f"⚠️ {error_msg}", "Error.Banner.TLabel"
+            return f"⚠️ {error_msg}", _BANNER_ERROR
 
-        return "READY", "Ready.Banner.TLabel"
+        return "READY", _BANNER_READY
 
     def _enqueue_cmd(self, cmd: dict):
-        """Thread-safe enqueue into the worker loop."""
-        loop = self._async_loop
-        q = self._cmd_queue
-        if loop is None or q is None:
-            # Early startup fallback (should be rare)
-            self._post(f"HUD: command queued too early: {cmd}")
-            return
-
-        def _put():
-            try:
-                q.put_nowait(cmd)
-            except Exception as e:
-                self._post(f"CMD queue error: {e}")
-
-        try:
-            loop.call_soon_threadsafe(_put)
-        except Exception as e:
-            self._post(f"CMD enqueue failed: {e}")
+        """Thread-safe enqueue into the worker loop (wakes it, so the command runs right away)."""
+        self._cmd_deque.append(cmd)
+        self._set_evt_threadsafe(self._cmd_evt)
+
+    def _on_midi_msg(self, msg):
+        """mido input thread: map a NOTE_ON to a worker command."""
+        cfg = self.cfg
+        midi = self.midi
+        if midi.is_note_on(msg, cfg.NOTE_START_STREAM):
+            cmd = {"type": "action", "action": "start", "source": "MIDI"}
+        elif midi.is_note_on(msg, cfg.NOTE_STOP_STREAM):
+            cmd = {"type": "action", "action": "stop", "source": "MIDI"}
+        elif midi.is_note_on(msg, cfg.NOTE_REC_TOGGLE):
+            cmd = {"type": "action", "action": "rec", "source": "MIDI"}
+        else:
+            pn = midi.is_note_in_range(msg, cfg.NOTE_PRESET_FIRST, cfg.NOTE_PRESET_LAST)
+            if pn is None:
+                return
+            cmd = {"type": "preset", "preset": pn - cfg.NOTE_PRESET_FIRST + 1, "source": "MIDI"}
+        self._enqueue_cmd(cmd)
 
     def _ui_fire(self, action: str):
         self._enqueue_cmd({"type": "action", "action": action, "source": "HUD"})
@@ -1868,35 +2614,30 @@ class App:
 
     async def _drain_cmds(self):
         """Runs on worker thread; executes any queued commands."""
-        if self._cmd_queue is None:
-            return
-        while True:
-            try:
-                cmd = self._cmd_queue.get_nowait()
-            except Exception:
-                break
+        q = self._cmd_deque
+        while q:
+            cmd = q.popleft()
 
             try:
-                ctype = cmd.get("type")
-                source = cmd.get("source", "WEB")
-                if ctype == "action":
-                    action = cmd.get("action")
-                    if action == "start":
-                        self._start_stream_flow(source)
-                    elif action == "stop":
-                        self._request_stop(source)
-                    elif action == "rec":
-                        self._toggle_record(source)
-                elif ctype == "preset":
-                    self._handle_preset(int(cmd.get("preset", 0)), source)
+                handler = self._cmd_handlers.get(cmd.get("type"))
+                if handler is not None:
+                    handler(cmd, cmd.get("source", "WEB"))
             except Exception as e:
                 self._post(f"CMD error: {e}")
 
+    def _dispatch_action(self, cmd: dict, source: str):
+        handler = self._action_handlers.get(cmd.get("action"))
+        if handler is not None:
+            handler(source)
+
+    def _dispatch_preset(self, cmd: dict, source: str):
+        self._handle_preset(int(cmd.get("preset", 0)), source)
+
     def _camera_wake(self, source: str):
         if self.cam_state in ("WAKING", "AWAKE"):
             return
         self.cam_state = "WAKING"
-        self.cam_ready_at = time.time() + self.cfg.CAMERA_BOOT_SECONDS
+        self.cam_ready_at = time.monotonic() + self.cfg.CAMERA_BOOT_SECONDS
         if self.cfg.HOME_TEST_MODE:
             self._post(f"{source}: camera wake simulated")
         else:
@@ -1922,10 +2663,10 @@ class App:
             except Exception as e:
                 self._post(f"{source}: camera power error: {e}")
 
-    def _camera_ready_tick(self):
-        if self.cam_state == "WAKING" and time.time() >= self.cam_ready_at:
+    def _camera_ready_tick(self, now: float):
+        if self.cam_state == "WAKING" and now >= self.cam_ready_at:
             self.cam_state = "AWAKE"
-            self._cam_awake_since = time.time()
+            self._cam_awake_since = now
             self._cam_src_warned = False
             self._post("CAM: awake/ready")
             if self._queued_preset is not None:
@@ -1934,7 +2675,7 @@ class App:
                 self._send_preset(p, "QUEUE")
             if self._pending_stream_start:
                 # If a preflight action (e.g., OBS profile switch) scheduled a delayed start, honor it.
-                if time.time() < getattr(self, "_pending_start_not_before", 0.0):
+                if now < getattr(self, "_pending_start_not_before", 0.0):
                     return
                 reason = self._pending_start_reason or "PENDING"
                 self._pending_stream_start = False
@@ -1942,7 +2683,7 @@ class App:
                 self._start_stream_flow(reason)
 
     def _send_preset(self, preset_num: int, source: str):
-        label = self.cfg.PRESET_LABELS.get(preset_num, f"Preset {preset_num}")
+        label = self._preset_labels[preset_num]
         if self.cfg.HOME_TEST_MODE:
             self._post(f"{source}: preset {preset_num} ({label}) simulated")
             return
@@ -1954,11 +2695,7 @@ class App:
 
     def _clamped_preset_delay(self, preset_num: int) -> int:
         """Return per-preset delay for MIDI/automation, clamped to 0..30 seconds."""
-        try:
-            raw = int((self.cfg.PRESET_DELAYS_SECONDS or {}).get(preset_num, 0))
-        except Exception:
-            raw = 0
-        return max(0, min(raw, 30))
+        return self._preset_delays.get(preset_num, 0)
 
     def _cancel_pending_preset(self, reason: str = ""):
         if self._pending_preset is None:
@@ -1978,20 +2715,20 @@ class App:
             self._cancel_pending_preset(f"{source}")
         self._pending_preset = preset_num
         self._pending_preset_delay_s = delay_s
-        self._pending_preset_due = time.time() + delay_s
+        self._pending_preset_due = time.monotonic() + delay_s
         self._pending_preset_source = source
-        label = self.cfg.PRESET_LABELS.get(preset_num, f"Preset {preset_num}")
+        label = self._preset_labels[preset_num]
         self._post(f"{source}: preset {preset_num} ({label}) scheduled in {delay_s}s")
 
         # If camera is asleep and auto-wake is enabled, wake now so we're ready when delay elapses.
-        if self.cam_state == "SLEEP" and self.cfg.CAMERA_AUTO_WAKE_ON_PRESET:
+        if self.cam_state == "SLEEP" and self._cam_wake_on_preset:
             self._camera_wake(f"{source}: wake for delayed preset")
 
-    def _preset_delay_tick(self):
+    def _preset_delay_tick(self, now: float):
         """Fire a delayed preset when due and the camera is ready."""
         if self._pending_preset is None:
             return
-        if time.time() < self._pending_preset_due:
+        if now < self._pending_preset_due:
             return
         # Only execute when camera is awake (or in home test mode where presets are simulated anyway).
         if not self.cfg.HOME_TEST_MODE and self.cam_state != "AWAKE":
@@ -2013,7 +2750,7 @@ class App:
         # HUD presets are ALWAYS immediate (operator judgment). Also cancel any pending delayed preset.
         if source == "HUD":
             self._cancel_pending_preset("HUD")
-            if self.cam_state == "SLEEP" and self.cfg.CAMERA_AUTO_WAKE_ON_PRESET:
+            if self.cam_state == "SLEEP" and self._cam_wake_on_preset:
                 self._queued_preset = preset_num
                 self._camera_wake(f"{source}: wake for preset")
                 return
@@ -2025,14 +2762,14 @@ class App:
             return
 
         # MIDI/automation presets: optional per-preset delay (feature gated)
-        if self.cfg.ENABLE_PRESET_DELAYS:
+        if self._preset_delays_on:
             delay_s = self._clamped_preset_delay(preset_num)
             if delay_s > 0:
                 self._schedule_preset(preset_num, source, delay_s)
                 return
 
         # Default behavior (no delay)
-        if self.cam_state == "SLEEP" and self.cfg.CAMERA_AUTO_WAKE_ON_PRESET:
+        if self.cam_state == "SLEEP" and self._cam_wake_on_preset:
             self._queued_preset = preset_num
             self._camera_wake(f"{source}: wake for preset")
             return
@@ -2043,7 +2780,7 @@ class App:
         self._send_preset(preset_num, source)
 
     def _start_stream_flow(self, source: str):
-        now = time.time()
+        now = time.monotonic()
         if (now - self._last_start_request_ts) < self.cfg.START_DEBOUNCE_SECONDS:
             self._post(f"{source}: start ignored (debounce)")
             return
@@ -2056,16 +2793,11 @@ class App:
         self._desired_streaming = True
         # After sending a start request, OBS can take a moment to report streaming=true.
         # Suppress auto-recover retries during this grace window to avoid double-starting.
-        grace_s = float(getattr(self.cfg, "AUTO_RECOVER_START_GRACE_SECONDS", 15))
-        self._start_grace_until = time.time() + max(0.0, grace_s)
+        self._start_grace_until = now + self._ar_start_grace
         # Manual start clears any prior stop intent and any recovery pause.
         self._stop_intent = False
         self._stop_intent_set_at = 0.0
-        self._recover_hold_until = 0.0
-        self._recovering = False
-        self._recover_attempts = 0
-        self._recover_next_at = 0.0
-        self._recover_reason = ""
+        self._reset_recovery_state(keep_grace=True)
 
         if not self.cfg.HOME_TEST_MODE:
             if self.cam_state == "SLEEP":
@@ -2113,7 +2845,8 @@ class App:
                             self._post(f"{source}: OBS profile switched to '{expected}' — starting after {grace:.1f}s")
                             self._pending_stream_start = True
                             self._pending_start_reason = source
-                            self._pending_start_not_before = time.time() + max(0.5, grace)
+                            # Fresh sample: the profile RPCs above may have eaten into the grace
+                            self._pending_start_not_before = time.monotonic() + max(0.5, grace)
                             # Reset debounce so the queued retry isn't ignored.
                             self._last_start_request_ts = 0.0
                             return
@@ -2139,46 +2872,42 @@ class App:
             self._post(f"{source}: start failed ({msg})")
 
     def _request_stop(self, source: str):
+        now = time.monotonic()
         # Operator/automation intent: we do NOT want to be live.
         self._desired_streaming = False
         # Mark stop intent so the next transition STREAM ON -> OFF is not treated as "unexpected".
         self._stop_intent = True
-        self._stop_intent_set_at = time.time()
+        self._stop_intent_set_at = now
 
         # Cancel any in-progress auto-recovery attempts.
-        self._recovering = False
-        self._recover_attempts = 0
-        self._recover_next_at = 0.0
-        self._recover_reason = ""
+        self._reset_recovery_state()
 
         self._last_stop_was_midi = (source == "MIDI")
 
         self._stop_pending = True
-        self._stop_at = time.time() + self.cfg.STOP_DELAY_SECONDS
+        self._stop_at = now + self.cfg.STOP_DELAY_SECONDS
         self._post(f"{source}: stop in {self.cfg.STOP_DELAY_SECONDS}s")
 
-    def _stop_tick(self):
+    def _stop_tick(self, now: float):
         if not self._stop_pending:
             return
-        rem = int(self._stop_at - time.time())
+        rem = int(self._stop_at - now)
         if rem > 0:
             return
         self._stop_pending = False
         if self.obs.connected:
             ok, msg = self.obs.stop_stream()
             self._post(f"STOP: {msg}" if ok else f"STOP failed ({msg})")
-        self.stream_ended_at = time.time()  # Trigger "STREAM ENDED" banner
+        self.stream_ended_at = now  # Trigger "STREAM ENDED" banner
         if not self.cfg.HOME_TEST_MODE:
             self._camera_sleep("STOP")
 
         # v7.14: Optional service-end master sequence (triggered ONLY by MIDI stop)
-        if (self._last_stop_was_midi and
-                getattr(self.cfg, 'MIDI_STOP_TRIGGERS_FULL_SEQUENCE', False) and
-                getattr(self.cfg, 'SERVICE_END_SEQUENCE_ENABLED', False) and
+        if (self._last_stop_was_midi and self._se_on_midi_stop and
                 not self._service_end_running):
             self._service_end_running = True
             try:
-                asyncio.create_task(self.run_service_end_sequence())
+                self._spawn(self.run_service_end_sequence())
             except Exception as e:
                 self._post(f"SERVICE-END: failed to start task: {e}")
                 self._service_end_running = False
@@ -2194,45 +2923,38 @@ class App:
           - MIDI_STOP_TRIGGERS_FULL_SEQUENCE is True
           - last stop request source was MIDI
         """
+        # Config is a dataclass: every SERVICE_END_* field exists, so plain reads off one local.
+        cfg = self.cfg
         try:
             self._post("SERVICE-END: Sequence started")
 
-            # Flush any open logs before copying.
-            try:
-                if self._run_log_fp:
-                    self._run_log_fp.flush()
-            except Exception:
-                pass
-            try:
-                if self._session_log_fp:
-                    self._session_log_fp.flush()
-            except Exception:
-                pass
-
             # Wait for OBS to fully stop (stream + record), then cooldown.
-            deadline = time.time() + 300  # 5 minutes max wait
-            last_report = 0.0
-            while time.time() < deadline:
-                streaming, recording, err = self.obs.get_status()
-                if not streaming and not recording:
+            # loop() already polls OBS every tick and sets _obs_stopped_evt; no extra status RPCs here.
+            stopped_evt = self._obs_stopped_evt
+            deadline = time.monotonic() + 300  # 5 minutes max wait
+            while not stopped_evt.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
                     break
-                if time.time() - last_report > 10:
-                    self._post(f"SERVICE-END: Waiting for OBS stop... stream={'ON' if streaming else 'off'} rec={'ON' if recording else 'off'}")
-                    if err:
-                        self._post(f"SERVICE-END: OBS status note: {err}")
-                    last_report = time.time()
-                await asyncio.sleep(1.0)
-
-            wait_s = int(getattr(self.cfg, "SERVICE_END_POST_STOP_WAIT_SECONDS", 0) or 0)
+                streaming, recording, err = self._obs_last_status
+                self._post(f"SERVICE-END: Waiting for OBS stop... stream={'ON' if streaming else 'off'} rec={'ON' if recording else 'off'}")
+                if err:
+                    self._post(f"SERVICE-END: OBS status note: {err}")
+                try:
+                    await asyncio.wait_for(stopped_evt.wait(), timeout=min(10.0, remaining))
+                except asyncio.TimeoutError:
+                    pass
+
+            wait_s = int(cfg.SERVICE_END_POST_STOP_WAIT_SECONDS or 0)
             if wait_s > 0:
                 self._post(f"SERVICE-END: Cooldown {wait_s}s")
                 await asyncio.sleep(wait_s)
 
             # Create destination folder on USB/external drive.
-            usb_root = getattr(self.cfg, "SERVICE_END_USB_ROOT", "") or ""
+            usb_root = cfg.SERVICE_END_USB_ROOT or ""
             dest_dir = ""
             if usb_root and os.path.isdir(usb_root):
-                now_dt = now_in_cfg_tz(self.cfg)
+                now_dt = now_in_cfg_tz(cfg)
                 stamp = now_dt.strftime("%Y-%m-%d_%H%M%S")
                 dest_dir = os.path.join(usb_root, f"service_end_{stamp}")
                 try:
@@ -2247,55 +2969,86 @@ class App:
                 else:
                     self._post("SERVICE-END: USB root not set; skipping copy steps")
 
-            # Copy logs (current + optionally previous).
-            def _copy_file(src_path: str):
-                try:
-                    if not dest_dir:
-                        return
-                    if src_path and os.path.isfile(src_path):
-                        shutil.copy2(src_path, os.path.join(dest_dir, os.path.basename(src_path)))
-                        self._post(f"SERVICE-END: Copied {os.path.basename(src_path)}")
-                except Exception as e:
-                    self._post(f"SERVICE-END: Copy failed for {src_path}: {e}")
+            # Flush both (block-buffered) logs right before copying so the copies include the wait above.
+            self._flush_logs()
 
+            # Copy logs (current + optionally previous).
             if dest_dir:
                 base_dir = self._log_base_dir()
-                prefix = getattr(self.cfg, "LOG_RUN_FILE_PREFIX", "stream_agent")
-                want_prev = bool(getattr(self.cfg, "SERVICE_END_COPY_PREVIOUS_LOGS", True))
-
-                run_logs = sorted(glob.glob(os.path.join(base_dir, f"{prefix}_run_*.log")),
-                                  key=lambda p: os.path.getmtime(p), reverse=True)
-                sess_logs = sorted(glob.glob(os.path.join(base_dir, f"{prefix}_session_*.log")),
-                                   key=lambda p: os.path.getmtime(p), reverse=True)
+                prefix = cfg.LOG_RUN_FILE_PREFIX
+                want_prev = bool(cfg.SERVICE_END_COPY_PREVIOUS_LOGS)
 
-                for p in run_logs[: (2 if want_prev else 1)]:
-                    _copy_file(p)
-                for p in sess_logs[: (2 if want_prev else 1)]:
-                    _copy_file(p)
+                # One directory pass; DirEntry.stat() is cached so each file is stat'ed once.
+                run_pfx, sess_pfx = f"{prefix}_run_", f"{prefix}_session_"
+                run_logs, sess_logs = [], []
+                try:
+                    with os.scandir(base_dir) as it:
+                        for entry in it:
+                            name = entry.name
+                            if not name.endswith(".log"):
+                                continue
+                            if name.startswith(run_pfx):
+                                bucket = run_logs
+                            elif name.startswith(sess_pfx):
+                                bucket = sess_logs
+                            else:
+                                continue
+                            try:
+                                if entry.is_file():
+                                    bucket.append((entry.stat().st_mtime, entry.path, name))
+                            except OSError:
+                                continue
+                except OSError as e:
+                    self._post(f"SERVICE-END: Could not list logs: {e}")
+
+                # Sources came from scandir as regular files, so build destinations up front and copy.
+                n = 2 if want_prev else 1
+                copies = [(src, os.path.join(dest_dir, name), name)
+                          for _, src, name in heapq.nlargest(n, run_logs) + heapq.nlargest(n, sess_logs)]
+                for src, dst, name in copies:
+                    try:
+                        shutil.copy2(src, dst)
+                        self._post(f"SERVICE-END: Copied {name}")
+                    except Exception as e:
+                        self._post(f"SERVICE-END: Copy failed for {src}: {e}")
 
             # Copy today's MP4 (most recent only).
-            if dest_dir and getattr(self.cfg, "SERVICE_END_COPY_TODAYS_MP4", True):
-                rec_root = getattr(self.cfg, "OBS_RECORDING_PATH", "") or ""
+            if dest_dir and cfg.SERVICE_END_COPY_TODAYS_MP4:
+                rec_root = cfg.OBS_RECORDING_PATH or ""
                 if rec_root and os.path.isdir(rec_root):
-                    tz = get_tz(self.cfg)
-                    today = now_in_cfg_tz(self.cfg).date()
+                    tz = get_tz(cfg)
+                    today = now_in_cfg_tz(cfg).date()
 
-                    def file_date_matches(p: str) -> bool:
-                        try:
-                            ts = os.path.getmtime(p)
-                            if tz is not None:
-                                d = dt.datetime.fromtimestamp(ts, dt.timezone.utc).astimezone(tz).date()
-                            else:
-                                d = dt.datetime.fromtimestamp(ts).date()
-                            return d == today
-                        except Exception:
-                            return False
+                    # "Today" as a [lo, hi) POSIX-timestamp window (naive = local time when tz is unavailable).
+                    day_start = dt.datetime.combine(today, dt.time.min, tzinfo=tz)
+                    lo = day_start.timestamp()
+                    hi = (day_start + dt.timedelta(days=1)).timestamp()
 
-                    mp4s = [p for p in glob.glob(os.path.join(rec_root, "*.mp4")) if file_date_matches(p)]
+                    # Single scandir pass: the cached mtime serves both the date check and the "newest" pick.
+                    mp4s = []
+                    try:
+                        with os.scandir(rec_root) as it:
+                            for entry in it:
+                                if not entry.name.lower().endswith(".mp4"):  # glob was case-insensitive on Windows
+                                    continue
+                                try:
+                                    if entry.is_file():
+                                        ts = entry.stat().st_mtime
+                                        if lo <= ts < hi:
+                                            mp4s.append((ts, entry.path))
+                                except OSError:
+                                    continue
+                    except OSError as e:
+                        self._post(f"SERVICE-END: Could not list recordings: {e}")
                     if mp4s:
-                        mp4 = max(mp4s, key=lambda p: os.path.getmtime(p))
+                        mp4 = max(mp4s)[1]
                         try:
-                            shutil.copy2(mp4, os.path.join(dest_dir, os.path.basename(mp4)))
+                            mp4_dest = os.path.join(dest_dir, os.path.basename(mp4))
+                            shutil.copyfile(mp4, mp4_dest)  # kernel fast-copy path where the OS offers one
+                            try:
+                                shutil.copystat(mp4, mp4_dest)
+                            except OSError:
+                                pass  # FAT/exFAT USB drives may reject some metadata; the data is what matters
                             self._post(f"SERVICE-END: Copied recording {os.path.basename(mp4)}")
                         except Exception as e:
                             self._post(f"SERVICE-END: Recording copy failed: {e}")
@@ -2308,22 +3061,39 @@ class App:
                         self._post("SERVICE-END: OBS_RECORDING_PATH not set; skipping recording copy")
 
             # HOME_TEST_MODE safety: skip closing apps + shutdown.
-            if self.cfg.HOME_TEST_MODE:
+            if cfg.HOME_TEST_MODE:
                 self._post("SERVICE-END: HOME_TEST_MODE — skipping app closes and shutdown")
                 return
 
             # Close apps (optional), using psutil if available.
-            def close_process(name: str):
-                if not name:
-                    return
-                if psutil is None:
+            # One process-table pass (name attr only) collects every target; they are closed in config order.
+            targets = []
+            if cfg.SERVICE_END_CLOSE_PROCLAIM:
+                targets.append(cfg.PROCLAIM_PROCESS_NAME)
+            if cfg.SERVICE_END_CLOSE_MASTER_FADER:
+                targets.append(cfg.MASTER_FADER_PROCESS_NAME)
+            if cfg.SERVICE_END_CLOSE_OBS:
+                targets.append(cfg.SERVICE_END_OBS_PROCESS_NAME)
+            targets = [t for t in targets if t]
+
+            if targets and psutil is None:
+                for name in targets:
                     self._post(f"SERVICE-END: psutil missing — cannot close {name}")
-                    return
-                target = _safe_lower(name)
-                for proc in psutil.process_iter(['pid', 'name']):
+            elif targets:
+                wanted = {_safe_lower(t) for t in targets}
+                matches: Dict[str, list] = {}
+                for p in psutil.process_iter(['name']):
                     try:
-                        pn = proc.info.get('name') or ""
-                        if _safe_lower(pn) == target:
+                        pn = _safe_lower(p.info.get('name') or "")
+                    except Exception:
+                        continue
+                    if pn in wanted:
+                        matches.setdefault(pn, []).append(p)
+
+                for name in targets:
+                    closed = False
+                    for proc in matches.get(_safe_lower(name), []):
+                        try:
                             proc.terminate()
                             try:
                                 proc.wait(timeout=8)
@@ -2331,21 +3101,16 @@ class App:
                             except Exception:
                                 proc.kill()
                                 self._post(f"SERVICE-END: Force-killed {name}")
-                            return
-                    except Exception:
-                        continue
-                self._post(f"SERVICE-END: Process not found: {name}")
-
-            if getattr(self.cfg, "SERVICE_END_CLOSE_PROCLAIM", True):
-                close_process(getattr(self.cfg, "PROCLAIM_PROCESS_NAME", "Proclaim.exe"))
-            if getattr(self.cfg, "SERVICE_END_CLOSE_MASTER_FADER", True):
-                close_process(getattr(self.cfg, "MASTER_FADER_PROCESS_NAME", "MasterFader.exe"))
-            if getattr(self.cfg, "SERVICE_END_CLOSE_OBS", True):
-                close_process(getattr(self.cfg, "SERVICE_END_OBS_PROCESS_NAME", "obs64.exe"))
+                            closed = True
+                            break
+                        except Exception:
+                            continue
+                    if not closed:
+                        self._post(f"SERVICE-END: Process not found: {name}")
 
             # Optional Windows shutdown.
-            if getattr(self.cfg, "SERVICE_END_WINDOWS_SHUTDOWN", False):
-                delay = int(getattr(self.cfg, "SERVICE_END_SHUTDOWN_DELAY_SECONDS", 60) or 60)
+            if cfg.SERVICE_END_WINDOWS_SHUTDOWN:
+                delay = int(cfg.SERVICE_END_SHUTDOWN_DELAY_SECONDS or 60)
 
                 # UI-thread safe popup
                 self._ui_action(lambda: messagebox.showinfo(
@@ -2354,8 +3119,17 @@ class App:
                 ))
 
                 try:
-                    subprocess.call(["shutdown", "/s", "/t", str(delay)])
+                    # Fire and forget: no console flash, no inherited handles, thread isn't held on shutdown.exe.
+                    subprocess.Popen(
+                        ["shutdown", "/s", "/t", str(delay)],
+                        creationflags=getattr(subprocess, "DETACHED_PROCESS", 0) | getattr(subprocess, "CREATE_NO_WINDOW", 0),
+                        close_fds=True,
+                        stdin=subprocess.DEVNULL,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                    )
                     self._post(f"SERVICE-END: Shutdown initiated ({delay}s abort window)")
+                    self._flush_logs()  # Windows may end the process before _on_close runs
                 except Exception as e:
                     self._post(f"SERVICE-END: Shutdown failed: {e}")
             else:
@@ -2373,27 +3147,35 @@ class App:
         ok, msg = self.obs.toggle_record()
         self._post(f"{source}: {msg}")
 
-    def _timer_target_today(self) -> Optional[dt.datetime]:
+    def _timer_target_today(self, now: Optional[dt.datetime] = None) -> Optional[dt.datetime]:
         if not self.cfg.USE_TIMER_START:
             return None
-        now = now_in_cfg_tz(self.cfg)
+        if now is None:
+            now = now_in_cfg_tz(self.cfg)
+        # Only changes with the date or the timer settings; reuse it for every tick in between.
+        key = (now.date(), self.cfg.TIMER_START_HHMM, self.cfg.TIMER_WEEKDAY)
+        cached = self._timer_target_cache
+        if cached is not None and cached[0] == key:
+            return cached[1]
         if now.weekday() != self.cfg.TIMER_WEEKDAY:
-            return None
-        hh, mm = parse_hhmm(self.cfg.TIMER_START_HHMM)
-        return now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+            target = None
+        else:
+            hh, mm = parse_hhmm(self.cfg.TIMER_START_HHMM)
+            target = now.replace(hour=hh, minute=mm, second=0, microsecond=0)
+        self._timer_target_cache = (key, target)
+        return target
 
     def _timer_state_path(self) -> str:
         base = self.cfg.TIMER_STATE_FILE
-        if os.path.isabs(base):
-            return base
-        return os.path.join(os.path.dirname(os.path.abspath(__file__)), base)
+        return base if os.path.isabs(base) else os.path.join(_MODULE_DIR, base)
 
     def _load_timer_state(self):
         if not self.cfg.TIMER_PERSIST_STATE:
             return
         try:
-            with open(self._timer_state_path(), "r") as f:
-                data = json.load(f)
+            with open(self._timer_state_path(), "rb") as f:
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             date_s = data.get("date")
             status = data.get("status")
             hhmm = data.get("hhmm", self.cfg.TIMER_START_HHMM)
@@ -2411,232 +3193,201 @@ class App:
             return
         try:
             today = now_in_cfg_tz(self.cfg).date()
-            with open(self._timer_state_path(), "w") as f:
-                json.dump({"date": today.isoformat(), "status": status, "hhmm": hhmm}, f)
+            data = {"date": today.isoformat(), "status": status, "hhmm": hhmm}
+            blob = orjson.dumps(data) if orjson is not None else json.dumps(data).encode("utf-8")
+            with open(self._timer_state_path(), "wb") as f:
+                f.write(blob)
         except Exception:
             pass
 
-    def _timer_tick(self):
-        if not self.cfg.USE_TIMER_START:
-            self._set_ui_state(timer_text="Timer: disabled")
-            return
-
-        now_dt = now_in_cfg_tz(self.cfg)
-        if now_dt.weekday() != self.cfg.TIMER_WEEKDAY:
-            self._set_ui_state(timer_text=f"Next auto-start: Sunday {self.cfg.TIMER_START_HHMM}")
+    def _set_timer_text(self, text: str):
+        """Push the timer line only when it changed (each push bumps the HUD state version)."""
+        if text == self._last_timer_text:
             return
+        self._last_timer_text = text
+        self._set_ui_state(timer_text=text)
 
-        target = self._timer_target_today()
-        if target is None:
-            self._set_ui_state(timer_text=f"Timer active on Sundays at {self.cfg.TIMER_START_HHMM}")
-            return
+    def _timer_tick(self) -> float:
+        """Update the timer line / fire the auto-start; returns seconds until it next needs to run."""
+        if not self.cfg.USE_TIMER_START:
+            self._set_timer_text("Timer: disabled")
+            return 60.0
 
+        now_dt = now_in_cfg_tz(self.cfg)
         today = now_dt.date()
         if self._timer_done_today_date == today:
-            self._set_ui_state(timer_text=f"Timer: {'fired' if self._timer_done_status == 'fired' else 'missed'} today")
-            return
-
-        delta = int((target - now_dt).total_seconds())
-        if delta > 0:
-            self._set_ui_state(timer_text=f"Auto-start in T-{fmt_hms(delta)}")
-            return
-
-        past = int(-delta)
-        if past > self.cfg.TIMER_FIRE_GRACE_MINUTES * 60:
-            self._timer_done_today_date = today
-            self._timer_done_status = "missed"
-            self._save_timer_state("missed", self.cfg.TIMER_START_HHMM)
-            self._set_ui_state(timer_text="Timer: missed today — manual start needed")
-            return
-
-        self._timer_done_today_date = today
-        self._timer_done_status = "fired"
-        self._save_timer_state("fired", self.cfg.TIMER_START_HHMM)
-
-        streaming, _, _ = self.obs.get_status()
-        if streaming:
-            self._set_ui_state(timer_text=f"Timer fired ({self.cfg.TIMER_START_HHMM})")
-            return
-
-        self._set_ui_state(timer_text="Timer: starting stream now")
-        self._start_stream_flow("TIMER")
-
-
-    # -----------------------------
-    # Web HUD (HTTP + WebSocket)
-    # -----------------------------
-    def _web_payload(self) -> dict:
-        # Single snapshot for WebSocket clients.
-        # Browser JS expects:
-        #   msg.type == "state"
-        #   msg.state (banner/lines/rec_on)
-        #   msg.logs (array of lines)
-        #   msg.preset_labels (map)
-        with self._ui_lock:
-            state = dict(self._ui_state)
-            logs = list(self._log_buf)[-int(self.cfg.WEB_HUD_LOG_LINES):]
-            ver = self._state_version
-        return {
-            "type": "state",
-            "ver": ver,
-            "state": {
-                "banner_text": state.get("banner_text", ""),
-                "app_version": APP_DISPLAY,
-                "banner_style": state.get("banner_style", "Banner.TLabel"),
-                "obs_line": state.get("obs_line", ""),
-                "midi_line": state.get("midi_line", ""),
-                "cam_line": state.get("cam_line", ""),
-                "timer_text": state.get("timer_text", ""),
-                "health": {
-                    "level": state.get("health_level", "READY"),
-                    "title": state.get("health_title", "READY"),
-                    "detail": state.get("health_detail", ""),
-                    "last_ts": state.get("health_last_ts", ""),
-                    "last_msg": state.get("health_last_msg", ""),
-                },
-                "rec_on": bool(state.get("rec_on", False)),
-            },
-            "logs": logs,
-            "preset_labels": {int(k): v for k, v in self.cfg.PRESET_LABELS.items()},
-        }
-
-    def _web_html(self) -> str:
-        # Single-file HTML + external JS (avoids inline-script parsing issues)
-        # JS served from /app.js?v=14
-        return """<!doctype html>
-<html lang="en">
-<head>
-<meta charset="utf-8"/>
-<meta name="viewport" content="width=device-width, initial-scale=1"/>
-<title>Stream Agent HUD</title>
-<style>
-  :root { color-scheme: dark; }
-  body { margin:0; font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; background:#0b1118; color:#e9eef5; }
-  .wrap { max-width:520px; margin:0 auto; padding:14px; }
-  .card { background:#121a24; border:1px solid #1d2a3a; border-radius:16px; padding:14px; margin:10px 0; box-shadow: 0 8px 24px rgba(0,0,0,.35); }
-  .appVer { font-size:12px; opacity:.75; text-align:center; letter-spacing:.4px; margin-bottom:6px; }
-  .title { font-size:20px; font-weight:700; text-align:center; letter-spacing:.4px; }
-
-  /* Status banner: 4pt-ish black outline + state colors (matches PC HUD) */
-  .statusBanner { border:5px solid #000; border-radius:14px; padding:10px 12px; margin-top:6px; }
-  .sb-live { background:#2E7D32; }
-  .sb-ready { background:#4CAF50; }
-  .sb-warn { background:#FFC107; }
-  .sb-stop { background:#FF9800; }
-  .sb-ended { background:#2196F3; }
-  .sb-error { background:#F44336; }
-
-  /* White-text stroke (approx 3pt): use stroke + shadow fallback */
-  .sb-live .title, .sb-ready .title, .sb-ended .title, .sb-error .title {
-    color:#fff;
-    -webkit-text-stroke: 3px #000;
-    paint-order: stroke fill;
-    text-shadow:
-      -2px -2px 0 #000, 0 -2px 0 #000, 2px -2px 0 #000,
-      -2px  0   0 #000,               2px  0   0 #000,
-      -2px  2px 0 #000, 0  2px 0 #000, 2px  2px 0 #000;
-  }
-  .sb-warn .title, .sb-stop .title { color:#000; -webkit-text-stroke: 0; text-shadow:none; }
+            # Fired/missed already: nothing left to compute until the date rolls over.
+            self._set_timer_text(f"Timer: {'fired' if self._timer_done_status == 'fired' else 'missed'} today")
+            return 60.0
 
-  /* Make cards and buttons borders bolder (3pt solid black) */
-  .card { border:3px solid #000; }
-  .btn { border:3px solid #000; }
-  .pbtn { border:3px solid #000; }
-
-  /* Outlined button text (white) */
-  .btn { color:#fff; -webkit-text-stroke: 2px #000; paint-order: stroke fill;
-    text-shadow:
-      -1px -1px 0 #000, 0 -1px 0 #000, 1px -1px 0 #000,
-      -1px  0   0 #000,              1px  0   0 #000,
-      -1px  1px 0 #000, 0  1px 0 #000, 1px  1px 0 #000;
-  }
-
-  .conn { margin-top:6px; font-size:12px; opacity:.8; text-align:center; white-space:pre-wrap; }
-  .row { display:flex; gap:10px; }
-  .btn { flex:1; padding:14px 10px; border-radius:14px; border:0; font-size:16px; font-weight:700; cursor:pointer;  -webkit-touch-callout:none; -webkit-user-select:none; user-select:none; touch-action:manipulation; -webkit-tap-highlight-color: transparent;}
-  .btn:active { transform: translateY(1px); }
-  .bStart { background:#2fb14d; }
-  .bStop  { background:#e14b45; }
-  .bRec   { background:#f0a018; }
-  .bRec.on { background:#ff3b3b; box-shadow: 0 0 0 2px rgba(255,59,59,.35) inset; }
-    .bView { background:#1565C0; }
-  .bView2 { background:#37474F; }
-  /* Make anchor buttons behave like buttons */
-  a.btn { text-decoration:none; display:flex; align-items:center; justify-content:center; }
-.sectionTitle { font-size:13px; font-weight:700; opacity:.85; margin-bottom:8px; }
-  .grid { display:grid; grid-template-columns: 1fr 1fr; gap:10px; }
-  .pbtn { padding:12px 10px; border-radius:12px; border:1px solid #24354a; background:#0e1620; color:#e9eef5; font-size:14px; font-weight:650; cursor:pointer;  -webkit-touch-callout:none; -webkit-user-select:none; user-select:none; touch-action:manipulation; -webkit-tap-highlight-color: transparent;}
-  .pbtn:active { transform: translateY(1px); }
-  pre { margin:0; white-space:pre-wrap; word-break:break-word; font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, monospace; font-size:12px; line-height:1.25; }
-  #logBox{ display:block; max-height:360px; overflow-y:auto; padding-right:6px; }
-  .hint { font-size:12px; opacity:.75; text-align:center; padding:10px; }
+        # None on any other weekday; the weekday test itself is cached per date.
+        target = self._timer_target_today(now_dt)
+        if target is None:
+            self._set_timer_text(f"Next auto-start: Sunday {self.cfg.TIMER_START_HHMM}")
+            return 60.0
 
-  /* Sticky health indicator (operational status) */
-  .healthBox { border:1px solid #26384f; border-radius:12px; padding:10px 12px; margin:10px 0 10px 0; }
-  .healthTitle { font-size:16px; font-weight:800; letter-spacing:.3px; }
-  .healthDetail { margin-top:4px; font-size:12px; opacity:.92; white-space:pre-wrap; }
-  .healthLast { margin-top:6px; font-size:12px; opacity:.85; white-space:pre-wrap; }
-  .h-ready { background: rgba(120, 140, 160, .10); border-color: rgba(120, 140, 160, .25); }
-  .h-live { background: rgba(25, 190, 95, .14); border-color: rgba(25, 190, 95, .35); }
-  .h-recovering { background: rgba(240, 180, 20, .12); border-color: rgba(240, 180, 20, .35); }
-  .h-degraded { background: rgba(240, 180, 20, .12); border-color: rgba(240, 180, 20, .35); }
-  .h-error { background: rgba(230, 60, 60, .13); border-color: rgba(230, 60, 60, .35); }
-  .h-recovered { background: rgba(100, 160, 255, .12); border-color: rgba(100, 160, 255, .35); }
+        delta = int((target - now_dt).total_seconds())
+        if delta > 0:
+            self._set_timer_text(f"Auto-start in T-{fmt_hms(delta)}")
+            # Coarse countdown while far out; every worker tick for the last 90s.
+            if delta >= 600:
+                return 15.0
+            if delta >= 90:
+                return 5.0
+            return 0.0
 
-</style>
-</head>
-<body>
-<div class="wrap">
-  <div class="card">
-    <div class="appVer" id="appVer">__APP_VER__</div>
-    <div class="statusBanner sb-ready" id="statusBanner"><div class="title" id="statusTitle">CONNECTING…</div></div>
-    <div class="conn" id="connLine">Loading JavaScript…</div>
-  </div>
+        past = int(-delta)
+        if past > self.cfg.TIMER_FIRE_GRACE_MINUTES * 60:
+            self._timer_done_today_date = today
+            self._timer_done_status = "missed"
+            self._save_timer_state("missed", self.cfg.TIMER_START_HHMM)
+            self._set_timer_text("Timer: missed today — manual start needed")
+            return 60.0
 
-  <div class="card">
-    <div class="row">
-      <button class="btn bStart" id="btnStart">Start</button>
-      <button class="btn bStop" id="btnStop">Stop</button>
-      <button class="btn bRec" id="btnRec">REC</button>
-    </div>
-  </div>
+        self._timer_done_today_date = today
+        self._timer_done_status = "fired"
+        self._save_timer_state("fired", self.cfg.TIMER_START_HHMM)
 
-  <div class="card">
-    <div class="sectionTitle">Monitor</div>
-    <div class="row">
-      <a class="btn bView" id="btnViewYT" href="__YTLIVE__" target="_blank" rel="noopener">View Live (YouTube)</a>
-      <a class="btn bView2" id="btnViewEmbed" href="__VIEWER__">View Live (Embedded)</a>
-    </div>
-    <div class="row" style="margin-top:10px;">
-      <a class="btn bView2" id="btnCfg" href="__CONFIG__">Config</a>
-      <a class="btn bView2" id="btnCfgTimer" href="__CONFIG_TIMER__">Timer</a>
-    </div>
-    <div class="hint" style="margin-top:8px; opacity:.8;">Tip: If embedded playback is picky, use the YouTube button.</div>
-  </div>
+        streaming, _, _ = self.obs.get_status()
+        if streaming:
+            self._set_timer_text(f"Timer fired ({self.cfg.TIMER_START_HHMM})")
+            return 60.0
 
-  <div class="card">
-    <div class="sectionTitle">Camera Presets</div>
-    <div class="grid" id="presetGrid"></div>
-  </div>
+        self._set_timer_text("Timer: starting stream now")
+        self._start_stream_flow("TIMER")
+        return 60.0
 
-  <div class="card">
-    <div class="sectionTitle">Log (last 30)</div>
-    <div id="healthBox" class="healthBox h-ready">
-      <div id="healthTitle" class="healthTitle">READY</div>
-      <div id="healthDetail" class="healthDetail"></div>
-      <div id="healthLast" class="healthLast"></div>
-    </div>
-    <pre id="logBox"></pre>
-  </div>
 
-  <div class="hint"><noscript>This page needs JavaScript enabled.</noscript></div>
-</div>
+    # -----------------------------
+    # Web HUD (HTTP + WebSocket)
+    # -----------------------------
+    def _web_logs_json(self) -> bytes:
+        """JSON array of the Web HUD log tail; cached until the next _post()."""
+        with self._ui_lock:
+            cached = self._log_json_cache
+            if cached is not None:
+                return cached
+            lines = tuple(self._log_buf)
+            ver = self._state_version
+        # Encode outside the lock so _post() writers aren't held up behind it.
+        out = _json_bytes(lines)
+        with self._ui_lock:
+            if self._state_version == ver:  # no _post() in between -> still current
+                self._log_json_cache = out
+        return out
+
+    def _web_payload_json(self) -> bytes:
+        """Serialized full _web_payload() (a 'state' message), as the UTF-8 bytes sent to clients."""
+        return self._web_snapshot()[1]
+
+    def _web_snapshot(self) -> Tuple[dict, bytes]:
+        """(payload without logs, serialized full payload); reused until _state_version moves."""
+        with self._ui_lock:
+            ver = self._state_version
+            cached_ver, cached_payload, cached = self._payload_json_cache
+        if cached_ver == ver:
+            return cached_payload, cached
+        payload = self._web_payload(include_logs=False)
+        out = _json_bytes(payload)[:-1] + b', "logs": ' + self._web_logs_json() + b"}"
+        self._payload_json_cache = (payload["ver"], payload, out)
+        return payload, out
+
+    def _web_broadcast_json(self) -> bytes:
+        """Broadcast message: a 'patch' with the fields changed since the last broadcast, or full state."""
+        payload, full = self._web_snapshot()
+        prev = self._ws_last_sent
+        tail = None
+        with self._ui_lock:
+            log_seq = self._log_seq
+            buf = self._log_buf
+            new = log_seq - prev[1] if prev is not None else 0
+            if 0 < new < len(buf):
+                tail = [buf[i] for i in range(len(buf) - new, len(buf))]
+            logs_max = buf.maxlen
+        self._ws_last_sent = (payload, log_seq)
+        if prev is None or self._ws_force_full:
+            self._ws_force_full = False
+            return full
+        prev_payload = prev[0]
+        prev_state = prev_payload["state"]
+        patch = {
+            "type": "patch",
+            "ver": payload["ver"],
+            "base": prev_payload["ver"],  # client resyncs if this isn't the last version it saw
+            "state": {k: v for k, v in payload["state"].items() if prev_state.get(k) != v},
+        }
+        if payload["preset_labels"] is not prev_payload["preset_labels"]:
+            patch["preset_labels"] = payload["preset_labels"]
+            patch["preset_labels_sig"] = payload["preset_labels_sig"]
+        body = _json_bytes(patch)
+        if tail is not None:
+            # Just the new lines; the client appends them and trims to logs_max.
+            body = body[:-1] + b', "logs_append": ' + _json_bytes(tail) + b', "logs_max": %d}' % logs_max
+        elif new > 0:
+            body = body[:-1] + b', "logs": ' + self._web_logs_json() + b"}"
+        return body
+
+    def _web_payload(self, include_logs: bool = True) -> dict:
+        # Single snapshot for WebSocket clients.
+        # Browser JS expects:
+        #   msg.type == "state"
+        #   msg.state (banner/lines/rec_on)
+        #   msg.logs (array of lines)
+        #   msg.preset_labels (map)
+        #   msg.preset_labels_sig (hash of preset_labels)
+        logs = None
+        # msg.state is the ready-made _web_state (never mutated in place), so no copy is needed.
+        with self._ui_lock:
+            state = self._web_state
+            if include_logs:
+                logs = tuple(self._log_buf)
+            ver = self._state_version
+        payload = {
+            "type": "state",
+            "ver": ver,
+            "state": state,
+            "preset_labels": self._preset_labels_payload,
+            "preset_labels_sig": self._preset_labels_sig,
+        }
+        if include_logs:
+            payload["logs"] = logs
+        return payload
+
+    def _web_page(self, name: str, build) -> str:
+        """Rendered page HTML, memoized on the cfg values the pages embed (cleared on cfg persist)."""
+        cfg = self.cfg
+        key = (name, cfg.WEB_HUD_TOKEN, getattr(cfg, "YOUTUBE_LIVE_URL", ""), getattr(cfg, "YOUTUBE_CHANNEL_ID", ""))
+        html = self._html_cache.get(key)
+        if html is None:
+            html = build()
+            self._html_cache[key] = html
+        return html
+
+    def _web_html(self) -> str:
+        return self._web_page("hud", self._build_web_html)
 
-<script src="/app.js?v=14"></script>
-</body>
-</html>
-""".replace("__APP_VER__", APP_DISPLAY).replace("__YTLIVE__", getattr(self.cfg, "YOUTUBE_LIVE_URL", "https://www.youtube.com/@NewHopeLutheranChurchRegina/live")).replace("__VIEWER__", "/viewer" + (("?token=" + self.cfg.WEB_HUD_TOKEN) if self.cfg.WEB_HUD_TOKEN else "")).replace("__CONFIG__", "/config" + (("?token=" + self.cfg.WEB_HUD_TOKEN) if self.cfg.WEB_HUD_TOKEN else "")).replace("__CONFIG_TIMER__", "/config_timer" + (("?token=" + self.cfg.WEB_HUD_TOKEN) if self.cfg.WEB_HUD_TOKEN else ""))
     def _web_viewer_html(self) -> str:
+        return self._web_page("viewer", self._build_web_viewer_html)
+
+    def _web_config_html(self) -> str:
+        return self._web_page("config", self._build_web_config_html)
+
+    def _web_config_timer_html(self) -> str:
+        return self._web_page("config_timer", self._build_web_config_timer_html)
+
+    def _build_web_html(self) -> str:
+        # Single-file HTML + external JS (avoids inline-script parsing issues)
+        # JS served from /app.js?v=14
+        t = self.cfg.WEB_HUD_TOKEN
+        token_qs = ("?token=" + t) if t else ""
+        return _HUD_HTML_TMPL.substitute(
+            APP_VER=APP_DISPLAY,
+            YTLIVE=getattr(self.cfg, "YOUTUBE_LIVE_URL", "https://www.youtube.com/@NewHopeLutheranChurchRegina/live"),
+            VIEWER="/viewer" + token_qs,
+            CONFIG="/config" + token_qs,
+            CONFIG_TIMER="/config_timer" + token_qs,
+        )
+    def _build_web_viewer_html(self) -> str:
         # Simple "viewer screen" for phones/tablets with a big BACK button.
         # Embedding can be picky on mobile; we provide a direct YouTube fallback link too.
         token_qs = f"?token={self.cfg.WEB_HUD_TOKEN}" if self.cfg.WEB_HUD_TOKEN else ""
@@ -2690,180 +3441,27 @@ class App:
   </div>
 </div>
 </body>
-</html>"""
-
-    # ----------------------------
-    # WEB HUD — Config Editor pages (v8.0 prep)
-    # ----------------------------
-    def _web_config_html(self) -> str:
-        # Separate page for general configuration (editable fields + read-only critical constants)
-        return """<!doctype html>
-<html lang="en">
-<head>
-<meta charset="utf-8"/>
-<meta name="viewport" content="width=device-width, initial-scale=1"/>
-<title>Stream Agent Config</title>
-<style>
-  :root { color-scheme: dark; }
-  body { margin:0; font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; background:#0b1118; color:#e9eef5; }
-  .wrap { max-width:700px; margin:0 auto; padding:14px; }
-  .card { background:#121a24; border:3px solid #000; border-radius:16px; padding:14px; margin:10px 0; box-shadow: 0 8px 24px rgba(0,0,0,.35); }
-  .appVer { font-size:12px; opacity:.75; text-align:center; letter-spacing:.4px; margin-bottom:6px; }
-  .title { font-size:20px; font-weight:800; text-align:center; letter-spacing:.4px; }
-  .sub { font-size:12px; opacity:.85; text-align:center; margin-top:4px; white-space:pre-wrap; }
-  .row { display:flex; gap:10px; align-items:center; flex-wrap:wrap; }
-  .btn { padding:12px 10px; border-radius:14px; border:3px solid #000; background:#0e1620; color:#fff; font-weight:800; cursor:pointer;
-    -webkit-text-stroke: 2px #000; paint-order: stroke fill;
-    text-shadow: -1px -1px 0 #000, 0 -1px 0 #000, 1px -1px 0 #000, -1px 0 0 #000, 1px 0 0 #000, -1px 1px 0 #000, 0 1px 0 #000, 1px 1px 0 #000;
-    -webkit-touch-callout:none; -webkit-user-select:none; user-select:none; touch-action:manipulation; -webkit-tap-highlight-color: transparent;
-  }
-  .btn:active { transform: translateY(1px); }
-  .bBack { background:#37474F; }
-  .bApply { background:#2E7D32; }
-  .bUnlock { background:#FF9800; }
-  .bRestore { background:#F44336; }
-  .bExport { background:#1565C0; }
-  .bImport { background:#455A64; }
-
-  .secTitle { font-size:14px; font-weight:900; opacity:.9; margin:0 0 10px; letter-spacing:.2px; }
-  .item { padding:10px; border-radius:14px; border:1px solid #24354a; background:#0e1620; margin:8px 0; }
-  .item.changed { border:2px solid #FFC107; }
-  .item.readonly { opacity:.78; }
-  .line { font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace; font-size:12px; opacity:.95; word-break:break-word; }
-  .ctrl { margin-top:8px; display:flex; gap:8px; align-items:center; flex-wrap:wrap; }
-  .pill { font-size:11px; padding:4px 8px; border-radius:999px; border:1px solid #24354a; opacity:.85; }
-  .pill.locked { border-color:#F44336; }
-  .pill.unlocked { border-color:#FF9800; }
-  .pill.live { border-color:#2E7D32; }
-
-  .switch { position:relative; display:inline-block; width:56px; height:30px; }
-  .switch input { opacity:0; width:0; height:0; }
-  .slider { position:absolute; cursor:pointer; inset:0; background:#37474F; transition:.2s; border-radius:999px; border:2px solid #000; }
-  .slider:before { position:absolute; content:""; height:22px; width:22px; left:3px; top:3px; background:#fff; transition:.2s; border-radius:50%; }
-  input:checked + .slider { background:#2E7D32; }
-  input:checked + .slider:before { transform:translateX(26px); }
-
-  select, input[type="text"] { background:#0b1118; color:#e9eef5; border:2px solid #24354a; border-radius:10px; padding:10px; font-size:14px; }
-  input[type="text"]{ width: min(520px, 100%); }
-
-  .stepper { display:flex; gap:6px; align-items:center; }
-  .stepBtn { padding:10px 12px; border-radius:12px; border:3px solid #000; background:#263238; color:#fff; font-weight:900; cursor:pointer; min-width:44px; text-align:center; }
-  .stepVal { min-width:70px; text-align:center; padding:10px 10px; border-radius:12px; border:2px solid #24354a; background:#0b1118; font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace; }
-
-  .tinyBtn { padding:8px 10px; border-radius:12px; border:3px solid #000; background:#455A64; color:#fff; font-weight:900; cursor:pointer; }
-  .tinyBtn:active { transform: translateY(1px); }
-
-  .note { font-size:12px; opacity:.8; white-space:pre-wrap; margin-top:8px; }
-  .footer { font-size:12px; opacity:.7; text-align:center; padding:10px 0 18px; }
-  .hidden { display:none; }
-</style>
-</head>
-<body>
-<div class="wrap">
-  <div class="card">
-    <div class="appVer" id="appVer">__APP_VER__</div>
-    <div class="title">Config</div>
-    <div class="sub" id="statusSub">Loading...</div>
-    <div class="row" style="justify-content:center; margin-top:10px;">
-      <a class="btn bBack" id="btnBack" href="__BACK__">Back</a>
-      <button class="btn bUnlock" id="btnUnlock">Unlock (2 min)</button>
-      <button class="btn bApply" id="btnApply">Apply</button>
-      <button class="btn bRestore" id="btnRestore">Restore Defaults</button>
-    </div>
-    <div class="row" style="justify-content:center; margin-top:10px;">
-      <a class="btn bExport" id="btnExport" href="__EXPORT__" target="_blank" rel="noopener">Export</a>
-      <label class="btn bImport" for="fileImport" style="display:inline-flex; align-items:center; justify-content:center;">Import</label>
-      <input id="fileImport" class="hidden" type="file" accept="application/json"/>
-      <a class="btn bBack" id="btnTimer" href="__TIMER__">Timer</a>
-    </div>
-    <div class="note">Rules:
-- While LIVE, editing is locked unless you temporarily Unlock.
-- Critical constants (camera/VISCA identity, tokens, host/port) are read-only here.</div>
-  </div>
-
-  <div id="cfgRoot"></div>
-
-  <div class="footer">Stream Agent Config Editor</div>
-</div>
-
-<script src="/config.js?v=1"></script>
-</body>
-</html>
-""".replace("__APP_VER__", APP_DISPLAY)\
-   .replace("__BACK__", "/" + (("?token=" + self.cfg.WEB_HUD_TOKEN) if self.cfg.WEB_HUD_TOKEN else ""))\
-   .replace("__TIMER__", "/config_timer" + (("?token=" + self.cfg.WEB_HUD_TOKEN) if self.cfg.WEB_HUD_TOKEN else ""))\
-   .replace("__EXPORT__", "/api/config/export" + (("?token=" + self.cfg.WEB_HUD_TOKEN) if self.cfg.WEB_HUD_TOKEN else ""))
-
-    def _web_config_timer_html(self) -> str:
-        # Separate page for TIMER AUTO-START adjustments + dedicated restore button.
-        return """<!doctype html>
-<html lang="en">
-<head>
-<meta charset="utf-8"/>
-<meta name="viewport" content="width=device-width, initial-scale=1"/>
-<title>Stream Agent Timer Config</title>
-<style>
-  :root { color-scheme: dark; }
-  body { margin:0; font-family: system-ui, -apple-system, Segoe UI, Roboto, Arial, sans-serif; background:#0b1118; color:#e9eef5; }
-  .wrap { max-width:700px; margin:0 auto; padding:14px; }
-  .card { background:#121a24; border:3px solid #000; border-radius:16px; padding:14px; margin:10px 0; box-shadow: 0 8px 24px rgba(0,0,0,.35); }
-  .appVer { font-size:12px; opacity:.75; text-align:center; letter-spacing:.4px; margin-bottom:6px; }
-  .title { font-size:20px; font-weight:800; text-align:center; letter-spacing:.4px; }
-  .sub { font-size:12px; opacity:.85; text-align:center; margin-top:4px; white-space:pre-wrap; }
-  .row { display:flex; gap:10px; align-items:center; flex-wrap:wrap; justify-content:center; }
-  .btn { padding:12px 10px; border-radius:14px; border:3px solid #000; background:#0e1620; color:#fff; font-weight:800; cursor:pointer;
-    -webkit-text-stroke: 2px #000; paint-order: stroke fill;
-    text-shadow: -1px -1px 0 #000, 0 -1px 0 #000, 1px -1px 0 #000, -1px 0 0 #000, 1px 0 0 #000, -1px 1px 0 #000, 0 1px 0 #000, 1px 1px 0 #000;
-    -webkit-touch-callout:none; -webkit-user-select:none; user-select:none; touch-action:manipulation; -webkit-tap-highlight-color: transparent;
-  }
-  .btn:active { transform: translateY(1px); }
-  .bBack { background:#37474F; }
-  .bApply { background:#2E7D32; }
-  .bUnlock { background:#FF9800; }
-  .bRestore { background:#F44336; }
-  .secTitle { font-size:14px; font-weight:900; opacity:.9; margin:0 0 10px; letter-spacing:.2px; }
-  .item { padding:10px; border-radius:14px; border:1px solid #24354a; background:#0e1620; margin:8px 0; }
-  .item.changed { border:2px solid #FFC107; }
-  .item.readonly { opacity:.78; }
-  .line { font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace; font-size:12px; opacity:.95; word-break:break-word; }
-  .ctrl { margin-top:8px; display:flex; gap:8px; align-items:center; flex-wrap:wrap; }
-  .switch { position:relative; display:inline-block; width:56px; height:30px; }
-  .switch input { opacity:0; width:0; height:0; }
-  .slider { position:absolute; cursor:pointer; inset:0; background:#37474F; transition:.2s; border-radius:999px; border:2px solid #000; }
-  .slider:before { position:absolute; content:""; height:22px; width:22px; left:3px; top:3px; background:#fff; transition:.2s; border-radius:50%; }
-  input:checked + .slider { background:#2E7D32; }
-  input:checked + .slider:before { transform:translateX(26px); }
-  select, input[type="text"] { background:#0b1118; color:#e9eef5; border:2px solid #24354a; border-radius:10px; padding:10px; font-size:14px; }
-  input[type="text"]{ width: min(520px, 100%); }
-  .stepper { display:flex; gap:6px; align-items:center; }
-  .stepBtn { padding:10px 12px; border-radius:12px; border:3px solid #000; background:#263238; color:#fff; font-weight:900; cursor:pointer; min-width:44px; text-align:center; }
-  .stepVal { min-width:70px; text-align:center; padding:10px 10px; border-radius:12px; border:2px solid #24354a; background:#0b1118; font-family: ui-monospace, SFMono-Regular, Menlo, Consolas, "Liberation Mono", monospace; }
-  .note { font-size:12px; opacity:.8; white-space:pre-wrap; margin-top:8px; }
-</style>
-</head>
-<body>
-<div class="wrap">
-  <div class="card">
-    <div class="appVer" id="appVer">__APP_VER__</div>
-    <div class="title">Timer</div>
-    <div class="sub" id="statusSub">Loading...</div>
-    <div class="row" style="margin-top:10px;">
-      <a class="btn bBack" id="btnBack" href="__BACK__">Back</a>
-      <button class="btn bUnlock" id="btnUnlock">Unlock (2 min)</button>
-      <button class="btn bApply" id="btnApply">Apply</button>
-      <button class="btn bRestore" id="btnRestoreTimer">Restore TIMER Defaults</button>
-    </div>
-    <div class="note">Restore TIMER Defaults resets only the TIMER AUTO-START fields to their shipped Sunday defaults, without affecting other tuned settings.</div>
-  </div>
-
-  <div id="cfgRoot"></div>
-</div>
-
-<script src="/config.js?v=1"></script>
-</body>
-</html>
-""".replace("__APP_VER__", APP_DISPLAY)\
-   .replace("__BACK__", "/" + (("?token=" + self.cfg.WEB_HUD_TOKEN) if self.cfg.WEB_HUD_TOKEN else ""))
+</html>"""
+
+    # ----------------------------
+    # WEB HUD — Config Editor pages (v8.0 prep)
+    # ----------------------------
+    def _build_web_config_html(self) -> str:
+        # Separate page for general configuration (editable fields + read-only critical constants)
+        t = self.cfg.WEB_HUD_TOKEN
+        token_qs = ("?token=" + t) if t else ""
+        return _CONFIG_HTML_TMPL.substitute(
+            APP_VER=APP_DISPLAY,
+            BACK="/" + token_qs,
+            TIMER="/config_timer" + token_qs,
+            EXPORT="/api/config/export" + token_qs,
+        )
+
+    def _build_web_config_timer_html(self) -> str:
+        # Separate page for TIMER AUTO-START adjustments + dedicated restore button.
+        t = self.cfg.WEB_HUD_TOKEN
+        token_qs = ("?token=" + t) if t else ""
+        return _CONFIG_TIMER_HTML_TMPL.substitute(APP_VER=APP_DISPLAY, BACK="/" + token_qs)
 
     def _web_config_js(self) -> str:
         # Shared JS for /config and /config_timer
@@ -2920,29 +3518,60 @@ class App:
   var state = {
     snapshot: null,
     edited: {}, // key -> value (or dict for PRESET_DELAYS_SECONDS)
+    editedJson: null, // serialized apply body for `edited`; null whenever edited changes
     dirty: false,
-    lastTap: {}
+    pendingConfirms: {}, // key -> { btn, label1, tappedAt, expiresAt } awaiting a second tap
+    layoutSig: null // layoutSig() of the rendered tree
   };
 
-  function setStatus(t){ if (statusSub) statusSub.textContent = t; }
+  // Write text only when it differs from what this function last wrote there. Every write to
+  // a node managed this way must go through setText(), or the cached _last goes stale.
+  function setText(el, t){
+    if (el && el._last !== t) {
+      el.textContent = t;
+      el._last = t;
+    }
+  }
+
+  function setStatus(t){ setText(statusSub, t); }
+
+  function nowMs(){
+    return (window.performance && window.performance.now) ? window.performance.now() : Date.now();
+  }
+
+  // One shared 200ms tick reverts expired "Tap again" prompts; it stops when none are pending.
+  var confirmTimer = null;
+
+  function confirmTick(){
+    var now = nowMs();
+    var left = 0;
+    for (var key in state.pendingConfirms) {
+      var p = state.pendingConfirms[key];
+      if (now >= p.expiresAt) {
+        delete state.pendingConfirms[key];
+        if (p.btn) p.btn.textContent = p.label1;
+      } else {
+        left++;
+      }
+    }
+    if (!left) {
+      clearInterval(confirmTimer);
+      confirmTimer = null;
+    }
+  }
 
   function tapConfirm(key, btn, label1, label2, action){
-    var now = Date.now();
-    var lt = state.lastTap[key] || 0;
-    if (now - lt < 2000) {
-      state.lastTap[key] = 0;
+    var now = nowMs();
+    var p = state.pendingConfirms[key];
+    if (p && now - p.tappedAt < 2000) {
+      delete state.pendingConfirms[key];
       if (btn) btn.textContent = label1;
       action();
       return;
     }
-    state.lastTap[key] = now;
+    state.pendingConfirms[key] = { btn: btn, label1: label1, tappedAt: now, expiresAt: now + 2200 };
     if (btn) btn.textContent = label2;
-    setTimeout(function(){
-      if (state.lastTap[key] === now) {
-        state.lastTap[key] = 0;
-        if (btn) btn.textContent = label1;
-      }
-    }, 2200);
+    if (!confirmTimer) confirmTimer = setInterval(confirmTick, 200);
   }
 
   function fmtBool(v){ return v ? 'True' : 'False'; }
@@ -2953,275 +3582,470 @@ class App:
     return Math.round(x*inv)/inv;
   }
 
-  function makeItemEl(item, locked){
-    var div = document.createElement('div');
-    div.className = 'item' + (item.changed ? ' changed' : '') + (item.readonly ? ' readonly' : '');
-    var line = document.createElement('div');
-    line.className = 'line';
-    line.textContent = item.display;
-    div.appendChild(line);
+  // key -> { item, line, ...control nodes } for the rendered items. The controls carry
+  // data-act / data-key / data-preset and the three delegated listeners on root resolve them here,
+  // so no per-control closures or listeners are created.
+  var itemsByKey = Object.create(null);
+
+  // Edits are staged here (key -> latest value) and committed to state.edited, together with
+  // the line text, once per animation frame — a burst of keystrokes/taps costs one write each.
+  var pendingWrites = Object.create(null);
+  var rafScheduled = false;
+
+  function stage(key, v){
+    pendingWrites[key] = v;
+    if (!rafScheduled) {
+      rafScheduled = true;
+      requestAnimationFrame(flushPending);
+    }
+  }
 
-    if (item.note) {
-      var n = document.createElement('div');
-      n.className = 'note';
-      n.textContent = item.note;
-      div.appendChild(n);
+  // JSON-style quoting; plain strings (the usual case) skip JSON.stringify entirely.
+  var NEEDS_ESCAPE = /[\\"\u0000-\u001f]/;
+  function quoteStr(s){
+    s = '' + s;
+    return NEEDS_ESCAPE.test(s) ? JSON.stringify(s) : ('"' + s + '"');
+  }
+
+  function lineFor(item, v){
+    if (item.kind === 'bool') return item.key + ': bool = ' + fmtBool(v);
+    if (item.kind === 'int') return item.key + ': int = ' + v;
+    // values are snapped to their step (roundToStep), so whole numbers are exact here
+    if (item.kind === 'float') return item.key + ': float = ' + ((v % 1 === 0) ? v.toFixed(1) : ('' + v));
+    if (item.kind === 'preset_delays') return null;
+    return item.key + ': str = ' + quoteStr(v);
+  }
+
+  function flushPending(){
+    rafScheduled = false;
+    var w = pendingWrites;
+    pendingWrites = Object.create(null);
+    for (var key in w) {
+      state.edited[key] = w[key];
+      state.editedJson = null;
+      state.dirty = true;
+      var ent = itemsByKey[key];
+      if (!ent) continue;
+      var t = lineFor(ent.item, w[key]);
+      if (t != null) setText(ent.line, t);
     }
+  }
 
-    if (item.readonly) return div;
+  // Latest value for an item: staged, then edited, then the snapshot's.
+  function curValue(item){
+    if (item.key in pendingWrites) return pendingWrites[item.key];
+    return (state.edited[item.key]!=null) ? state.edited[item.key] : item.value;
+  }
 
-    var ctrl = document.createElement('div');
-    ctrl.className = 'ctrl';
+  function setV(ent, newV){
+    var item = ent.item;
+    if (item.kind === 'int') newV = parseInt(newV,10);
+    else newV = parseFloat(newV);
+    if (isNaN(newV)) newV = item.value;
+    newV = Math.max(ent.minv, Math.min(ent.maxv, newV));
+    if (item.kind === 'float') newV = roundToStep(newV, ent.step);
+    if (newV === curValue(item)) return;  // clamped at a bound / no-op: nothing to stage or redraw
+    setText(ent.val, '' + newV);
+    stage(item.key, newV);
+  }
 
-    var disabled = !!locked;
+  function setK(ent, k, newV){
+    newV = Math.max(0, Math.min(600, newV | 0));  // always a number here (cur/default + step)
+    ent.cur[k] = newV;
+    setText(ent.vals[k], '' + newV);
+    state.editedJson = null;  // cur may already be the edited dict, mutated in place above
+    // cur is the edited dict itself: register it once, later steps just mutate it
+    var key = ent.item.key;
+    if (state.edited[key] !== ent.cur && pendingWrites[key] !== ent.cur) stage(key, ent.cur);
+  }
 
-    // bool toggle
-    if (item.kind === 'bool'){
-      var label = document.createElement('label');
-      label.className = 'switch';
-      var inp = document.createElement('input');
-      inp.type = 'checkbox';
-      inp.checked = !!item.value;
-      inp.disabled = disabled;
-      var slider = document.createElement('span');
-      slider.className = 'slider';
-      label.appendChild(inp);
-      label.appendChild(slider);
-      ctrl.appendChild(label);
-
-      var txt = document.createElement('span');
-      txt.className = 'pill';
-      txt.textContent = fmtBool(inp.checked);
-      ctrl.appendChild(txt);
-
-      inp.addEventListener('change', function(){
-        txt.textContent = fmtBool(inp.checked);
-        try { line.textContent = item.key + ': bool = ' + fmtBool(inp.checked); } catch(e) {}
-        state.edited[item.key] = !!inp.checked;
-        state.dirty = true;
-      });
-    }
-    // enum dropdown
-    else if (item.kind === 'enum'){
-      var sel = document.createElement('select');
-      sel.disabled = disabled;
-      (item.options || []).forEach(function(opt){
+  function makeBtn(cls, text, disabled, act, key){
+    var b = document.createElement('button');
+    b.className = cls;
+    b.textContent = text;
+    b.disabled = disabled;
+    b.dataset.act = act;
+    b.dataset.key = key;
+    return b;
+  }
+
+  // Per-kind control builders / value writers. Each one only ever sees items of its own kind.
+  function buildBool(item, ctrl, ent){
+    var label = document.createElement('label');
+    label.className = 'switch';
+    var inp = document.createElement('input');
+    inp.type = 'checkbox';
+    inp.dataset.act = 'bool';
+    inp.dataset.key = item.key;
+    var slider = document.createElement('span');
+    slider.className = 'slider';
+    label.appendChild(inp);
+    label.appendChild(slider);
+    ctrl.appendChild(label);
+
+    var txt = document.createElement('span');
+    txt.className = 'pill';
+    ctrl.appendChild(txt);
+    ent.inp = inp;
+    ent.txt = txt;
+    ent.ctrls.push(inp);
+  }
+
+  // options list -> prebuilt <option> fragment; each <select> gets a deep clone in one append
+  var optionCache = Object.create(null);
+
+  function optionsFrag(options){
+    var ck = options.join('\x1f');
+    var tmpl = optionCache[ck];
+    if (!tmpl) {
+      tmpl = document.createDocumentFragment();
+      options.forEach(function(opt){
         var o = document.createElement('option');
         o.value = opt;
         o.textContent = opt;
-        if (opt === item.value) o.selected = true;
-        sel.appendChild(o);
-      });
-      sel.addEventListener('change', function(){
-        try { line.textContent = item.key + ': str = ' + JSON.stringify(sel.value); } catch(e) {}
-        state.edited[item.key] = sel.value;
-        state.dirty = true;
+        tmpl.appendChild(o);
       });
-      ctrl.appendChild(sel);
+      optionCache[ck] = tmpl;
     }
-    // preset delays dict
-    else if (item.kind === 'preset_delays'){
-      var cur = item.value || {};
-      var def = item.default || {};
-      var holder = document.createElement('div');
-      holder.style.width = '100%';
-
-      var keys = [];
-      for (var k in cur) if (cur.hasOwnProperty(k)) keys.push(k);
-      keys.sort(function(a,b){ return parseInt(a,10) - parseInt(b,10); });
-
-      keys.forEach(function(k){
-        var row = document.createElement('div');
-        row.className = 'row';
-        row.style.justifyContent = 'space-between';
-        row.style.marginTop = '8px';
-
-        var label = document.createElement('div');
-        label.className = 'pill';
-        var lbl = '';
-        try {
-          var pl = (state.snapshot && state.snapshot.meta && state.snapshot.meta.preset_labels) ? state.snapshot.meta.preset_labels : {};
-          lbl = (pl && pl[k]) ? pl[k] : '';
-        } catch(e) { lbl = ''; }
-        label.textContent = 'Preset ' + k + (lbl ? (' — ' + lbl) : '');
-        row.appendChild(label);
-
-        var stepper = document.createElement('div');
-        stepper.className = 'stepper';
-
-        var down = document.createElement('button');
-        down.className = 'stepBtn';
-        down.textContent = '▼';
-        down.disabled = disabled;
-
-        var val = document.createElement('div');
-        val.className = 'stepVal';
-        val.textContent = '' + (cur[k] != null ? cur[k] : 0);
-
-        var up = document.createElement('button');
-        up.className = 'stepBtn';
-        up.textContent = '▲';
-        up.disabled = disabled;
-
-        function setK(newV){
-          newV = Math.max(0, Math.min(600, parseInt(newV,10) || 0));
-          cur[k] = newV;
-          val.textContent = '' + newV;
-          state.edited[item.key] = cur;
-          state.dirty = true;
-        }
-
-        down.addEventListener('click', function(){ setK((cur[k]||0) - 1); });
-        up.addEventListener('click', function(){ setK((cur[k]||0) + 1); });
-
-        stepper.appendChild(down);
-        stepper.appendChild(val);
-        stepper.appendChild(up);
+    return tmpl.cloneNode(true);
+  }
 
-        // reset button per preset
-        var reset = document.createElement('button');
-        reset.className = 'tinyBtn';
-        reset.textContent = '↺';
-        reset.disabled = disabled;
-        reset.addEventListener('click', function(){
-          setK(def[k] != null ? def[k] : 0);
-        });
+  function buildEnum(item, ctrl, ent){
+    var sel = document.createElement('select');
+    sel.dataset.act = 'enum';
+    sel.dataset.key = item.key;
+    sel.appendChild(optionsFrag(item.options));  // selection is set by updateEnum()
+    ctrl.appendChild(sel);
+    ent.sel = sel;
+    ent.ctrls.push(sel);
+  }
 
-        row.appendChild(stepper);
-        row.appendChild(reset);
+  function buildPresetDelays(item, ctrl, ent){
+    ent.vals = {};
+    ent.labels = {};
+    var holder = document.createElement('div');
+    holder.style.width = '100%';
 
-        holder.appendChild(row);
-      });
+    item.order.forEach(function(n){
+      var k = '' + n;
+      var row = document.createElement('div');
+      row.className = 'row';
+      row.style.justifyContent = 'space-between';
+      row.style.marginTop = '8px';
 
-      ctrl.appendChild(holder);
-    }
-    // numeric stepper
-    else if (item.kind === 'int' || item.kind === 'float'){
-      var step = (item.step != null) ? item.step : (item.kind === 'float' ? 0.5 : 1);
-      var minv = (item.min != null) ? item.min : -1e9;
-      var maxv = (item.max != null) ? item.max :  1e9;
+      var label = document.createElement('div');
+      label.className = 'pill';
+      row.appendChild(label);
+      ent.labels[k] = label;
 
       var stepper = document.createElement('div');
       stepper.className = 'stepper';
 
-      var down = document.createElement('button');
-      down.className = 'stepBtn';
-      down.textContent = '▼';
-      down.disabled = disabled;
+      var down = makeBtn('stepBtn', '▼', false, 'stepDown', item.key);
+      down.dataset.preset = k;
 
       var val = document.createElement('div');
       val.className = 'stepVal';
-      val.textContent = '' + item.value;
-
-      var up = document.createElement('button');
-      up.className = 'stepBtn';
-      up.textContent = '▲';
-      up.disabled = disabled;
-
-      function setV(newV){
-        if (item.kind === 'int') newV = parseInt(newV,10);
-        else newV = parseFloat(newV);
-        if (isNaN(newV)) newV = item.value;
-        newV = Math.max(minv, Math.min(maxv, newV));
-        if (item.kind === 'float') newV = roundToStep(newV, step);
-        val.textContent = '' + newV;
-        try {
-          var tname = (item.kind === 'int') ? 'int' : 'float';
-          var shown = (item.kind === 'float' && Math.abs(newV - Math.round(newV)) < 1e-9) ? (newV.toFixed(1)) : ('' + newV);
-          line.textContent = item.key + ': ' + tname + ' = ' + shown;
-        } catch(e) {}
-        state.edited[item.key] = newV;
-        state.dirty = true;
-      }
-      down.addEventListener('click', function(){ setV((state.edited[item.key]!=null?state.edited[item.key]:item.value) - step); });
-      up.addEventListener('click', function(){ setV((state.edited[item.key]!=null?state.edited[item.key]:item.value) + step); });
+      ent.vals[k] = val;
+
+      var up = makeBtn('stepBtn', '▲', false, 'stepUp', item.key);
+      up.dataset.preset = k;
 
       stepper.appendChild(down);
       stepper.appendChild(val);
       stepper.appendChild(up);
-      ctrl.appendChild(stepper);
+
+      // reset button per preset
+      var reset = makeBtn('tinyBtn', '↺', false, 'presetReset', item.key);
+      reset.dataset.preset = k;
+
+      row.appendChild(stepper);
+      row.appendChild(reset);
+      ent.ctrls.push(down, up, reset);
+
+      holder.appendChild(row);
+    });
+
+    ctrl.appendChild(holder);
+  }
+
+  function buildNumeric(item, ctrl, ent){
+    var stepper = document.createElement('div');
+    stepper.className = 'stepper';
+
+    var down = makeBtn('stepBtn', '▼', false, 'stepDown', item.key);
+    var val = document.createElement('div');
+    val.className = 'stepVal';
+    var up = makeBtn('stepBtn', '▲', false, 'stepUp', item.key);
+    ent.val = val;
+    ent.ctrls.push(down, up);
+
+    stepper.appendChild(down);
+    stepper.appendChild(val);
+    stepper.appendChild(up);
+    ctrl.appendChild(stepper);
+  }
+
+  function buildStr(item, ctrl, ent){
+    var inp = document.createElement('input');
+    inp.type = 'text';
+    inp.dataset.act = 'str';
+    inp.dataset.key = item.key;
+    ctrl.appendChild(inp);
+    ent.inp = inp;
+    ent.ctrls.push(inp);
+  }
+
+  function updateBool(item, ent){
+    ent.inp.checked = !!item.value;
+    setText(ent.txt, fmtBool(ent.inp.checked));
+  }
+
+  function updateEnum(item, ent){
+    var opts = ent.sel.options;
+    for (var j = 0; j < opts.length; j++) opts[j].selected = (opts[j].value === item.value);
+  }
+
+  function updatePresetDelays(item, ent){
+    // Editable copy: setK() mutates it, and the snapshot itself is frozen.
+    var cur = {};
+    for (var ck in item.value) cur[ck] = item.value[ck];
+    ent.cur = cur;
+    ent.def = item.default;
+    var pl = state.snapshot.meta.preset_labels;
+    for (var k in ent.vals) {
+      var lbl = pl[k] || '';
+      setText(ent.labels[k], 'Preset ' + k + (lbl ? (' — ' + lbl) : ''));
+      setText(ent.vals[k], '' + (cur[k] != null ? cur[k] : 0));
     }
-    // text input
-    else if (item.kind === 'str'){
-      var inp = document.createElement('input');
-      inp.type = 'text';
-      inp.value = item.value || '';
-      inp.disabled = disabled;
-      inp.addEventListener('input', function(){
-        try { line.textContent = item.key + ': str = ' + JSON.stringify(inp.value); } catch(e) {}
-        state.edited[item.key] = inp.value;
-        state.dirty = true;
-      });
-      ctrl.appendChild(inp);
+  }
+
+  function updateNumeric(item, ent){
+    ent.step = item.step;
+    ent.minv = item.min;
+    ent.maxv = item.max;
+    setText(ent.val, '' + item.value);
+  }
+
+  function updateStr(item, ent){
+    if (ent.inp.value !== item.value) ent.inp.value = item.value;
+  }
+
+  var BUILDERS = { bool: buildBool, 'enum': buildEnum, preset_delays: buildPresetDelays, 'int': buildNumeric, 'float': buildNumeric, str: buildStr };
+  var UPDATERS = { bool: updateBool, 'enum': updateEnum, preset_delays: updatePresetDelays, 'int': updateNumeric, 'float': updateNumeric, str: updateStr };
+
+  function makeItemEl(item, locked){
+    var div = document.createElement('div');
+    div.className = 'item';
+    var line = document.createElement('div');
+    line.className = 'line';
+    div.appendChild(line);
+
+    // Every entry gets the same fields (null where a kind doesn't use them).
+    var ent = {
+      item: item, div: div, line: line, note: null, ctrls: [],
+      inp: null, txt: null, sel: null, val: null, vals: null, labels: null,
+      cur: null, def: null, step: 0, minv: 0, maxv: 0
+    };
+    itemsByKey[item.key] = ent;
+
+    if (item.note) {
+      var n = document.createElement('div');
+      n.className = 'note';
+      div.appendChild(n);
+      ent.note = n;
+    }
+
+    if (item.readonly) {
+      updateItemEl(ent, item, locked);
+      return div;
     }
 
+    var ctrl = document.createElement('div');
+    ctrl.className = 'ctrl';
+
+    var build = BUILDERS[item.kind];
+    if (build) build(item, ctrl, ent);
+
     // per-setting reset
-    var resetBtn = document.createElement('button');
-    resetBtn.className = 'tinyBtn';
-    resetBtn.textContent = '↺';
-    resetBtn.disabled = disabled;
+    var resetBtn = makeBtn('tinyBtn', '↺', false, 'reset', item.key);
     resetBtn.title = 'Reset to default';
-    resetBtn.addEventListener('click', function(){
+    ctrl.appendChild(resetBtn);
+    ent.ctrls.push(resetBtn);
+
+    div.appendChild(ctrl);
+    updateItemEl(ent, item, locked);
+    return div;
+  }
+
+  // Write an item's values into its existing nodes (initial build and every re-render).
+  function updateItemEl(ent, item, locked){
+    ent.item = item;
+    ent.div.classList.toggle('changed', !!item.changed);
+    ent.div.classList.toggle('readonly', !!item.readonly);
+    setText(ent.line, item.display);
+    if (ent.note) setText(ent.note, item.note);
+    if (item.readonly) return;
+
+    var disabled = !!locked;
+    for (var i = 0; i < ent.ctrls.length; i++) ent.ctrls[i].disabled = disabled;
+
+    var update = UPDATERS[item.kind];
+    if (update) update(item, ent);
+  }
+
+  // Everything that decides which nodes exist; values are excluded (updateItemEl handles those).
+  function layoutSig(snapshot){
+    var parts = [];
+    snapshot.sections.forEach(function(sec){
+      parts.push('#' + sec.title);
+      sec.items.forEach(function(item){
+        var extra = (item.kind === 'preset_delays') ? item.order.join(',')
+                  : (item.kind === 'enum') ? item.options.join('\x1f') : '';
+        parts.push(item.key + '|' + item.kind + '|' + (item.readonly ? 1 : 0) + '|' + (item.note ? 1 : 0) + '|' + extra);
+      });
+    });
+    return parts.join('\n');
+  }
+
+  // Delegated handlers (registered once on root)
+  function onRootClick(e){
+    var t = e.target;
+    var act = t.dataset ? t.dataset.act : null;
+    if (!act) return;
+    var ent = itemsByKey[t.dataset.key];
+    if (!ent) return;
+    var item = ent.item;
+    var k = t.dataset.preset;
+
+    if (act === 'reset') {
+      delete pendingWrites[item.key];
       state.edited[item.key] = item.default;
+      state.editedJson = null;
       state.dirty = true;
       // simplest: reload after apply; we don't live-update line text here
       setStatus('Reset staged: ' + item.key);
-    });
-    ctrl.appendChild(resetBtn);
+    } else if (act === 'presetReset') {
+      setK(ent, k, ent.def[k] != null ? ent.def[k] : 0);
+    } else if (act === 'stepUp' || act === 'stepDown') {
+      var dir = (act === 'stepUp') ? 1 : -1;
+      if (k != null) {
+        setK(ent, k, (ent.cur[k]||0) + dir);
+      } else {
+        setV(ent, curValue(item) + dir * ent.step);
+      }
+    }
+  }
 
-    div.appendChild(ctrl);
-    return div;
+  function onRootChange(e){
+    var t = e.target;
+    var act = t.dataset ? t.dataset.act : null;
+    var ent = act ? itemsByKey[t.dataset.key] : null;
+    if (!ent) return;
+    var item = ent.item;
+
+    if (act === 'bool') {
+      setText(ent.txt, fmtBool(t.checked));
+      stage(item.key, !!t.checked);
+    } else if (act === 'enum') {
+      stage(item.key, t.value);
+    }
+  }
+
+  function onRootInput(e){
+    var t = e.target;
+    if (!t.dataset || t.dataset.act !== 'str') return;
+    var ent = itemsByKey[t.dataset.key];
+    if (ent) stage(ent.item.key, t.value);
   }
 
   function render(snapshot){
     state.snapshot = snapshot;
     state.edited = {};
+    state.editedJson = null;
     state.dirty = false;
+    pendingWrites = Object.create(null);
 
     if (!root) return;
-    root.innerHTML = '';
 
+    // 1) Read: every flag/string this render needs, before touching the DOM.
     var meta = snapshot && snapshot.meta ? snapshot.meta : {};
     var locked = !!meta.locked;
+    var streaming = !!meta.streaming;
+    var unlockRem = meta.unlock_remaining_s || 0;
+    var sections = snapshot.sections;
 
-    var status = [];
-    status.push(meta.streaming ? 'LIVE: yes' : 'LIVE: no');
-    status.push(locked ? 'EDIT: locked' : 'EDIT: unlocked');
-    if (meta.unlock_remaining_s && meta.unlock_remaining_s > 0) {
-      status.push('unlock remaining: ' + Math.ceil(meta.unlock_remaining_s) + 's');
+    var statusText = (streaming ? 'LIVE: yes' : 'LIVE: no') + '   |   ' + (locked ? 'EDIT: locked' : 'EDIT: unlocked');
+    if (unlockRem > 0) {
+      statusText += '   |   unlock remaining: ' + Math.ceil(unlockRem) + 's';
     }
-    setStatus(status.join('   |   '));
 
-    // enable/disable buttons
-    if (btnUnlock) btnUnlock.style.display = (meta.streaming ? 'inline-block' : 'none');
-    if (btnUnlock) btnUnlock.disabled = (!meta.streaming);
-    if (btnApply) btnApply.disabled = locked;
-    if (btnRestore) btnRestore.disabled = (locked || !!meta.streaming);
-    if (btnRestoreTimer) btnRestoreTimer.disabled = (locked || !!meta.streaming);
-
-    // sections
-    (snapshot.sections || []).forEach(function(sec){
-      var card = document.createElement('div');
-      card.className = 'card';
-
-      var st = document.createElement('div');
-      st.className = 'secTitle';
-      st.textContent = sec.title || '';
-      card.appendChild(st);
-
-      (sec.items || []).forEach(function(item){
-        // On timer page: only show timer scope
-        card.appendChild(makeItemEl(item, locked || !!item.locked));
+    var sig = layoutSig(snapshot);
+    var rebuild = (sig !== state.layoutSig);
+
+    // 2) Build: on a layout change, the new tree is assembled detached.
+    var frag = null;
+    if (rebuild) {
+      state.layoutSig = sig;
+      itemsByKey = Object.create(null);
+      frag = document.createDocumentFragment();
+      sections.forEach(function(sec){
+        var card = document.createElement('div');
+        card.className = 'card';
+
+        var st = document.createElement('div');
+        st.className = 'secTitle';
+        st.textContent = sec.title;
+        card.appendChild(st);
+
+        var itemsFrag = document.createDocumentFragment();
+        sec.items.forEach(function(item){
+          // On timer page: only show timer scope
+          itemsFrag.appendChild(makeItemEl(item, locked || !!item.locked));
+        });
+        card.appendChild(itemsFrag);
+
+        frag.appendChild(card);
       });
+    }
+
+    // 3) Write: status line + toolbar buttons in one pass.
+    setStatus(statusText);
+    if (btnUnlock) {
+      btnUnlock.style.display = (streaming ? 'inline-block' : 'none');
+      btnUnlock.disabled = !streaming;
+    }
+    if (btnApply) btnApply.disabled = locked;
+    if (btnRestore) btnRestore.disabled = (locked || streaming);
+    if (btnRestoreTimer) btnRestoreTimer.disabled = (locked || streaming);
 
-      root.appendChild(card);
+    // 4) Attach the new tree, or update the existing nodes in place (same sections/keys/kinds).
+    if (rebuild) {
+      root.innerHTML = '';
+      root.appendChild(frag);
+      return;
+    }
+    sections.forEach(function(sec){
+      sec.items.forEach(function(item){
+        var ent = itemsByKey[item.key];
+        if (ent) updateItemEl(ent, item, locked || !!item.locked);
+      });
     });
   }
 
+  // Snapshots are read-only once rendered; freezing makes any accidental write throw (strict mode).
+  function deepFreeze(o){
+    if (o && typeof o === 'object' && !Object.isFrozen(o)) {
+      Object.freeze(o);
+      for (var k in o) deepFreeze(o[k]);
+    }
+    return o;
+  }
+
   function load(){
     var scope = isTimerPage() ? 'timer' : 'general';
     api('/api/config?scope='+encodeURIComponent(scope), { method:'GET' })
-      .then(function(j){ render(j); })
+      .then(function(j){ render(deepFreeze(j)); })
       .catch(function(e){ setStatus('Error: ' + (e && e.message ? e.message : e)); });
   }
 
@@ -3234,10 +4058,11 @@ class App:
   }
 
   function doApply(){
+    flushPending();  // a tap in the same frame as the last edit still sends it
     if (!state.dirty) { setStatus('No pending changes.'); return; }
     tapConfirm('apply', btnApply, 'Apply', 'Tap again to Apply', function(){
-      var payload = { changes: state.edited };
-      api('/api/config/apply', { method:'POST', body: JSON.stringify(payload) })
+      if (state.editedJson === null) state.editedJson = JSON.stringify({ changes: state.edited });
+      api('/api/config/apply', { method:'POST', body: state.editedJson })
         .then(function(r){
           setStatus(r && r.message ? r.message : 'Applied.');
           load();
@@ -3262,20 +4087,36 @@ class App:
     });
   }
 
+  function readFileText(file){
+    if (file.text) return file.text();
+    // Older browsers: FileReader behind the same Promise interface
+    return new Promise(function(resolve, reject){
+      var reader = new FileReader();
+      reader.onload = function(){ resolve(reader.result || ''); };
+      reader.onerror = function(){ reject(reader.error || new Error('read failed')); };
+      reader.readAsText(file);
+    });
+  }
+
+  function importText(txt){
+    try { JSON.parse(txt); } catch(e){ setStatus('Import: invalid JSON'); return; }
+    // Validated above; the file's own text is the request body (no parse -> re-stringify round trip)
+    return api('/api/config/import', { method:'POST', body: txt })
+      .then(function(r){ setStatus(r && r.message ? r.message : 'Imported.'); load(); });
+  }
+
   function doImport(file){
     if (!file) return;
-    var reader = new FileReader();
-    reader.onload = function(){
-      var txt = reader.result || '';
-      var j = null;
-      try { j = JSON.parse(txt); } catch(e){ setStatus('Import: invalid JSON'); return; }
-      api('/api/config/import', { method:'POST', body: JSON.stringify(j) })
-        .then(function(r){ setStatus(r && r.message ? r.message : 'Imported.'); load(); })
-        .catch(function(e){ setStatus('Import failed: ' + e.message); });
-    };
-    reader.readAsText(file);
+    readFileText(file)
+      .then(importText)
+      .catch(function(e){ setStatus('Import failed: ' + (e && e.message ? e.message : e)); });
   }
 
+  if (root) {
+    root.addEventListener('click', onRootClick);
+    root.addEventListener('change', onRootChange);
+    root.addEventListener('input', onRootInput);
+  }
   if (btnUnlock) btnUnlock.addEventListener('click', doUnlock);
   if (btnApply) btnApply.addEventListener('click', doApply);
   if (btnRestore) btnRestore.addEventListener('click', doRestoreGlobal);
@@ -3303,7 +4144,7 @@ class App:
             return False
 
     def _cfg_unlock_active(self) -> bool:
-        return time.time() < getattr(self, "_cfg_unlock_until", 0.0)
+        return time.monotonic() < getattr(self, "_cfg_unlock_until", 0.0)
 
     def _cfg_edit_locked(self) -> bool:
         # Locked only while LIVE unless unlocked
@@ -3320,7 +4161,7 @@ class App:
             minutes = 0.5
         if minutes > 10.0:
             minutes = 10.0
-        self._cfg_unlock_until = time.time() + (minutes * 60.0)
+        self._cfg_unlock_until = time.monotonic() + (minutes * 60.0)
 
     def _cfg_make_item(self, key: str):
         # Build a UI item dict for a given config key
@@ -3336,6 +4177,8 @@ class App:
             cur_s = {str(int(k)): int(v) for k, v in cur.items()}
             dflt_s = {str(int(k)): int(v) for k, v in dflt.items()}
             changed = (cur_s != dflt_s)
+            order = sorted(int(k) for k in cur_s)  # row order, so the page never parses/sorts the keys
+            # Same keys, same order as the generic item below (one object shape for the page JS).
             return {
                 "key": key,
                 "kind": "preset_delays",
@@ -3344,10 +4187,12 @@ class App:
                 "display": _cfg_make_display_line(key, cur),
                 "changed": changed,
                 "readonly": readonly,
+                "options": [],
+                "step": 1,
                 "min": 0,
                 "max": 600,
-                "step": 1,
                 "locked": False,
+                "order": order,
             }
 
         kind = "str"
@@ -3372,6 +4217,8 @@ class App:
                 minv, maxv, step = 1, 65535, 1
             elif "RETENTION" in key:
                 minv, maxv, step = 1, 365, 1
+            elif "MAX_ATTEMPTS" in key:
+                minv, maxv, step = 1, 50, 1
             elif "GRACE" in key and "MINUTES" in key:
                 minv, maxv, step = 0, 240, 1
             elif "SECONDS" in key:
@@ -3386,6 +4233,15 @@ class App:
         else:
             kind = "str"
 
+        # Items go out complete, so the page JS needs no per-field fallbacks.
+        if kind in ("int", "float"):
+            if step is None:
+                step = 1
+            if minv is None:
+                minv = -1_000_000_000
+            if maxv is None:
+                maxv = 1_000_000_000
+
         changed = (cur != dflt)
 
         # If LIVE and locked: mark as locked unless it's in the live-editable list and unlock is active
@@ -3399,24 +4255,41 @@ class App:
         return {
             "key": key,
             "kind": kind,
-            "value": cur,
+            "value": "" if (kind == "str" and cur is None) else cur,
             "default": dflt,
             "display": _cfg_make_display_line(key, cur),
             "changed": changed,
             "readonly": readonly,
-            "options": options,
+            "options": options or [],
             "step": step,
             "min": minv,
             "max": maxv,
             "locked": locked_now,
+            "order": [],
         }
 
-    def _cfg_snapshot(self, scope: str = "general") -> dict:
+    def _cfg_snapshot_json(self, scope: str = "general") -> str:
+        """GET /api/config body. Sections/labels JSON is memoized per (scope, LIVE, unlocked) until cfg persist."""
         scope = (scope or "general").lower().strip()
-        streaming = self._cfg_is_streaming()
-        locked = self._cfg_edit_locked()
-        unlock_remaining = max(0.0, getattr(self, "_cfg_unlock_until", 0.0) - time.time())
-
+        streaming = bool(self._cfg_is_streaming())
+        unlocked = self._cfg_unlock_active()
+        key = (scope, streaming, unlocked)
+        ent = self._cfg_json_cache.get(key)
+        if ent is None:
+            labels = {str(int(k)): str(v) for k, v in (getattr(self.cfg, "PRESET_LABELS", {}) or {}).items()}
+            ent = (_json_str(labels), _json_str(self._cfg_sections(scope)))
+            self._cfg_json_cache[key] = ent
+        # Only the meta flags/countdown are per request.
+        unlock_remaining = max(0.0, getattr(self, "_cfg_unlock_until", 0.0) - time.monotonic())
+        meta = '{"streaming": %s, "locked": %s, "unlock_remaining_s": %s, "preset_labels": %s}' % (
+            "true" if streaming else "false",
+            "true" if (streaming and not unlocked) else "false",
+            json.dumps(float(unlock_remaining)),
+            ent[0],
+        )
+        return '{"meta": ' + meta + ', "sections": ' + ent[1] + "}"
+
+    def _cfg_sections(self, scope: str) -> list:
         sections = []
         if scope == "timer":
             items = [self._cfg_make_item(k) for k in CFG_UI_TIMER_FIELDS]
@@ -3429,16 +4302,7 @@ class App:
                         continue
                     items.append(self._cfg_make_item(k))
                 sections.append({"title": title, "items": items})
-
-        return {
-            "meta": {
-                "streaming": bool(streaming),
-                "locked": bool(locked),
-                "unlock_remaining_s": float(unlock_remaining),
-                "preset_labels": {str(int(k)): str(v) for k, v in (getattr(self.cfg, "PRESET_LABELS", {}) or {}).items()},
-            },
-            "sections": sections,
-        }
+        return sections
 
     def _cfg_set_field(self, key: str, value):
         # Enforce read-only
@@ -3448,6 +4312,8 @@ class App:
         if not hasattr(self.cfg, key):
             raise ValueError(f"Unknown config key: {key}")
 
+        # A multi-key apply can fail after this key lands (no persist then), so drop cached snapshots now
+        self._cfg_json_cache.clear()
         cur = getattr(self.cfg, key)
         if key in CFG_UI_ENUM_OPTIONS:
             if not isinstance(value, str) or value not in CFG_UI_ENUM_OPTIONS[key]:
@@ -3485,6 +4351,8 @@ class App:
                 iv = max(0, min(3600, iv))
             elif "RETENTION" in key:
                 iv = max(1, min(365, iv))
+            elif "MAX_ATTEMPTS" in key:
+                iv = max(1, min(50, iv))
             setattr(self.cfg, key, iv)
         elif isinstance(cur, float):
             fv = float(value)
@@ -3540,6 +4408,12 @@ class App:
         _cfg_append_changelog({"source": source, "remote_ip": remote_ip, "event": "persist", "overrides_keys": sorted(list(overrides.keys()))})
         # keep in memory too (for export)
         self._cfg_overrides_cache = overrides
+        self.midi.refresh_filters()
+        self._bind_cfg_cache()
+        self._html_cache.clear()
+        self._cfg_json_cache.clear()
+        self._payload_json_cache = (-1, None, b"")
+        self._timer_next_at = 0.0  # re-evaluate the timer on the next tick with the new settings
         return ok
 
     def _cfg_apply_changes(self, changes: dict, source: str = "WEB", remote_ip: str = "") -> str:
@@ -3639,17 +4513,12 @@ class App:
   // Stream Agent HUD JS v2.1 (schema + newline fix)
   try { console.log('Stream Agent HUD JS v2.1 loaded'); } catch (e) {}
 
-  // Touch UX: prevent long-press context menus on buttons (makes "normal click" tolerant of slower presses)
-  try {
-    document.addEventListener('contextmenu', function(e){
-      var t = e && e.target;
-      if (!t) return;
-      var cls = t.classList;
-      if (cls && (cls.contains('pbtn') || cls.contains('btn'))) {
-        e.preventDefault();
-      }
-    }, { passive: false });
-  } catch (e) {}
+  // Touch UX: prevent long-press context menus on buttons (makes "normal click" tolerant of slower presses).
+  // Buttons opt in with data-no-ctx="1" (HUD markup + preset buttons); one attribute read per event.
+  document.addEventListener('contextmenu', function(e){
+    var t = e.target;
+    if (t && t.dataset && t.dataset.noCtx) e.preventDefault();
+  }, false);
 
   function $(id){ return document.getElementById(id); }
   var statusTitle = $('statusTitle');
@@ -3667,8 +4536,17 @@ class App:
   var healthLast = $('healthLast');
 
 
-  function setConn(t){ if (connLine) connLine.textContent = t; }
-  function setTitle(t){ if (statusTitle) statusTitle.textContent = t; }
+  // Skip identical writes (most pushes change one field); _last caches what we wrote, so these
+  // nodes must only be written through setText().
+  function setText(el, t){
+    if (el && el._last !== t) {
+      el.textContent = t;
+      el._last = t;
+    }
+  }
+
+  function setConn(t){ setText(connLine, t); }
+  function setTitle(t){ setText(statusTitle, t); }
 
 
   function setBannerStyle(styleName){
@@ -3685,23 +4563,20 @@ class App:
     statusBanner.className = cls;
   }
 
-  function setVer(t){ if (appVer) appVer.textContent = t || ''; }
+  function setVer(t){ setText(appVer, t || ''); }
 
   function setHealth(h){
     if (!healthBox) return;
-    var lvl = (h && h.level) ? (''+h.level).toLowerCase() : 'ready';
-    // Normalize common values
-    if (lvl === 'streaming') lvl = 'live';
-    var cls = 'healthBox h-' + lvl;
-    healthBox.className = cls;
-    if (healthTitle) healthTitle.textContent = (h && h.title) ? h.title : (lvl ? lvl.toUpperCase() : 'READY');
-    if (healthDetail) healthDetail.textContent = (h && h.detail) ? h.detail : '';
+    var cls = 'healthBox ' + ((h && h.css) ? h.css : 'h-ready');
+    if (healthBox.className !== cls) healthBox.className = cls;
+    setText(healthTitle, (h && h.title) ? h.title : ((h && h.level) ? h.level : 'READY'));
+    setText(healthDetail, (h && h.detail) ? h.detail : '');
     var last = '';
     if (h && h.last_msg) {
       if (h.last_ts) last = 'Last: ' + h.last_ts + ' — ' + h.last_msg;
       else last = 'Last: ' + h.last_msg;
     }
-    if (healthLast) healthLast.textContent = last;
+    setText(healthLast, last);
   }
 
 
@@ -3750,6 +4625,7 @@ var wsReady = false;
 
       var b = document.createElement('button');
       b.className = 'pbtn';
+      b.setAttribute('data-no-ctx', '1');
       b.textContent = label;
       b.disabled = !wsReady;
       (function(n){
@@ -3765,22 +4641,11 @@ var wsReady = false;
   var _presetSig = '';
   var _presetsBuilt = false;
 
-  function _presetSignature(pl){
-    if (!pl) return '';
-    var keys = [];
-    for (var k in pl) { if (pl.hasOwnProperty(k)) keys.push(k); }
-    keys.sort(function(a,b){ return parseInt(a,10) - parseInt(b,10); });
-    var parts = [];
-    for (var i=0; i<keys.length; i++){
-      var kk = keys[i];
-      parts.push(kk + '=' + String(pl[kk]));
-    }
-    return parts.join('|');
-  }
-
 
   function applyState(msg){
-    // msg schema: {type:'state', ver, state:{...}, logs:[...], preset_labels:{...}}
+    // msg schema: {type:'state', ver, state:{...}, logs:[...], preset_labels:{...}, preset_labels_sig}
+    // (logs / logs_append are rendered by ws.onmessage, not here)
+    // ('patch' messages are merged into the last state by ws.onmessage before this runs)
     var st = (msg && msg.state) ? msg.state : null;
 
     setVer((st && st.app_version) ? st.app_version : '');
@@ -3802,26 +4667,21 @@ var wsReady = false;
       else btnRec.classList.remove('on');
     }
 
-    if (msg && msg.logs && logBox) {
-      logBox.textContent = msg.logs.join("\n");
-      try { logBox.scrollTop = logBox.scrollHeight; } catch (e) {}
-    }
 
-        // Preset labels are sent as part of state. Build the buttons once, and only rebuild
-    // if labels change (prevents missed clicks).
-    var pl = null;
-    if (msg && msg.preset_labels) {
-      pl = {};
-      for (var k in msg.preset_labels) {
-        if (msg.preset_labels.hasOwnProperty(k)) {
-          var nk = parseInt(k, 10);
-          if (!isNaN(nk)) pl[nk] = msg.preset_labels[k];
+    // Preset labels are sent as part of state. Build the buttons once, and only rebuild
+    // if labels change (prevents missed clicks). The server sends a hash of the labels.
+    var sig = (msg && msg.preset_labels_sig) || '';
+    if (!_presetsBuilt || sig !== _presetSig) {
+      var pl = null;
+      var raw = msg && msg.preset_labels;
+      if (raw) {
+        pl = {};
+        var keys = Object.keys(raw);
+        for (var i=0; i<keys.length; i++) {
+          var nk = +keys[i];
+          if (nk === nk) pl[nk] = raw[keys[i]];  // skip NaN
         }
       }
-    }
-
-    var sig = _presetSignature(pl || {});
-    if (!_presetsBuilt || sig !== _presetSig) {
       _presetSig = sig;
       _presetsBuilt = true;
       buildPresets(pl);
@@ -3829,7 +4689,43 @@ var wsReady = false;
 
   }
 
+  var lastMsg = null;  // last full 'state' message, with patches merged in
+
+  // Log tail: one text node per line, so new lines are appended instead of re-rendering the box.
+  function renderLogs(lines){
+    if (!logBox) return;
+    var frag = document.createDocumentFragment();
+    for (var i=0; i<lines.length; i++) frag.appendChild(document.createTextNode(i ? '\n' + lines[i] : lines[i]));
+    logBox.textContent = '';
+    logBox.appendChild(frag);
+    try { logBox.scrollTop = logBox.scrollHeight; } catch (e) {}
+  }
+
+  function appendLogs(lines, max){
+    if (!logBox) return;
+    for (var i=0; i<lines.length; i++) {
+      logBox.appendChild(document.createTextNode(logBox.firstChild ? '\n' + lines[i] : lines[i]));
+    }
+    while (logBox.childNodes.length > max) {
+      logBox.removeChild(logBox.firstChild);
+      var f = logBox.firstChild;
+      if (f && f.nodeValue.charAt(0) === '\n') f.nodeValue = f.nodeValue.slice(1);
+    }
+    try { logBox.scrollTop = logBox.scrollHeight; } catch (e) {}
+  }
+
+  // State arrives as UTF-8 JSON in binary frames (encoded once server-side for all clients).
+  var _td = (typeof TextDecoder !== 'undefined') ? new TextDecoder('utf-8') : null;
+  function frameText(data){
+    if (typeof data === 'string') return data;
+    if (_td) return _td.decode(data);
+    var bytes = new Uint8Array(data), s = '';
+    for (var i=0; i<bytes.length; i++) s += String.fromCharCode(bytes[i]);
+    return decodeURIComponent(escape(s));
+  }
+
   function connect(){
+    lastMsg = null;
     var url = wsUrl();
     setConn('Connecting WS: ' + url);
 
@@ -3838,6 +4734,7 @@ var wsReady = false;
 
     try { ws = new WebSocket(url); }
     catch (e) { setConn('WebSocket ctor failed: ' + e); return; }
+    ws.binaryType = 'arraybuffer';
 
     ws.onopen = function(){
       wsReady = true;
@@ -3848,8 +4745,31 @@ var wsReady = false;
 
     ws.onmessage = function(ev){
       try {
-        var msg = JSON.parse(ev.data);
-        if (msg && msg.type === 'state') applyState(msg);
+        var msg = JSON.parse(frameText(ev.data));
+        if (msg && msg.type === 'state') {
+          lastMsg = msg;
+          applyState(msg);
+          if (msg.logs) renderLogs(msg.logs);
+        } else if (msg && msg.type === 'patch') {
+          // Only changed fields; merge into the last full state.
+          if (!lastMsg || msg.base !== lastMsg.ver) {
+            // Missed an update: reconnect for a fresh snapshot.
+            try { ws.close(); } catch (e2) {}
+            return;
+          }
+          var ch = msg.state || {};
+          for (var k in ch) {
+            if (ch.hasOwnProperty(k)) lastMsg.state[k] = ch[k];
+          }
+          if (msg.preset_labels) {
+            lastMsg.preset_labels = msg.preset_labels;
+            lastMsg.preset_labels_sig = msg.preset_labels_sig;
+          }
+          lastMsg.ver = msg.ver;
+          applyState(lastMsg);
+          if (msg.logs) renderLogs(msg.logs);
+          else if (msg.logs_append) appendLogs(msg.logs_append, msg.logs_max);
+        }
       } catch (e) {
         setConn('Bad message: ' + e);
       }
@@ -3930,35 +4850,50 @@ var wsReady = false;
             self._post("WEB: aiohttp not installed (pip install aiohttp) — web HUD disabled")
             return
 
+        def text_response(request, name: str, text: str, content_type: str, immutable: bool = False):
+            # Pages/JS are memoized strings: encode + gzip once per distinct text, not per request.
+            ent = self._static_body_cache.get(name)
+            if ent is None or ent[0] is not text:
+                raw = text.encode("utf-8")
+                crc = zlib.crc32(raw)
+                # Strong validators must differ per content-coding, so the gzip body gets its own tag.
+                ent = (text, (raw, '"%08x"' % crc), (gzip.compress(raw, compresslevel=6), '"%08x-gz"' % crc))
+                self._static_body_cache[name] = ent
+            use_gzip = "gzip" in request.headers.get("Accept-Encoding", "")
+            body, etag = ent[2] if use_gzip else ent[1]
+            headers = {"Vary": "Accept-Encoding", "ETag": etag}
+            if immutable:
+                # Only for assets behind a versioned URL (bump ?v= when they change).
+                headers["Cache-Control"] = "public, max-age=31536000, immutable"
+            else:
+                # Pages embed cfg values: browsers revalidate every time, but mostly get a bodiless 304.
+                headers["Cache-Control"] = "no-cache"
+            inm = request.headers.get("If-None-Match", "")
+            if inm and etag in (t.strip() for t in inm.split(",")):
+                return web.Response(status=304, headers=headers)
+            if use_gzip:
+                headers["Content-Encoding"] = "gzip"
+            return web.Response(body=body, content_type=content_type, charset="utf-8", headers=headers)
+
         async def index(request):
-            # optional token check (only if configured)
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.Response(status=403, text="Forbidden")
-            return web.Response(text=self._web_html(), content_type="text/html", charset="utf-8")
+            return text_response(request, "hud", self._web_html(), "text/html")
 
 
         async def viewer(request):
-            # optional token check (only if configured)
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.Response(status=403, text="Forbidden")
-            return web.Response(text=self._web_viewer_html(), content_type="text/html", charset="utf-8")
+            return text_response(request, "viewer", self._web_viewer_html(), "text/html")
 
         async def ws_handler(request):
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.Response(status=403, text="Forbidden")
-
             ws = web.WebSocketResponse(heartbeat=20)
             await ws.prepare(request)
 
-            self._ws_clients.add(ws)
-            # Send an immediate snapshot
-            await ws.send_str(json.dumps(self._web_payload()))
+            # Send an immediate snapshot, then join broadcasts. The next broadcast is full state
+            # so every client shares the same base for the patches that follow.
+            await ws.send_bytes(self._web_payload_json())
+            q: asyncio.Queue = asyncio.Queue(maxsize=2)
+            writer = asyncio.create_task(self._ws_writer(ws, q))
+            self._ws_writer_tasks.add(writer)
+            self._ws_add(ws, q)
+            self._ws_force_full = True
 
             try:
                 async for msg in ws:
@@ -3970,14 +4905,16 @@ var wsReady = false;
                         if data.get("type") == "cmd":
                             cmd = data.get("cmd")
                             if cmd in ("start", "stop", "rec"):
-                                await self._cmd_queue.put({"type": "action", "action": cmd, "source": "WEB"})
+                                self._enqueue_cmd({"type": "action", "action": cmd, "source": "WEB"})
                             elif cmd == "preset":
                                 val = int(data.get("value", 0))
-                                await self._cmd_queue.put({"type": "preset", "preset": val, "source": "WEB"})
+                                self._enqueue_cmd({"type": "preset", "preset": val, "source": "WEB"})
                     elif msg.type == WSMsgType.ERROR:
                         break
             finally:
-                self._ws_clients.discard(ws)
+                self._ws_discard(ws)
+                writer.cancel()
+                self._ws_writer_tasks.discard(writer)
                 try:
                     await ws.close()
                 except Exception:
@@ -3986,7 +4923,10 @@ var wsReady = false;
             return ws
 
         async def app_js(request):
-            return web.Response(text=self._web_js(), content_type="application/javascript", charset="utf-8")
+            return text_response(request, "app_js", self._web_js(), "application/javascript")
+
+        async def app_css(request):
+            return text_response(request, "app_css", _HUD_CSS, "text/css", immutable=True)
 
         async def favicon(request):
             # avoid noisy 404s
@@ -3994,21 +4934,13 @@ var wsReady = false;
 
 
         async def config_page(request):
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.Response(status=403, text="Forbidden")
-            return web.Response(text=self._web_config_html(), content_type="text/html", charset="utf-8")
+            return text_response(request, "config", self._web_config_html(), "text/html")
 
         async def config_timer_page(request):
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.Response(status=403, text="Forbidden")
-            return web.Response(text=self._web_config_timer_html(), content_type="text/html", charset="utf-8")
+            return text_response(request, "config_timer", self._web_config_timer_html(), "text/html")
 
         async def config_js(request):
-            return web.Response(text=self._web_config_js(), content_type="application/javascript", charset="utf-8")
+            return text_response(request, "config_js", self._web_config_js(), "application/javascript")
 
         def _remote_ip(request):
             try:
@@ -4024,18 +4956,18 @@ var wsReady = false;
             return ""
 
         async def api_get_config(request):
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.json_response({"error": "Forbidden"}, status=403)
             scope = request.query.get("scope", "general")
-            return web.json_response(self._cfg_snapshot(scope))
+            body = self._cfg_snapshot_json(scope).encode("utf-8")
+            # config.js fetches this on page open and after each action; no-cache makes the browser
+            # revalidate with its ETag, so reloading an unchanged snapshot costs a bodiless 304.
+            etag = '"%08x"' % zlib.crc32(body)
+            headers = {"ETag": etag, "Cache-Control": "no-cache"}
+            inm = request.headers.get("If-None-Match", "")
+            if inm and etag in (t.strip() for t in inm.split(",")):
+                return web.Response(status=304, headers=headers)
+            return web.Response(body=body, content_type="application/json", charset="utf-8", headers=headers)
 
         async def api_unlock(request):
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.json_response({"error": "Forbidden"}, status=403)
             data = {}
             try:
                 data = await request.json()
@@ -4044,13 +4976,9 @@ var wsReady = false;
             minutes = data.get("minutes", 2)
             self._cfg_unlock_for_minutes(minutes)
             _cfg_append_changelog({"source": "WEB", "remote_ip": _remote_ip(request), "event": "unlock", "minutes": minutes})
-            return web.json_response({"ok": True, "unlock_remaining_s": max(0.0, self._cfg_unlock_until - time.time())})
+            return web.json_response({"ok": True, "unlock_remaining_s": max(0.0, self._cfg_unlock_until - time.monotonic())})
 
         async def api_apply_config(request):
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.json_response({"error": "Forbidden"}, status=403)
             try:
                 data = await request.json()
             except Exception:
@@ -4064,10 +4992,6 @@ var wsReady = false;
                 return web.json_response({"error": str(e)}, status=400)
 
         async def api_restore_global(request):
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.json_response({"error": "Forbidden"}, status=403)
             try:
                 msg = self._cfg_restore_global(source="WEB", remote_ip=_remote_ip(request))
                 return web.json_response({"ok": True, "message": msg})
@@ -4075,10 +4999,6 @@ var wsReady = false;
                 return web.json_response({"error": str(e)}, status=400)
 
         async def api_restore_timer(request):
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.json_response({"error": "Forbidden"}, status=403)
             try:
                 msg = self._cfg_restore_timer_only(source="WEB", remote_ip=_remote_ip(request))
                 return web.json_response({"ok": True, "message": msg})
@@ -4086,10 +5006,6 @@ var wsReady = false;
                 return web.json_response({"error": str(e)}, status=400)
 
         async def api_export(request):
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.json_response({"error": "Forbidden"}, status=403)
             payload = self._cfg_export_payload()
             return web.Response(
                 text=json.dumps(payload, indent=2, sort_keys=True),
@@ -4099,10 +5015,6 @@ var wsReady = false;
             )
 
         async def api_import(request):
-            if self.cfg.WEB_HUD_TOKEN:
-                tok = request.query.get("token", "")
-                if tok != self.cfg.WEB_HUD_TOKEN:
-                    return web.json_response({"error": "Forbidden"}, status=403)
             try:
                 data = await request.json()
             except Exception:
@@ -4114,7 +5026,19 @@ var wsReady = false;
                 return web.json_response({"error": str(e)}, status=400)
 
 
-        app = web.Application()
+        # Static bundles (and the favicon) are served without a token; everything else needs it when set.
+        open_paths = frozenset(("/app.js", "/app.css", "/config.js", "/favicon.ico"))
+
+        @web.middleware
+        async def token_mw(request, handler):
+            token = self.cfg.WEB_HUD_TOKEN
+            if token and request.path not in open_paths and request.query.get("token", "") != token:
+                if request.path.startswith("/api/"):
+                    return web.json_response({"error": "Forbidden"}, status=403)
+                return web.Response(status=403, text="Forbidden")
+            return await handler(request)
+
+        app = web.Application(middlewares=[token_mw])
         app.add_routes([
             web.get("/", index),
             web.get("/viewer", viewer),
@@ -4122,6 +5046,7 @@ var wsReady = false;
             web.get("/config_timer", config_timer_page),
             web.get("/ws", ws_handler),
             web.get("/app.js", app_js),
+            web.get("/app.css", app_css),
             web.get("/config.js", config_js),
             web.get("/api/config", api_get_config),
             web.post("/api/config/unlock", api_unlock),
@@ -4140,17 +5065,31 @@ var wsReady = false;
 
         self._web_runner = runner
         self._web_site = site
+        self._web_broadcast_task = asyncio.create_task(self._web_broadcast_loop())
         self._post(f"WEB: HUD at http://{self._local_ip_hint()}:{int(self.cfg.WEB_HUD_PORT)}")
 
     async def _stop_web_server(self):
+        task = self._web_broadcast_task
+        self._web_broadcast_task = None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except BaseException:
+                pass
         try:
-            # Close clients
-            for ws in list(self._ws_clients):
-                try:
-                    await ws.close()
-                except Exception:
-                    pass
+            # Stop the per-client writers, then close all clients at once (a stuck one can't hold up the rest)
+            writers = tuple(self._ws_writer_tasks)
+            self._ws_writer_tasks.clear()
+            for t in writers:
+                t.cancel()
+            if writers:
+                await asyncio.gather(*writers, return_exceptions=True)
+            clients = self._ws_clients_now()
+            if clients:
+                await asyncio.gather(*(ws.close() for ws, _q in clients), return_exceptions=True)
             self._ws_clients.clear()
+            self._ws_epoch += 1
             if self._web_runner:
                 await self._web_runner.cleanup()
         except Exception:
@@ -4160,15 +5099,23 @@ var wsReady = false;
             self._web_site = None
 
     def _local_ip_hint(self) -> str:
-        # Best-effort: pick a non-loopback address
+        # Best-effort: pick a non-loopback address (re-probed every 5 minutes in case DHCP moved it)
+        now = time.monotonic()
+        ts, ip = self._local_ip_cache
+        if ip and now - ts < 300.0:
+            return ip
         try:
             s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            ip = s.getsockname()[0]
-            s.close()
-            return ip
+            try:
+                s.settimeout(0.2)
+                s.connect(("8.8.8.8", 80))
+                ip = s.getsockname()[0]
+            finally:
+                s.close()
         except Exception:
-            return "127.0.0.1"
+            ip = "127.0.0.1"
+        self._local_ip_cache = (now, ip)
+        return ip
 
     async def _broadcast_web_state_if_dirty(self):
         if not self.cfg.WEB_HUD_ENABLED or not self._ws_clients:
@@ -4183,37 +5130,113 @@ var wsReady = false;
         if not dirty:
             return
 
-        payload = json.dumps(self._web_payload())
+        # Encoded once here; every client gets the same bytes (binary frame, decoded by frameText()).
+        # Each socket has its own writer task, so queuing never waits on a slow client.
+        payload = self._web_broadcast_json()
+        full = None
         dead = []
-        for ws in list(self._ws_clients):
+        for ws, q in self._ws_clients_now():
+            if ws.closed:
+                dead.append(ws)
+                continue
+            # A client that isn't reading (tablet asleep, bad Wi-Fi) is dropped rather than buffered for.
+            tr = getattr(getattr(ws, "_writer", None), "transport", None)
             try:
-                await ws.send_str(payload)
+                backlog = tr.get_write_buffer_size() if tr is not None else 0
             except Exception:
+                backlog = 0
+            if backlog > _WS_HIGH_WATER_BYTES:
                 dead.append(ws)
+                self._spawn(ws.close())
+                continue
+            try:
+                q.put_nowait(payload)
+            except asyncio.QueueFull:
+                # Behind: patches can't be skipped, so replace its backlog with one full state message.
+                while not q.empty():
+                    q.get_nowait()
+                if full is None:
+                    full = self._web_payload_json()
+                q.put_nowait(full)
         for ws in dead:
-            self._ws_clients.discard(ws)
+            self._ws_discard(ws)
 
-    async def loop(self):
+    async def _ws_writer(self, ws, q: asyncio.Queue):
+        """Send queued broadcasts to one web HUD socket (ends with the socket)."""
+        while True:
+            data = await q.get()
+            try:
+                await ws.send_bytes(data)
+            except Exception:
+                return
+
+    def _ws_add(self, ws, q: asyncio.Queue):
+        self._ws_clients[ws] = q
+        self._ws_epoch += 1
+
+    def _ws_discard(self, ws):
+        if self._ws_clients.pop(ws, None) is not None:
+            self._ws_epoch += 1
+
+    def _ws_clients_now(self) -> Tuple:
+        """Current (socket, queue) pairs as a tuple, rebuilt only after membership changed."""
+        if self._ws_snapshot_epoch != self._ws_epoch:
+            self._ws_snapshot = tuple(self._ws_clients.items())
+            self._ws_snapshot_epoch = self._ws_epoch
+        return self._ws_snapshot
+
+    async def _web_broadcast_loop(self):
+        """Push state to web clients when it changes, at most once per WEB_BROADCAST_COALESCE_MS."""
+        evt = self._web_dirty_evt
+        last = 0.0
+        while self.running:
+            await evt.wait()
+            interval = max(0, int(getattr(self.cfg, "WEB_BROADCAST_COALESCE_MS", 50))) / 1000.0
+            wait = last + interval - time.monotonic()
+            if wait > 0:
+                # Sent recently: let further changes pile up and go out together.
+                await asyncio.sleep(wait)
+            evt.clear()
+            last = time.monotonic()
+            try:
+                await self._broadcast_web_state_if_dirty()
+            except Exception:
+                pass
+
+    def _init_async_state(self):
+        """Create the worker's asyncio primitives once, on the running loop (never per tick/broadcast)."""
+        self._obs_stopped_evt = asyncio.Event()
+        self._web_dirty_evt = asyncio.Event()
+        self._cmd_evt = asyncio.Event()
+        # Published last: other threads only signal the events once they see the loop.
         self._async_loop = asyncio.get_running_loop()
-        self._cmd_queue = asyncio.Queue()
+
+    async def loop(self):
+        self._init_async_state()
         await self._start_web_server()
 
+        # Bound once: these objects live for the whole app (cfg is edited in place, never replaced)
+        cfg, obs, midi = self.cfg, self.obs, self.midi
+        set_ui_state = self._set_ui_state
+        cmd_evt = self._cmd_evt
+        log_flush_at = 0.0
         startup_grace = 20.0
         while self.running:
+            now = time.monotonic()  # one clock sample per tick, shared by the tick helpers below
             await self._drain_cmds()
-            if not self.obs.connected and self.cfg.AUTO_RECONNECT_OBS:
-                if self.obs.connect():
+            self._post_flush_repeats(now)
+            if not obs.connected and cfg.AUTO_RECONNECT_OBS:
+                if obs.try_reconnect():
                     self._post("OBS connected")
                     self._obs_profile_checked_on_connect = False
                     self._obs_profile_check_last_attempt = 0.0
              # Early OBS profile mismatch check (warn/switch ASAP after connect; retry while OBS warms up)
-            if self.obs.connected and getattr(self.cfg, "OBS_PROFILE_CHECK_ENABLED", False) and not getattr(self, "_obs_profile_checked_on_connect", False):
-                now = time.time()
+            if obs.connected and getattr(cfg, "OBS_PROFILE_CHECK_ENABLED", False) and not getattr(self, "_obs_profile_checked_on_connect", False):
                 if now - getattr(self, "_obs_profile_check_last_attempt", 0.0) >= 5.0:
                     self._obs_profile_check_last_attempt = now
-                    expected = (getattr(self.cfg, "OBS_EXPECTED_PROFILE_NAME", "") or "").strip()
+                    expected = (getattr(cfg, "OBS_EXPECTED_PROFILE_NAME", "") or "").strip()
                     if expected:
-                        current, perr = self.obs.get_current_profile_name()
+                        current, perr = obs.get_current_profile_name()
                         if perr:
                             # OBS may still be initializing; keep retrying quietly.
                             pass
@@ -4221,7 +5244,7 @@ var wsReady = false;
                             if str(current) == str(expected):
                                 self._obs_profile_checked_on_connect = True
                             else:
-                                action = (getattr(self.cfg, "OBS_PROFILE_MISMATCH_ACTION", "block") or "block").lower()
+                                action = (getattr(cfg, "OBS_PROFILE_MISMATCH_ACTION", "block") or "block").lower()
                                 msg = f"OBS profile mismatch: current='{current}' expected='{expected}'"
 
                                 if action == "warn":
@@ -4229,12 +5252,12 @@ var wsReady = false;
                                     self._obs_profile_checked_on_connect = True
                                 elif action == "switch":
                                     # Do not attempt to switch profiles while OBS is streaming or recording.
-                                    streaming, recording, serr = self.obs.get_status()
+                                    streaming, recording, serr = obs.get_status()
                                     if (not serr) and (streaming or recording):
                                         self._post(f"OBS: WARN — {msg} (cannot auto-switch while streaming/recording)")
                                         self._obs_profile_checked_on_connect = True
                                     else:
-                                        ok, sw_err = self.obs.set_current_profile_name(expected)
+                                        ok, sw_err = obs.set_current_profile_name(expected)
                                         if ok:
                                             self._post(f"OBS: switched profile to '{expected}'")
                                             self._obs_profile_checked_on_connect = True
@@ -4252,46 +5275,36 @@ var wsReady = false;
                                     self._post(f"OBS: WARN — {msg} (start will be blocked)")
                                     self._obs_profile_checked_on_connect = True
 
-            if not self.midi.is_connected():
-                self.midi.connect()
-
-            for msg in self.midi.pending():
-                try:
-                    if self.midi.is_note_on(msg, self.cfg.NOTE_START_STREAM):
-                        self._start_stream_flow("MIDI")
-                    elif self.midi.is_note_on(msg, self.cfg.NOTE_STOP_STREAM):
-                        self._request_stop("MIDI")
-                    elif self.midi.is_note_on(msg, self.cfg.NOTE_REC_TOGGLE):
-                        self._toggle_record("MIDI")
-                    else:
-                        pn = self.midi.is_note_in_range(msg, self.cfg.NOTE_PRESET_FIRST, self.cfg.NOTE_PRESET_LAST)
-                        if pn is not None:
-                            preset = pn - self.cfg.NOTE_PRESET_FIRST + 1
-                            self._handle_preset(preset, "MIDI")
-                except Exception as e:
-                    self._post(f"MIDI error: {e}")
+            if not midi.is_connected():
+                midi.connect()
 
-            if self._pending_stream_start and self.obs.connected:
-                if time.time() >= getattr(self, "_pending_start_not_before", 0.0):
-                    if self.cfg.HOME_TEST_MODE or self.cam_state == "AWAKE":
+            if self._pending_stream_start and obs.connected:
+                if now >= getattr(self, "_pending_start_not_before", 0.0):
+                    if cfg.HOME_TEST_MODE or self.cam_state == "AWAKE":
                         reason = self._pending_start_reason or "PENDING"
                         self._pending_stream_start = False
                         self._pending_start_reason = ""
                         self._start_stream_flow(reason)
 
-            self._camera_ready_tick()
-            self._preset_delay_tick()
-            self._stop_tick()
-            self._timer_tick()
+            self._camera_ready_tick(now)
+            self._preset_delay_tick(now)
+            self._stop_tick(now)
+            if now >= self._timer_next_at:
+                self._timer_next_at = now + self._timer_tick()
 
-            streaming, recording, err = self.obs.get_status()
+            streaming, recording, err = obs.get_status()
+            self._obs_last_status = (streaming, recording, err)
+            if not streaming and not recording:
+                self._obs_stopped_evt.set()
+            else:
+                self._obs_stopped_evt.clear()
 
-            elapsed = time.time() - self.start_time
+            elapsed = now - self.start_time
 
-            if self.midi.is_connected():
-                midi_line = f"MIDI: connected ({self.midi.connected_name})"
+            if midi.is_connected():
+                midi_line = f"MIDI: connected ({midi.connected_name})"
             else:
-                reason = self.midi.last_error or "no matching port"
+                reason = midi.last_error or "no matching port"
                 midi_line = f"MIDI: waiting ({reason})"
 
             if elapsed < startup_grace:
@@ -4301,17 +5314,17 @@ var wsReady = false;
                 obs_line = f"OBS: {'STREAM ON' if streaming else 'stream off'} / {'REC ON' if recording else 'rec off'}"
                 if err:
                     obs_line = f"OBS: offline ({err})"
-                cam_src_line = self._camera_source_status_line()
+                cam_src_line = self._camera_source_status_line(now)
 
             cam_line = f"CAM: {self.cam_state}" + (f" | {cam_src_line}" if cam_src_line else "")
 
             # Coalesced UI update (applied on UI thread)
             if elapsed < startup_grace:
-                banner_text, banner_style = "INITIALIZING — Launch OBS/Proclaim as needed", "Ready.Banner.TLabel"
+                banner_text, banner_style = "INITIALIZING — Launch OBS/Proclaim as needed", _BANNER_READY
             else:
-                banner_text, banner_style = self._update_banner(streaming, recording, err if err else "")
+                banner_text, banner_style = self._update_banner(streaming, recording, err if err else "", now)
 
-            self._set_ui_state(
+            set_ui_state(
                 obs_line=obs_line,
                 midi_line=midi_line,
                 cam_line=cam_line,
@@ -4325,24 +5338,20 @@ var wsReady = false;
             prev_streaming = self._was_streaming
 
             # Expire stale stop-intent (safety)
-            if self._stop_intent and (time.time() - self._stop_intent_set_at) > 120:
+            if self._stop_intent and (now - self._stop_intent_set_at) > 120:
                 self._stop_intent = False
 
                         # Camera issue (meaningful only when streaming and OBS can *see* the configured camera source)
             cam_issue = False
-            cam_check_enabled = (getattr(self.cfg, "CAMERA_SOURCE_CHECK_ENABLED", True) and
-                                 (not self.cfg.HOME_TEST_MODE or getattr(self.cfg, "CAMERA_SOURCE_CHECK_IN_HOME_TEST", False)))
+            cam_check_enabled = self._cam_src_check_enabled()
 
             if cam_check_enabled:
-                try:
-                    grace_s = float(getattr(self.cfg, "CAMERA_SOURCE_WARN_AFTER_SECONDS", 25))
-                except Exception:
-                    grace_s = 25.0
+                grace_s = self._cs_warn_after
 
                 # IMPORTANT: use stream_stable_since ONLY.
                 # Using app start_time here causes a false-positive right at stream start if the app has been running > grace_s.
                 since = self.stream_stable_since
-                if streaming and since and (time.time() - since) >= grace_s:
+                if streaming and since and (now - since) >= grace_s:
                     res = self._cam_src_last_result
                     if isinstance(res, dict):
                         ok = res.get("ok")
@@ -4376,7 +5385,7 @@ var wsReady = false;
 
             # Stream started
             if streaming and not prev_streaming:
-                self.stream_stable_since = time.time()
+                self.stream_stable_since = now
                 self.minimized_this_stream = False
                 self.stream_ended_at = None
                 self._desired_streaming = True
@@ -4388,13 +5397,13 @@ var wsReady = false;
                 self._recover_next_at = 0.0
                 self._recover_reason = ""
                 self._recover_hold_until = 0.0
-                self._recovered_until = time.time() + 15.0 if had_recovery else 0.0
+                self._recovered_until = now + 15.0 if had_recovery else 0.0
 
                 self._open_session_log("stream_started")
                 self._post("Stream started — enjoy the service!")
 
                 # Optional "bring to front" behavior (disabled by default)
-                if self.minimized and self.cfg.AUTO_BRING_TO_FRONT_ON_STREAM_START:
+                if self.minimized and cfg.AUTO_BRING_TO_FRONT_ON_STREAM_START:
                     self._ui_action(lambda: (self.root.deiconify(), self.root.lift()))
                     self.minimized = False
 
@@ -4413,23 +5422,23 @@ var wsReady = false;
                     self._post("ERROR: Stream stopped unexpectedly")
                     self._close_session_log("unexpected_stop")
                     # If we still want to be live, arm recovery
-                    if self.cfg.AUTO_RECOVER_ENABLED:
+                    if self._ar_enabled:
                         self._arm_recovery("Unexpected stream stop")
 
             if not streaming:
                 self.stream_stable_since = None
 
             # Auto-minimize (stay minimized; never auto-restore unless explicitly enabled)
-            if (self.cfg.AUTO_MINIMIZE_ENABLED and streaming and self.stream_stable_since and
+            if (cfg.AUTO_MINIMIZE_ENABLED and streaming and self.stream_stable_since and
                 not self.minimized_this_stream and not self.minimized and
-                (time.time() - self.stream_stable_since) >= self.cfg.AUTO_MINIMIZE_AFTER_SECONDS):
+                (now - self.stream_stable_since) >= cfg.AUTO_MINIMIZE_AFTER_SECONDS):
                 self._ui_action(lambda: self.root.iconify())
                 self.minimized = True
                 self.minimized_this_stream = True
                 self._post("Stable — minimizing HUD")
 
             # Optional auto-restore on issues (disabled by default)
-            if self.cfg.AUTO_RESTORE_ON_ISSUE:
+            if cfg.AUTO_RESTORE_ON_ISSUE:
                 if self.minimized and ((prev_streaming and (not streaming) and (not self._stop_intent)) or err or cam_issue):
                     def _restore():
                         self.root.deiconify()
@@ -4441,98 +5450,136 @@ var wsReady = false;
                     self._post("Issue detected — restoring HUD")
 
             # Auto-recovery tick (only when desired live but not streaming)
-            self._recovery_tick(streaming)
-
-            # Web HUD health snapshot
-            now = time.time()
-            health_level = "READY"
-            health_title = "READY"
-            health_detail = ""
+            self._recovery_tick(streaming, now)
 
+            # Web HUD health snapshot: (level, detail)
+            want_live = (not streaming) and self._desired_streaming and self._ever_requested_stream
+            grace_until = (getattr(self, "_start_grace_until", 0.0) or 0.0)
             if streaming:
                 if cam_issue:
-                    health_level = "DEGRADED"
-                    health_title = "DEGRADED"
-                    health_detail = "Camera issue detected in OBS (check source visibility)."
+                    health = _HEALTH_FIXED["degraded"]
                 elif now < self._recovered_until:
-                    health_level = "RECOVERED"
-                    health_title = "RECOVERED"
-                    health_detail = "Stream recovered (auto-restart succeeded)."
+                    health = _HEALTH_FIXED["recovered"]
                 else:
-                    health_level = "LIVE"
-                    health_title = "LIVE"
-                    health_detail = "Streaming is active."
-            else:
-                if self._desired_streaming and self._ever_requested_stream:
-                    if now < (getattr(self, "_start_grace_until", 0.0) or 0.0):
-                        health_level = "STARTING"
-                        health_title = "STARTING"
-                        health_detail = "Starting stream — waiting for OBS to go live."
-                    elif now < self._recover_hold_until:
-                        rem = int(self._recover_hold_until - now)
-                        health_level = "ERROR"
-                        health_title = "ERROR"
-                        health_detail = f"Repair paused. Auto-restart paused for {fmt_hms(rem)} (press Start to retry)."
-                    elif self._recovering:
-                        max_attempts = int(getattr(self.cfg, "AUTO_RECOVER_MAX_ATTEMPTS", 3))
-                        next_in = max(0, int(self._recover_next_at - now))
-                        health_level = "RECOVERING"
-                        health_title = "RECOVERING"
-                        health_detail = f"Repairing OBS. Auto-restart attempt {min(self._recover_attempts+1, max_attempts)}/{max_attempts} in {fmt_hms(next_in)}."
-                    elif not self.obs.connected:
-                        health_level = "RECOVERING"
-                        health_title = "RECOVERING"
-                        health_detail = "Repairing OBS. OBS offline — reconnecting."
-                    else:
-                        health_level = "ERROR"
-                        health_title = "ERROR"
-                        health_detail = "Not live. Press Start, or check OBS."
+                    health = _HEALTH_FIXED["live"]
+            elif want_live:
+                if now < grace_until:
+                    health = _HEALTH_FIXED["starting"]
+                elif now < self._recover_hold_until:
+                    rem = int(self._recover_hold_until - now)
+                    health = ("ERROR", f"Repair paused. Auto-restart paused for {fmt_hms(rem)} (press Start to retry).")
+                elif self._recovering:
+                    max_attempts = self._ar_max
+                    next_in = max(0, int(self._recover_next_at - now))
+                    health = ("RECOVERING", f"Repairing OBS. Auto-restart attempt {min(self._recover_attempts+1, max_attempts)}/{max_attempts} in {fmt_hms(next_in)}.")
+                elif not obs.connected:
+                    health = _HEALTH_FIXED["obs_offline"]
                 else:
-                    health_level = "READY"
-                    health_title = "READY"
-                    health_detail = "Not streaming."
+                    health = _HEALTH_FIXED["not_live"]
+            else:
+                health = _HEALTH_FIXED["idle"]
+            health_level, health_detail = health
 
             # Top banner override when we WANT to be live but the stream isn't live yet
-            if (not streaming) and self._desired_streaming and self._ever_requested_stream:
-                grace_until = (getattr(self, "_start_grace_until", 0.0) or 0.0)
+            if want_live:
                 if now < grace_until:
                     # OBS can take a moment to flip streaming=true after we send StartStream or switch profiles.
                     banner_text = "🟡 STARTING — preparing OBS"
-                    banner_style = "Countdown.Banner.TLabel"
+                    banner_style = _BANNER_COUNTDOWN
                 else:
                     banner_text = "🔧 REPAIRING OBS — restarting stream" if self._recovering else "🔴 STREAM DOWN"
-                    banner_style = "Countdown.Banner.TLabel" if self._recovering else "Error.Banner.TLabel"
+                    banner_style = _BANNER_COUNTDOWN if self._recovering else _BANNER_ERROR
 
 
             # Push health state to UI + Web HUD
-            self._set_ui_state(
+            crit_ts, crit_msg = self._last_critical
+            set_ui_state(
                 health_level=health_level,
-                health_title=health_title,
+                health_css=_HEALTH_CSS.get(health_level, "h-ready"),
+                health_title=health_level,
                 health_detail=health_detail,
-                health_last_ts=self._last_critical_ts,
-                health_last_msg=self._last_critical_msg,
+                health_last_ts=crit_ts,
+                health_last_msg=crit_msg,
                 banner_text=banner_text,
                 banner_style=banner_style,
             )
 
             self._was_streaming = streaming
 
-            await self._broadcast_web_state_if_dirty()
-            await asyncio.sleep(0.25)
+            # Next tick: as soon as a MIDI/HUD/web command is queued, else after the busy/idle interval.
+            # OBS status and the camera check are polled, so idle still wakes once a second.
+            busy = (self._stop_pending or self._pending_stream_start or self._pending_preset is not None
+                    or self.cam_state == "WAKING" or self._recovering or want_live
+                    or self._service_end_running or banner_style is _BANNER_COUNTDOWN)
+            # Logs are block-buffered: flush about once a second (every idle tick) so a crash or
+            # OS shutdown loses at most a second of lines.
+            if now >= log_flush_at:
+                log_flush_at = now + _LOOP_IDLE_TICK
+                self._flush_logs()
+            try:
+                await asyncio.wait_for(cmd_evt.wait(), _LOOP_BUSY_TICK if busy else _LOOP_IDLE_TICK)
+            except asyncio.TimeoutError:
+                pass
+            cmd_evt.clear()
 
-        await self._stop_web_server()
+        # Bounded so a client that never answers the close handshake can't stall app exit
+        try:
+            await asyncio.wait_for(self._stop_web_server(), _WEB_STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            self._post(f"Web HUD: shutdown exceeded {_WEB_STOP_TIMEOUT:g}s; abandoning open connections")
+        except Exception as e:
+            self._post(f"Web HUD: shutdown error: {e}")
 
     def _runner(self):
         try:
-            asyncio.run(self.loop())
+            # uvloop/winloop when installed; loop_factory keeps it to this thread (no global policy change)
+            factory = getattr(fastloop, "new_event_loop", None) if fastloop is not None else None
+            if hasattr(asyncio, "Runner"):
+                with asyncio.Runner(loop_factory=factory) as runner:
+                    runner.run(self.loop())
+            elif factory is not None:
+                loop = factory()
+                try:
+                    asyncio.set_event_loop(loop)
+                    loop.run_until_complete(self.loop())
+                finally:
+                    loop.close()
+            else:
+                asyncio.run(self.loop())
         except Exception as e:
             self._post(f"Loop crashed: {e}")
 
     def _on_close(self):
-        # 1. Signal stop
+        # 1. Signal stop (and wake loop() from its tick wait so it sees it now, not on the next tick)
         self.running = False
+        self._set_evt_threadsafe(self._cmd_evt)
+        # In-flight sends / service-end waits would otherwise hold loop() until their own timeouts
+        loop = self._async_loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._cancel_tasks)
+            except RuntimeError:
+                pass  # loop already closed
+
+        # 2. Hide the window right away; the worker join and log flush/close (3.) run off the Tk thread
+        try:
+            self.root.withdraw()
+        except Exception:
+            pass
+        closer = threading.Thread(target=self._shutdown_io, name="shutdown-io", daemon=True)
+        closer.start()
+        self._await_shutdown_io(closer, time.monotonic() + 4.0)
+
+    def _await_shutdown_io(self, closer: threading.Thread, deadline: float):
+        """Tk-side poll (never blocks the event loop) until shutdown-io finishes or the deadline passes."""
+        if closer.is_alive() and time.monotonic() < deadline:
+            self.root.after(50, self._await_shutdown_io, closer, deadline)
+            return
+        # 4. Destroy UI
+        self.root.destroy()
 
-        # 2. Wait for worker thread to finish smoothly (avoids race condition)
+    def _shutdown_io(self):
+        """Wait for the worker thread, then close the session + run logs (so its last lines land first)."""
         if self.thread.is_alive():
             self.thread.join(timeout=2.0)
 
@@ -4543,18 +5590,14 @@ var wsReady = false;
             pass
         try:
             if self._run_log_fp:
-                ts = dt.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+                ts = time.strftime(_TS_FMT)
                 self._run_log_fp.write(f"=== Stream Agent run ended {ts} ===\n")
-                self._run_log_fp.flush()
-                self._run_log_fp.close()
+                self._run_log_fp.close()  # close() flushes
         except Exception:
             pass
         finally:
             self._run_log_fp = None
 
-        # 4. Destroy UI
-        self.root.destroy()
-
     def run(self):
         self.root.mainloop()
 